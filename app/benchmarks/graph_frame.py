@@ -0,0 +1,140 @@
+from typing import Dict, List, Tuple
+import numpy as np
+import pandas as pd
+
+from app.services.data_validator_service import list_field_columns
+from app.services.neo4j__structure_service import ENTITY_SHAPES, ENTITY_KEYS, RELATIONSHIP_SHAPES
+from app.utils.categorical_util import category_apply, union_categorical_dtype
+from app.utils.cypher_properties_util import python_repr, render_properties
+from app.utils.stage_metrics_util import metered
+
+GraphTables = Tuple[Dict[str, pd.DataFrame], Dict[str, pd.DataFrame]]
+
+LOCATION_COLUMNS: Dict[str, str] = {
+    'country': 'country',
+    'city': 'city',
+    'region': 'region',
+    'province_or_state': 'province',
+    'latitude': 'latitude',
+    'longitude': 'longitude'
+}
+ATTACK_NUMERIC_COLUMNS: Dict[str, str] = {
+    'num_killed': 'float64',
+    'num_wounded': 'float64',
+    'total_casualties': 'float64',
+    'num_perpetrators': 'Int64',
+    'num_perpetrators_captured': 'Int64'
+}
+ATTACK_TEXT_COLUMNS: List[str] = ['summary', 'description']
+ENTITY_LIST_FIELDS: Dict[str, Tuple[str, str, str]] = {
+    'TerrorGroup': ('terror_groups', 'name', 'CONDUCTED_BY'),
+    'AttackType': ('attack_types', 'type', 'TYPE_OF'),
+    'Target': ('target_details', 'type', 'TARGETED')
+}
+
+
+def as_strings(series: pd.Series) -> pd.Series:
+    return series.astype(object).where(series.notna(), None)
+
+
+def text_validity(series: pd.Series) -> pd.Series:
+    text = series.fillna('').astype(str)
+    return series.notna() & (text.str.strip() != '') & (text.str.lower() != 'unknown')
+
+
+def valid_strings(series: pd.Series) -> pd.Series:
+    return category_apply(series, text_validity, False).astype(bool)
+
+
+def attack_table(df: pd.DataFrame) -> pd.DataFrame:
+    attacks = pd.DataFrame({
+        'id': as_strings(df['event_id']),
+        'date': category_apply(
+            df['event_date'].astype('category'),
+            lambda dates: pd.to_datetime(dates).dt.strftime('%Y-%m-%dT%H:%M:%S')
+        ),
+        'data_source': df['data_source']
+    }, index=df.index)
+
+    for column, dtype in ATTACK_NUMERIC_COLUMNS.items():
+        if column in df.columns:
+            values = df[column].astype('float64').astype(dtype)
+            attacks[column] = values.astype(object).where(values.notna() & (values >= 0), None)
+
+    for column in ATTACK_TEXT_COLUMNS:
+        if column in df.columns:
+            attacks[column] = df[column].where(valid_strings(df[column]))
+
+    return attacks[valid_strings(attacks['id'])]
+
+
+def location_frame(df: pd.DataFrame) -> pd.DataFrame:
+    locations = pd.DataFrame(index=df.index)
+    for column, name in LOCATION_COLUMNS.items():
+        values = df[column]
+        if name in ('latitude', 'longitude'):
+            locations[name] = python_repr(values.astype('float64')).where(values.notna(), None)
+        else:
+            locations[name] = values.where(valid_strings(values))
+    return locations
+
+
+def melt_entity_columns(df: pd.DataFrame, columns: List[str], value_name: str) -> pd.DataFrame:
+    present = [column for column in columns if column in df.columns]
+    dtype = union_categorical_dtype(*(df[column] for column in present))
+    values = df[['event_id', *present]].astype({column: dtype for column in present})
+    melted = values.melt(id_vars='event_id', value_vars=present, value_name=value_name, ignore_index=False)
+    return melted.loc[valid_strings(melted[value_name]), ['event_id', value_name]].rename(columns={'event_id': 'id'})
+
+
+@metered('build_graph_tables')
+def build_graph_tables(df: pd.DataFrame) -> GraphTables:
+    locations = location_frame(df)
+    located = locations['country'].notna() & locations['city'].notna()
+    attacks = attack_table(df)
+    linked = located.loc[attacks.index]
+    linked_events = attacks.loc[linked, ['id']]
+
+    nodes: Dict[str, pd.DataFrame] = {
+        'Location': locations[located].drop_duplicates(subset=list(ENTITY_KEYS['Location']), ignore_index=True)
+    }
+    edges: Dict[str, pd.DataFrame] = {
+        'OCCURRED_AT': linked_events.join(locations.loc[linked_events.index, ['country', 'city']])
+    }
+
+    for label, (field, prop, shape) in ENTITY_LIST_FIELDS.items():
+        melted = melt_entity_columns(df, list_field_columns[field], prop)
+        nodes[label] = melted[[prop]].drop_duplicates(ignore_index=True)
+        edges[shape] = melted[melted.index.isin(linked_events.index)]
+
+    nodes['Attack'] = attacks.reset_index(drop=True)
+    return nodes, edges
+
+
+@metered('render_graph_statements')
+def render_graph_statements(tables: GraphTables) -> List[str]:
+    nodes, edges = tables
+    statements: List[pd.Series] = []
+
+    for label, alias in ENTITY_SHAPES.items():
+        keys = list(ENTITY_KEYS[label])
+        extra = render_properties(nodes[label].drop(columns=keys))
+        merge = f"MERGE ({alias}:{label} {{" + render_properties(nodes[label][keys]) + "})"
+        statements.append(merge + (f" SET {alias} += {{" + extra + "}").where(extra != '', ''))
+
+    statements.append("CREATE (a:Attack {" + render_properties(nodes['Attack'], python_repr) + "})")
+
+    for shape, label in RELATIONSHIP_SHAPES.items():
+        alias = ENTITY_SHAPES[label]
+        frame = edges[shape]
+        properties = render_properties(frame.drop(columns='id'))
+        statements.append(
+            "MATCH (a:Attack {id: '" + frame['id'].astype(str) + "'}), "
+            f"({alias}:{label} {{" + properties + f"}}) CREATE (a)-[:{shape}]->({alias})"
+        )
+
+    return np.concatenate([series.to_numpy(dtype=object) for series in statements]).tolist()
+
+
+def create_neo4j_queries_from_frame(df: pd.DataFrame) -> List[str]:
+    return render_graph_statements(build_graph_tables(df))
@@ -0,0 +1,332 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import List, Dict, Any, Callable, Tuple, Optional, Set
+
+import numpy
+import pandas
+import pyarrow
+import pydantic
+
+from app.benchmarks.graph_frame import create_neo4j_queries_from_frame
+from app.benchmarks.synthetic_data import write_synthetic_sources
+from app.config.kafka_config.fake_producer import FakeKafkaProducer
+from app.config.kafka_config.publisher import create_publisher
+from app.config.local_files_config.local_files import PROJECT_ROOT, BENCHMARK_DATA_DIR, BENCHMARK_RESULTS_DIR
+from app.config.pipeline_config import pipeline
+from app.services.data_processor_service import create_data_processing_pipeline, add_event_id
+from app.services.data_validator_service import (
+    dataframe_to_pydantic_models, validate_dataframe_in_batches, prepare_models_for_kafka
+)
+from app.services.event_serializer_service import encode_events_for_kafka
+from app.services.neo4j__structure_service import Neo4jProcessor, create_graph_rows
+from app.services.topic_routing_service import publish_events, publish_graph_queries, PlacementState
+from app.utils.formatted_date_util import formatted_datetime
+
+EVENTS_TOPIC = 'benchmark-terror-events'
+GRAPH_TOPIC = 'benchmark-neo4j-entities'
+OPTIONAL_STAGES: List[str] = [
+    'dataframe_to_pydantic_models', 'prepare_models_for_kafka', 'encode_events_for_kafka',
+    'Neo4jProcessor.process_events', 'create_neo4j_queries_from_frame', 'publish_events', 'publish_graph_queries'
+]
+PIPELINE_SETTINGS: List[str] = [
+    'MERGE_MODE', 'EVENT_ID_MODE', 'COLUMNAR_CACHE_ENABLED', 'VALIDATION_BATCH_SIZE', 'KAFKA_MESSAGE_FORMAT',
+    'KAFKA_PUBLISH_MODE', 'KAFKA_EVENT_KEY', 'KAFKA_GRAPH_KEY', 'GRAPH_STATEMENT_MODE', 'GRAPH_MESSAGE_FORMAT'
+]
+
+
+def measure_stage(func: Callable[[], Any], repeat: int, profile_memory: bool) -> Tuple[Any, Dict[str, Any]]:
+    timings = []
+    result = None
+    for _ in range(repeat):
+        result = None
+        gc.collect()
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+
+    record: Dict[str, Any] = {
+        'seconds': min(timings),
+        'first_seconds': timings[0],
+        'mean_seconds': sum(timings) / len(timings),
+        'runs': len(timings)
+    }
+    if profile_memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            func()
+            record['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    if hasattr(result, '__len__'):
+        record['rows'] = len(result)
+    return result, record
+
+
+def publish_to_fake_producer(publish: Callable[[Any], bool], partitions: int) -> int:
+    producer = FakeKafkaProducer(partitions=partitions)
+    publisher = create_publisher(producer, mode='async')
+    if not (publish(publisher) and publisher.close()):
+        raise RuntimeError('Benchmark publishing to the fake producer failed')
+    return len(producer.records)
+
+
+def run_stages(
+        work_dir: Path,
+        repeat: int = 1,
+        profile_memory: bool = True,
+        skip: Optional[Set[str]] = None,
+        partitions: int = 6
+) -> Dict[str, Any]:
+    skip = skip or set()
+    stages: Dict[str, Dict[str, Any]] = {}
+    dead_letter_path = Path(work_dir) / 'rejected-events.jsonl'
+
+    def stage(name: str, func: Callable[[], Any]) -> Any:
+        if name in skip:
+            return None
+        print(f"Benchmarking {name}")
+        result, stages[name] = measure_stage(func, repeat, profile_memory)
+        if isinstance(result, int):
+            stages[name]['messages'] = result
+        return result
+
+    merged_df = stage('create_data_processing_pipeline', create_data_processing_pipeline)
+    merged_df = stage('add_event_id', lambda: add_event_id(merged_df))
+    stage('dataframe_to_pydantic_models', lambda: dataframe_to_pydantic_models(merged_df))
+    events = stage('validate_dataframe_in_batches', lambda: validate_dataframe_in_batches(
+        merged_df, dead_letter_path=dead_letter_path
+    ))
+    stage('prepare_models_for_kafka', lambda: prepare_models_for_kafka(events))
+    stage('encode_events_for_kafka', lambda: encode_events_for_kafka(events))
+    stage('Neo4jProcessor.process_events', lambda: Neo4jProcessor().process_events(events))
+    stage('create_neo4j_queries_from_frame', lambda: create_neo4j_queries_from_frame(merged_df))
+    stage('publish_events', lambda: publish_to_fake_producer(
+        lambda publisher: publish_events(publisher, EVENTS_TOPIC, events), partitions
+    ))
+
+    if 'publish_graph_queries' not in skip:
+        rows = create_graph_rows(events)
+        stage('publish_graph_queries', lambda: publish_to_fake_producer(
+            lambda publisher: publish_graph_queries(publisher, GRAPH_TOPIC, rows, PlacementState()), partitions
+        ))
+
+    return {
+        'merged_rows': len(merged_df),
+        'validated_events': len(events),
+        'settings': {name: getattr(pipeline, name) for name in PIPELINE_SETTINGS},
+        'stages': stages
+    }
+
+
+def git_revision() -> Dict[str, Any]:
+    def git(*args: str) -> Optional[str]:
+        try:
+            return subprocess.run(
+                ['git', *args], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    status = git('status', '--porcelain', '--untracked-files=no')
+    return {'commit': git('rev-parse', 'HEAD'), 'dirty': bool(status) if status is not None else None}
+
+
+def library_versions() -> Dict[str, str]:
+    return {
+        'python': platform.python_version(),
+        'numpy': numpy.__version__,
+        'pandas': pandas.__version__,
+        'pyarrow': pyarrow.__version__,
+        'pydantic': pydantic.__version__
+    }
+
+
+def run_scale(
+        rows: int,
+        overlap: float,
+        secondary_ratio: float,
+        seed: int,
+        repeat: int,
+        profile_memory: bool,
+        skip: Set[str],
+        partitions: int,
+        data_dir: Path
+) -> Dict[str, Any]:
+    scale_dir = Path(data_dir) / f'rows-{rows}-seed-{seed}'
+    start = time.perf_counter()
+    primary_path, secondary_path = write_synthetic_sources(scale_dir, rows, overlap, secondary_ratio, seed)
+    generation_seconds = time.perf_counter() - start
+
+    result_path = scale_dir / 'stages.json'
+    command = [
+        sys.executable, '-m', 'app.benchmarks.pipeline_benchmark', 'stages', str(result_path),
+        '--repeat', str(repeat), '--partitions', str(partitions), *(['--no-memory'] if not profile_memory else []),
+        *[argument for name in sorted(skip) for argument in ('--skip', name)]
+    ]
+    env = {
+        **os.environ,
+        'GLOBAL_TERRORISM_CSV': str(primary_path),
+        'SECONDARY_TERROR_CSV': str(secondary_path),
+        'COLUMNAR_CACHE_DIR': str(scale_dir / 'columnar_cache'),
+        'PYTHONPATH': os.pathsep.join(filter(None, [str(PROJECT_ROOT.parent), os.environ.get('PYTHONPATH')]))
+    }
+    subprocess.run(command, env=env, cwd=PROJECT_ROOT.parent, check=True)
+
+    with open(result_path, 'r', encoding='utf-8') as f:
+        measured = json.load(f)
+
+    return {
+        'rows': rows,
+        'secondary_rows': max(int(rows * secondary_ratio), 1),
+        'generation_seconds': generation_seconds,
+        **measured
+    }
+
+
+def run_benchmark(
+        scales: List[int],
+        overlap: float = 0.3,
+        secondary_ratio: float = 0.22,
+        seed: int = 0,
+        repeat: int = 1,
+        profile_memory: bool = True,
+        skip: Optional[Set[str]] = None,
+        partitions: int = 6,
+        output_path: Optional[Path] = None,
+        data_dir: Path = BENCHMARK_DATA_DIR
+) -> Path:
+    results = {
+        'created_at': formatted_datetime(),
+        'git': git_revision(),
+        'versions': library_versions(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'parameters': {
+            'overlap': overlap,
+            'secondary_ratio': secondary_ratio,
+            'seed': seed,
+            'repeat': repeat,
+            'profile_memory': profile_memory,
+            'partitions': partitions,
+            'skip': sorted(skip or [])
+        },
+        'runs': [
+            run_scale(rows, overlap, secondary_ratio, seed, repeat, profile_memory, skip or set(), partitions, data_dir)
+            for rows in scales
+        ]
+    }
+
+    output_path = Path(output_path or BENCHMARK_RESULTS_DIR / f"benchmark-{results['created_at']}.json")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+
+    print_results(results)
+    print(f"Benchmark results were saved to {output_path}")
+    return output_path
+
+
+def print_results(results: Dict[str, Any]) -> None:
+    for run in results['runs']:
+        print(f"{run['rows']} primary rows, {run['secondary_rows']} secondary rows, {run['merged_rows']} merged rows")
+        for name, record in run['stages'].items():
+            peak = f"{record['peak_bytes'] / 2 ** 20:10.1f} MiB peak" if 'peak_bytes' in record else ''
+            print(f"  {name:<34} {record['seconds']:9.3f}s {peak}")
+
+
+def load_results(path: Path) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_results(baseline_path: Path, candidate_path: Path, threshold: float = 1.1) -> List[str]:
+    baseline, candidate = load_results(baseline_path), load_results(candidate_path)
+    baseline_runs = {run['rows']: run for run in baseline['runs']}
+    regressions = []
+
+    print(f"baseline {baseline['git']['commit']} vs candidate {candidate['git']['commit']}")
+    for run in candidate['runs']:
+        if run['rows'] not in baseline_runs:
+            continue
+        previous = baseline_runs[run['rows']]['stages']
+        for name, record in run['stages'].items():
+            if name not in previous:
+                continue
+            ratio = record['seconds'] / max(previous[name]['seconds'], 1e-9)
+            memory_ratio = (
+                record['peak_bytes'] / max(previous[name]['peak_bytes'], 1)
+                if 'peak_bytes' in record and 'peak_bytes' in previous[name] else None
+            )
+            print(f"{run['rows']:>9} {name:<34} {previous[name]['seconds']:9.3f}s {record['seconds']:9.3f}s "
+                  f"{ratio:6.2f}x time" + (f" {memory_ratio:6.2f}x memory" if memory_ratio is not None else ''))
+            if ratio > threshold or (memory_ratio is not None and memory_ratio > threshold):
+                regressions.append(f"{run['rows']} rows {name}")
+
+    if regressions:
+        print(f"Regressions above {threshold:.2f}x: {', '.join(regressions)}")
+    return regressions
+
+
+def parse_arguments(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog='python -m app.benchmarks.pipeline_benchmark')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run')
+    run.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000])
+    run.add_argument('--overlap', type=float, default=0.3)
+    run.add_argument('--secondary-ratio', type=float, default=0.22)
+    run.add_argument('--seed', type=int, default=0)
+    run.add_argument('--repeat', type=int, default=1)
+    run.add_argument('--partitions', type=int, default=6)
+    run.add_argument('--no-memory', action='store_true')
+    run.add_argument('--skip', action='append', choices=OPTIONAL_STAGES, default=[])
+    run.add_argument('--output', type=Path)
+    run.add_argument('--data-dir', type=Path, default=BENCHMARK_DATA_DIR)
+
+    stages = commands.add_parser('stages')
+    stages.add_argument('result_path', type=Path)
+    stages.add_argument('--repeat', type=int, default=1)
+    stages.add_argument('--partitions', type=int, default=6)
+    stages.add_argument('--no-memory', action='store_true')
+    stages.add_argument('--skip', action='append', choices=OPTIONAL_STAGES, default=[])
+
+    compare = commands.add_parser('compare')
+    compare.add_argument('baseline', type=Path)
+    compare.add_argument('candidate', type=Path)
+    compare.add_argument('--threshold', type=float, default=1.1)
+
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str]) -> int:
+    arguments = parse_arguments(argv)
+
+    if arguments.command == 'run':
+        run_benchmark(
+            arguments.rows, arguments.overlap, arguments.secondary_ratio, arguments.seed, arguments.repeat,
+            not arguments.no_memory, set(arguments.skip), arguments.partitions, arguments.output, arguments.data_dir
+        )
+    elif arguments.command == 'stages':
+        measured = run_stages(
+            arguments.result_path.parent, arguments.repeat, not arguments.no_memory, set(arguments.skip),
+            arguments.partitions
+        )
+        with open(arguments.result_path, 'w', encoding='utf-8') as f:
+            json.dump(measured, f, indent=2)
+    elif compare_results(arguments.baseline, arguments.candidate, arguments.threshold):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,67 @@
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import List, Callable, Any
+
+from app.models.terror_event import TerrorEvent
+from app.services.data_validator_service import prepare_models_for_kafka
+from app.services.event_serializer_service import encode_events_json, encode_events_binary
+
+
+def generate_events(count: int, seed: int = 0) -> List[TerrorEvent]:
+    rng = random.Random(seed)
+    return [
+        TerrorEvent(
+            event_id=f"{i:032x}",
+            event_date=datetime(1970, 1, 1) + timedelta(days=rng.randrange(18_000)),
+            country=rng.choice(['Iraq', 'Pakistan', 'India', 'Colombia', 'Peru']),
+            city=f"City {rng.randrange(500)}",
+            region=rng.choice(['Middle East & North Africa', 'South Asia', None]),
+            latitude=rng.uniform(-60, 60),
+            longitude=rng.uniform(-120, 120),
+            num_killed=float(rng.randrange(20)),
+            num_wounded=float(rng.randrange(50)),
+            attack_types=rng.sample(['Bombing/Explosion', 'Armed Assault', 'Hostage Taking'], rng.randint(1, 2)),
+            target_details=[f"Target {rng.randrange(100)}"],
+            terror_groups=[f"Group {rng.randrange(50)}"],
+            summary=' '.join(f"word{rng.randrange(1000)}" for _ in range(rng.randrange(40))),
+            data_source=rng.choice(['GTD', 'RAND'])
+        )
+        for i in range(count)
+    ]
+
+
+def legacy_kafka_payloads(models: List[TerrorEvent]) -> List[bytes]:
+    return [json.dumps(message).encode('utf-8') for message in prepare_models_for_kafka(models)]
+
+
+def time_encoder(encoder: Callable[[List[TerrorEvent]], List[bytes]], models: List[TerrorEvent], repeat: int) -> Any:
+    best = float('inf')
+    payloads = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        payloads = encoder(models)
+        best = min(best, time.perf_counter() - start)
+    return best, sum(map(len, payloads))
+
+
+def run_benchmark(count: int = 20_000, repeat: int = 5) -> None:
+    models = generate_events(count)
+    encoders = {
+        'legacy (model_dump + strptime + double json)': legacy_kafka_payloads,
+        'json (schema-aware, single pass)': encode_events_json,
+        'binary (schema v1)': encode_events_binary
+    }
+
+    baseline = None
+    for name, encoder in encoders.items():
+        elapsed, size = time_encoder(encoder, models, repeat)
+        baseline = baseline or elapsed
+        print(f"{name:<46} {elapsed * 1e6 / count:8.2f} us/event {count / elapsed:10.0f} events/s "
+              f"{size / count:8.1f} bytes/event {baseline / elapsed:6.2f}x")
+
+
+if __name__ == '__main__':
+    run_benchmark(*map(int, sys.argv[1:3]))
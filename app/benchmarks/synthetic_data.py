@@ -0,0 +1,305 @@
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+import numpy as np
+import pandas as pd
+
+from app.config.local_files_config.local_files import BENCHMARK_DATA_DIR
+from app.repositories.local_files_repository import primary_df_columns
+
+COUNTRY_REGIONS: Dict[str, str] = {
+    'Iraq': 'Middle East & North Africa',
+    'Pakistan': 'South Asia',
+    'Afghanistan': 'South Asia',
+    'India': 'South Asia',
+    'Colombia': 'South America',
+    'Philippines': 'Southeast Asia',
+    'Peru': 'South America',
+    'El Salvador': 'Central America & Caribbean',
+    'United Kingdom': 'Western Europe',
+    'Turkey': 'Middle East & North Africa',
+    'Somalia': 'Sub-Saharan Africa',
+    'Nigeria': 'Sub-Saharan Africa',
+    'Thailand': 'Southeast Asia',
+    'Yemen': 'Middle East & North Africa',
+    'Spain': 'Western Europe',
+    'Sri Lanka': 'South Asia',
+    'United States': 'North America',
+    'Algeria': 'Middle East & North Africa',
+    'France': 'Western Europe',
+    'Egypt': 'Middle East & North Africa',
+    'Lebanon': 'Middle East & North Africa',
+    'Chile': 'South America',
+    'Israel': 'Middle East & North Africa',
+    'Syria': 'Middle East & North Africa',
+    'Russia': 'Eastern Europe',
+    'Libya': 'Middle East & North Africa',
+    'Nicaragua': 'Central America & Caribbean',
+    'South Africa': 'Sub-Saharan Africa',
+    "Cote d'Ivoire": 'Sub-Saharan Africa',
+    'Germany': 'Western Europe'
+}
+CITY_HEADS: Dict[str, List[str]] = {
+    'Iraq': ['Baghdad', 'Mosul', 'Kirkuk', 'Baqubah', 'Fallujah'],
+    'Pakistan': ['Karachi', 'Peshawar', 'Quetta', 'Lahore'],
+    'Afghanistan': ['Kabul', 'Kandahar', 'Lashkar Gah'],
+    'India': ['Srinagar', 'Imphal', 'New Delhi'],
+    'Colombia': ['Medellin', 'Bogota', 'Cali'],
+    'Peru': ['Lima', 'Ayacucho', 'Huancayo'],
+    'United Kingdom': ['Belfast', 'London', 'Londonderry'],
+    'Somalia': ['Mogadishu', 'Kismayo'],
+    'Nigeria': ['Maiduguri', 'Kano'],
+    'United States': ['New York City', 'Chicago', 'Los Angeles'],
+    "Cote d'Ivoire": ['Abidjan', "M'Bahiakro"],
+    'France': ['Paris', 'Ajaccio', 'Bastia']
+}
+ATTACK_TYPES: Dict[str, float] = {
+    'Bombing/Explosion': 0.48,
+    'Armed Assault': 0.24,
+    'Assassination': 0.11,
+    'Hostage Taking (Kidnapping)': 0.06,
+    'Facility/Infrastructure Attack': 0.05,
+    'Unknown': 0.04,
+    'Unarmed Assault': 0.006,
+    'Hostage Taking (Barricade Incident)': 0.006,
+    'Hijacking': 0.004,
+    'Other': 0.004
+}
+TARGET_SUBTYPES: Dict[str, List[str]] = {
+    'Private Citizens & Property': ['Unnamed Civilian/Unspecified', 'Village/City/Town/Suburb', 'Marketplace/Plaza/Square'],
+    'Military': ['Military Unit/Patrol/Convoy', 'Military Barracks/Base/Headquarters/Checkpost'],
+    'Police': ['Police Security Forces/Officers', 'Police Building (headquarters, station, school)'],
+    'Government (General)': ['Government Personnel (excluding police, military)', 'Politician or Political Party Movement'],
+    'Business': ['Retail/Grocery/Bakery', 'Bank/Commerce', "Restaurant/Bar/Caf\xe9"],
+    'Transportation': ['Bus (excluding tourists)', 'Train/Train Tracks/Trolley'],
+    'Utilities': ['Electricity', 'Gas'],
+    'Religious Figures/Institutions': ['Place of Worship', 'Religious Figure'],
+    'Unknown': ['Unknown']
+}
+TARGET_WEIGHTS: List[float] = [0.30, 0.16, 0.14, 0.12, 0.11, 0.05, 0.04, 0.03, 0.05]
+KNOWN_GROUPS: List[str] = [
+    'Taliban', 'Islamic State of Iraq and the Levant (ISIL)', 'Shining Path (SL)',
+    'Farabundo Marti National Liberation Front (FMLN)', 'Al-Shabaab', 'Irish Republican Army (IRA)',
+    'Revolutionary Armed Forces of Colombia (FARC)', "New People's Army (NPA)", 'Boko Haram',
+    "Kurdistan Workers' Party (PKK)", 'Basque Fatherland and Freedom (ETA)', 'Liberation Tigers of Tamil Eelam (LTTE)'
+]
+WEAPONS: List[str] = ['Explosives', 'Firearms', 'Incendiary', 'Unknown', 'Knives', 'Other', 'Remote-detonated explosive']
+WORDS: List[str] = (
+    'attack assailants detonated explosive device near checkpoint killed wounded civilians police officers '
+    'claimed responsibility gunmen opened fire market vehicle convoy abducted released ransom bomb exploded '
+    'outside office building station village district province security forces patrol the a and in of at on'
+).split()
+GROUP_POOL = 400
+CITY_POOL = 200
+SENTENCE_POOL = 2_000
+UNKNOWN_GROUP_SHARE = 0.45
+
+
+def zipf_choice(rng: np.random.Generator, size: int, pool: int, exponent: float = 1.1) -> np.ndarray:
+    weights = 1.0 / np.arange(1, pool + 1) ** exponent
+    return rng.choice(pool, size=size, p=weights / weights.sum())
+
+
+def sentence_pool(rng: np.random.Generator, size: int = SENTENCE_POOL) -> np.ndarray:
+    sentences = []
+    for index in range(size):
+        text = ' '.join(rng.choice(WORDS, rng.integers(8, 60))).capitalize() + '.'
+        if index % 50 == 0:
+            text = f'{text} The group said "this is a warning".'
+        if index % 97 == 0:
+            text = f'{text}\nAdditional details were not reported.'
+        sentences.append(text)
+    return np.array(sentences, dtype=object)
+
+
+def with_missing(rng: np.random.Generator, values: np.ndarray, share: float) -> np.ndarray:
+    values = values.astype(object)
+    values[rng.random(len(values)) < share] = None
+    return values
+
+
+def optional_choice(rng: np.random.Generator, size: int, choices: List[str], share: float) -> np.ndarray:
+    values = np.full(size, None, dtype=object)
+    present = rng.random(size) < share
+    values[present] = rng.choice(np.array(choices, dtype=object), present.sum())
+    return values
+
+
+def casualties(rng: np.random.Generator, size: int, mean: float, missing: float) -> np.ndarray:
+    values = rng.poisson(rng.exponential(mean, size)).astype(float)
+    values[rng.random(size) < missing] = np.nan
+    return values
+
+
+def city_names(country: str, prefix: str = 'District') -> List[str]:
+    head = CITY_HEADS.get(country, [])
+    return head + [f"{country.split(' ')[0]} {prefix} {index}" for index in range(CITY_POOL - len(head))]
+
+
+def generate_dates(rng: np.random.Generator, size: int, first_year: int, last_year: int) -> pd.Series:
+    span = (pd.Timestamp(last_year, 12, 31) - pd.Timestamp(first_year, 1, 1)).days
+    days = np.sort(np.floor(rng.beta(2.0, 1.2, size) * (span + 1)).astype(int))
+    return pd.Series(pd.Timestamp(first_year, 1, 1) + pd.to_timedelta(days, unit='D'))
+
+
+def generate_primary_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    countries = np.array(list(COUNTRY_REGIONS), dtype=object)
+    regions = np.array(list(COUNTRY_REGIONS.values()), dtype=object)
+    cities = np.array([city_names(country) for country in countries], dtype=object)
+    groups = np.array(KNOWN_GROUPS + [f"Group {index}" for index in range(GROUP_POOL - len(KNOWN_GROUPS))], dtype=object)
+    target_types = np.array(list(TARGET_SUBTYPES), dtype=object)
+    attack_types = np.array(list(ATTACK_TYPES), dtype=object)
+    attack_weights = np.array(list(ATTACK_TYPES.values()))
+    sentences = sentence_pool(rng)
+
+    dates = generate_dates(rng, rows, 1970, 2017)
+    year, month, day = dates.dt.year.to_numpy(), dates.dt.month.to_numpy(), dates.dt.day.to_numpy()
+    event_ids = year.astype(np.int64) * 10 ** 8 + month * 10 ** 6 + day * 10 ** 4 + dates.groupby(dates).cumcount() + 1
+    month = np.where(rng.random(rows) < 0.005, 0, month)
+    day = np.where(rng.random(rows) < 0.01, 0, day)
+
+    country_index = zipf_choice(rng, rows, len(countries), 0.9)
+    city_index = zipf_choice(rng, rows, CITY_POOL, 1.2)
+    city = cities[country_index, city_index].astype(object)
+    variant = rng.random(rows)
+    city[variant < 0.03] = 'Unknown'
+    city[(variant >= 0.03) & (variant < 0.035)] = None
+    padded = (variant >= 0.035) & (variant < 0.045)
+    city[padded] = [f"  {name.lower()} " for name in city[padded]]
+
+    anchor = np.random.default_rng(seed + 1).uniform([-40, -120], [60, 140], (len(countries), CITY_POOL, 2))
+    coordinates = anchor[country_index, city_index] + rng.normal(0, 0.05, (rows, 2))
+    coordinates[rng.random(rows) < 0.025] = np.nan
+
+    target_index = rng.choice(len(target_types), rows, p=TARGET_WEIGHTS)
+    subtype_counts = np.array([len(subtypes) for subtypes in TARGET_SUBTYPES.values()])
+    subtype_table = np.array([
+        subtypes + [None] * (subtype_counts.max() - len(subtypes)) for subtypes in TARGET_SUBTYPES.values()
+    ], dtype=object)
+    subtypes = subtype_table[target_index, np.floor(rng.random(rows) * subtype_counts[target_index]).astype(int)]
+
+    group = groups[zipf_choice(rng, rows, GROUP_POOL)].astype(object)
+    group[rng.random(rows) < UNKNOWN_GROUP_SHARE] = 'Unknown'
+
+    nperps = rng.integers(1, 20, rows).astype(float)
+    perps_kind = rng.random(rows)
+    nperps[perps_kind < 0.35] = -99
+    nperps[(perps_kind >= 0.35) & (perps_kind < 0.7)] = np.nan
+    nperpcap = rng.integers(0, 3, rows).astype(float)
+    nperpcap[rng.random(rows) < 0.35] = np.nan
+    nperpcap[rng.random(rows) < 0.05] = -99
+
+    df = pd.DataFrame({
+        'eventid': event_ids.to_numpy(),
+        'iyear': year,
+        'imonth': month,
+        'iday': day,
+        'country_txt': countries[country_index],
+        'region_txt': regions[country_index],
+        'provstate': with_missing(
+            rng, np.char.add(np.char.add(countries[country_index].astype(str), ' Province '), (city_index % 12).astype(str)),
+            0.1
+        ),
+        'city': city,
+        'latitude': coordinates[:, 0],
+        'longitude': coordinates[:, 1],
+        'summary': with_missing(rng, sentences[rng.integers(0, len(sentences), rows)], 0.45),
+        'attacktype1_txt': attack_types[rng.choice(len(attack_types), rows, p=attack_weights / attack_weights.sum())],
+        'attacktype2_txt': optional_choice(rng, rows, list(ATTACK_TYPES)[:5], 0.07),
+        'attacktype3_txt': optional_choice(rng, rows, list(ATTACK_TYPES)[:3], 0.005),
+        'targtype1_txt': target_types[target_index],
+        'targsubtype1_txt': with_missing(rng, subtypes, 0.06),
+        'targtype2_txt': optional_choice(rng, rows, list(TARGET_SUBTYPES)[:6], 0.06),
+        'targsubtype2_txt': optional_choice(rng, rows, TARGET_SUBTYPES['Military'] + TARGET_SUBTYPES['Police'], 0.05),
+        'targtype3_txt': optional_choice(rng, rows, list(TARGET_SUBTYPES)[:4], 0.01),
+        'targsubtype3_txt': optional_choice(rng, rows, TARGET_SUBTYPES['Police'], 0.01),
+        'gname': group,
+        'gsubname': optional_choice(rng, rows, ['Militants', 'Splinter Faction', 'Youth Wing'], 0.03),
+        'gname2': optional_choice(rng, rows, list(groups[:40]), 0.02),
+        'gsubname2': optional_choice(rng, rows, ['Splinter Faction'], 0.002),
+        'gname3': optional_choice(rng, rows, list(groups[:20]), 0.002),
+        'gsubname3': optional_choice(rng, rows, ['Militants'], 0.0005),
+        'nkill': casualties(rng, rows, 2.5, 0.06),
+        'nkillter': casualties(rng, rows, 0.5, 0.6),
+        'nwound': casualties(rng, rows, 3.5, 0.09),
+        'nwoundte': casualties(rng, rows, 0.2, 0.6),
+        'nperps': nperps,
+        'nperpcap': nperpcap
+    })
+    return df[primary_df_columns]
+
+
+def generate_secondary_frame(
+        primary_df: pd.DataFrame,
+        rows: int,
+        overlap: float = 0.3,
+        seed: int = 0,
+        first_year: int = 1968,
+        last_year: int = 2009
+) -> pd.DataFrame:
+    rng = np.random.default_rng(seed + 2)
+    sentences = sentence_pool(rng, SENTENCE_POOL // 4)
+    countries = np.array(list(COUNTRY_REGIONS), dtype=object)
+
+    candidates = primary_df[
+        (primary_df['imonth'] > 0) & (primary_df['iday'] > 0) & primary_df['city'].notna()
+        & primary_df['iyear'].between(first_year, last_year)
+    ]
+    matched_rows = min(int(round(rows * overlap)), rows)
+    if matched_rows and candidates.empty:
+        raise ValueError(f"No primary rows between {first_year} and {last_year} can be matched")
+    matched = candidates.iloc[rng.choice(len(candidates), matched_rows, replace=matched_rows > len(candidates))]
+    matched_dates = pd.to_datetime(dict(year=matched['iyear'], month=matched['imonth'], day=matched['iday']))
+
+    unmatched_rows = rows - matched_rows
+    country_index = zipf_choice(rng, unmatched_rows, len(countries), 0.9)
+    town_names = np.array([city_names(country, 'Town') for country in countries], dtype=object)
+
+    df = pd.DataFrame({
+        'Date': np.concatenate([
+            matched_dates.dt.strftime('%d-%b-%y').to_numpy(dtype=object),
+            generate_dates(rng, unmatched_rows, first_year, last_year).dt.strftime('%d-%b-%y').to_numpy(dtype=object)
+        ]),
+        'City': np.concatenate([
+            matched['city'].to_numpy(dtype=object),
+            town_names[country_index, zipf_choice(rng, unmatched_rows, CITY_POOL, 1.2)]
+        ]),
+        'Country': np.concatenate([matched['country_txt'].to_numpy(dtype=object), countries[country_index]]),
+        'Perpetrator': rng.choice(np.array(KNOWN_GROUPS + ['Unknown'], dtype=object), rows),
+        'Weapon': rng.choice(np.array(WEAPONS, dtype=object), rows),
+        'Injuries': casualties(rng, rows, 3.0, 0.05),
+        'Fatalities': casualties(rng, rows, 2.0, 0.05),
+        'Description': with_missing(rng, sentences[rng.integers(0, len(sentences), rows)], 0.1)
+    })
+    return df.iloc[rng.permutation(rows)].reset_index(drop=True)
+
+
+def write_synthetic_sources(
+        output_dir: Path = BENCHMARK_DATA_DIR,
+        rows: int = 100_000,
+        overlap: float = 0.3,
+        secondary_ratio: float = 0.22,
+        seed: int = 0
+) -> Tuple[Path, Path]:
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    primary_path = output_dir / f'globalterrorismdb-{rows}-{seed}.csv'
+    secondary_path = output_dir / f'RAND_Database-{rows}-{seed}.csv'
+
+    primary_df = generate_primary_frame(rows, seed)
+    secondary_df = generate_secondary_frame(primary_df, max(int(rows * secondary_ratio), 1), overlap, seed)
+    primary_df.to_csv(primary_path, index=False, encoding='latin1')
+    secondary_df.to_csv(secondary_path, index=False, encoding='latin1')
+
+    print(f"Synthetic sources with {len(primary_df)} primary and {len(secondary_df)} secondary rows "
+          f"were saved to {output_dir}")
+    return primary_path, secondary_path
+
+
+if __name__ == '__main__':
+    write_synthetic_sources(
+        rows=int(sys.argv[1]) if len(sys.argv) > 1 else 100_000,
+        overlap=float(sys.argv[2]) if len(sys.argv) > 2 else 0.3,
+        seed=int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    )
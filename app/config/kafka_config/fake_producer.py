@@ -0,0 +1,85 @@
+import time
+from typing import List, Tuple, Any, Callable, Optional, Set
+
+from kafka.partitioner.default import murmur2
+
+from app.config.kafka_config.producer import serialize_value, serialize_key
+
+
+class FakeRecordMetadata:
+    def __init__(self, topic: str, partition: int, offset: int):
+        self.topic = topic
+        self.partition = partition
+        self.offset = offset
+
+
+class FakeFuture:
+    def __init__(self):
+        self.callbacks: List[Tuple[Callable, tuple]] = []
+        self.errbacks: List[Tuple[Callable, tuple]] = []
+        self.metadata: Any = None
+        self.error: Optional[Exception] = None
+        self.is_done = False
+
+    def add_callback(self, func: Callable, *args) -> 'FakeFuture':
+        self.callbacks.append((func, args))
+        return self
+
+    def add_errback(self, func: Callable, *args) -> 'FakeFuture':
+        self.errbacks.append((func, args))
+        return self
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        if not self.is_done:
+            raise TimeoutError(f"record not delivered within {timeout}s")
+        if self.error:
+            raise self.error
+        return self.metadata
+
+    def resolve(self, metadata: Any = None, error: Optional[Exception] = None) -> None:
+        self.metadata, self.error, self.is_done = metadata, error, True
+        for func, args in (self.errbacks if error else self.callbacks):
+            func(*args, error or metadata)
+
+
+class FakeKafkaProducer:
+    def __init__(self, fail_topics: Optional[Set[str]] = None, partitions: int = 1, **_config):
+        self.fail_topics = fail_topics or set()
+        self.partitions = partitions
+        self.sent: List[Tuple[str, bytes]] = []
+        self.records: List[Tuple[str, Optional[bytes], int, bytes]] = []
+        self.latencies: List[float] = []
+        self.flush_count = 0
+        self.closed = False
+        self._pending: List[Tuple[FakeFuture, str, int, float]] = []
+
+    def partitions_for(self, _topic: str) -> Set[int]:
+        return set(range(self.partitions))
+
+    def _partition(self, key: Optional[bytes], partition: Optional[int]) -> int:
+        if partition is not None:
+            return partition
+        return (murmur2(key) & 0x7fffffff) % self.partitions if key is not None else 0
+
+    def send(self, topic: str, value: Any = None, key: Any = None, partition: Optional[int] = None, **_kwargs) -> FakeFuture:
+        future = FakeFuture()
+        key_bytes = serialize_key(key)
+        partition = self._partition(key_bytes, partition)
+        self.sent.append((topic, serialize_value(value)))
+        self.records.append((topic, key_bytes, partition, serialize_value(value)))
+        self._pending.append((future, topic, partition, time.perf_counter()))
+        return future
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        self.flush_count += 1
+        for future, topic, partition, sent_at in self._pending:
+            self.latencies.append(time.perf_counter() - sent_at)
+            if topic in self.fail_topics:
+                future.resolve(error=RuntimeError(f"delivery to {topic} failed"))
+            else:
+                future.resolve(FakeRecordMetadata(topic, partition, len(self.latencies) - 1))
+        self._pending = []
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        self.flush()
+        self.closed = True
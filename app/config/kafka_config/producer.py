@@ -1,42 +1,73 @@
 import json
 import os
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 from kafka import KafkaProducer
-from itertools import islice
+from itertools import islice, repeat
 from dotenv import load_dotenv
 
+from app.config.pipeline_config.pipeline import KAFKA_FLUSH_TIMEOUT_S
+
 load_dotenv(verbose=True)
 
 
-def produce_batch(topic: str, messages: List[Dict], batch_size: int = 100) -> None:
-    producer = create_producer()
+def produce_batch(
+        topic: str,
+        messages: List[Dict],
+        batch_size: int = 100,
+        producer: Optional[KafkaProducer] = None,
+        keys: Optional[List[str]] = None,
+        partitions: Optional[List[int]] = None
+) -> bool:
+    owns_producer = producer is None
+    if owns_producer:
+        producer = create_producer()
 
     try:
-        for batch in create_batches(messages, batch_size):
+        records = zip(messages, keys or repeat(None), partitions or repeat(None))
+        for batch in create_batches(records, batch_size):
             publish_batch(producer, topic, batch)
+        return True
 
     except Exception as e:
         print(f"Error during Kafka batch publishing: {e}")
+        return False
     finally:
-        producer.close()
+        if owns_producer:
+            producer.close()
 
 
 def create_producer() -> KafkaProducer:
     return KafkaProducer(
         bootstrap_servers=os.environ['BOOTSTRAP_SERVERS'],
-        value_serializer=lambda v: json.dumps(v).encode('utf-8')
+        value_serializer=serialize_value,
+        key_serializer=serialize_key
     )
 
 
+def serialize_value(value) -> Optional[bytes]:
+    if value is None:
+        return None
+    return value if isinstance(value, bytes) else json.dumps(value).encode('utf-8')
+
+
+def serialize_key(key) -> Optional[bytes]:
+    return key.encode('utf-8') if isinstance(key, str) else key
+
+
+def topic_partition_count(producer: KafkaProducer, topic: str, configured: int = 0) -> int:
+    return configured or len(producer.partitions_for(topic) or {0})
+
+
 def create_batches(messages: List[Dict], batch_size: int):
     iterator = iter(messages)
     while batch := list(islice(iterator, batch_size)):
         yield batch
 
 
-def publish_batch(producer: KafkaProducer, topic: str, batch: List[Dict]) -> None:
-    [producer.send(topic=topic, value=msg) for msg in batch]
+def publish_batch(producer: KafkaProducer, topic: str, batch: List[Tuple]) -> None:
+    futures = [producer.send(topic=topic, value=msg, key=key, partition=partition) for msg, key, partition in batch]
     producer.flush()
+    [future.get(timeout=KAFKA_FLUSH_TIMEOUT_S) for future in futures]
 
     print(f"Published {len(batch)} messages")
-    [print(f"message: {msg}") for msg in batch]
+    [print(f"message: {msg}") for msg, _, _ in batch]
@@ -0,0 +1,135 @@
+import os
+import time
+from collections import Counter
+from itertools import repeat
+from typing import List, Optional, Any, Union
+
+from kafka import KafkaProducer
+
+from app.config.kafka_config.producer import (
+    produce_batch, create_producer, serialize_value, serialize_key, topic_partition_count
+)
+from app.config.pipeline_config.pipeline import (
+    KAFKA_PUBLISH_MODE, KAFKA_LINGER_MS, KAFKA_BATCH_SIZE_BYTES, KAFKA_BUFFER_MEMORY,
+    KAFKA_COMPRESSION, KAFKA_MAX_IN_FLIGHT, KAFKA_FLUSH_TIMEOUT_S, KAFKA_TOPIC_PARTITIONS
+)
+
+
+def create_bulk_producer() -> KafkaProducer:
+    return KafkaProducer(
+        bootstrap_servers=os.environ['BOOTSTRAP_SERVERS'],
+        value_serializer=serialize_value,
+        key_serializer=serialize_key,
+        linger_ms=KAFKA_LINGER_MS,
+        batch_size=KAFKA_BATCH_SIZE_BYTES,
+        buffer_memory=KAFKA_BUFFER_MEMORY,
+        compression_type=KAFKA_COMPRESSION or None,
+        max_in_flight_requests_per_connection=KAFKA_MAX_IN_FLIGHT
+    )
+
+
+class SyncKafkaPublisher:
+    def __init__(self, producer: Optional[Any] = None, batch_size: int = 100):
+        self.producer = producer or create_producer()
+        self.batch_size = batch_size
+        self.succeeded = True
+
+    def publish(
+            self,
+            topic: str,
+            messages: List[Union[str, bytes]],
+            keys: Optional[List[str]] = None,
+            partitions: Optional[List[int]] = None
+    ) -> bool:
+        published = produce_batch(topic, messages, self.batch_size, self.producer, keys, partitions)
+        self.succeeded &= published
+        return published
+
+    def partition_count(self, topic: str) -> int:
+        return topic_partition_count(self.producer, topic, KAFKA_TOPIC_PARTITIONS)
+
+    def close(self) -> bool:
+        self.producer.close()
+        return self.succeeded
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AsyncKafkaPublisher:
+    def __init__(self, producer: Optional[Any] = None, flush_timeout: float = KAFKA_FLUSH_TIMEOUT_S):
+        self.producer = producer or create_bulk_producer()
+        self.flush_timeout = flush_timeout
+        self.sent: Counter = Counter()
+        self.delivered: Counter = Counter()
+        self.failed: Counter = Counter()
+        self.last_error: Optional[Exception] = None
+        self.succeeded = True
+        self.started = time.perf_counter()
+
+    def _on_delivery(self, topic: str, _metadata) -> None:
+        self.delivered[topic] += 1
+
+    def _on_error(self, topic: str, error: Exception) -> None:
+        self.failed[topic] += 1
+        self.last_error = error
+
+    def publish(
+            self,
+            topic: str,
+            messages: List[Union[str, bytes]],
+            keys: Optional[List[str]] = None,
+            partitions: Optional[List[int]] = None
+    ) -> bool:
+        try:
+            for message, key, partition in zip(messages, keys or repeat(None), partitions or repeat(None)):
+                future = self.producer.send(topic=topic, value=message, key=key, partition=partition)
+                future.add_callback(self._on_delivery, topic)
+                future.add_errback(self._on_error, topic)
+                self.sent[topic] += 1
+            return True
+
+        except Exception as e:
+            print(f"Error during Kafka async publishing: {e}")
+            self.succeeded = False
+            return False
+
+    def partition_count(self, topic: str) -> int:
+        return topic_partition_count(self.producer, topic, KAFKA_TOPIC_PARTITIONS)
+
+    def close(self) -> bool:
+        try:
+            self.producer.flush(timeout=self.flush_timeout)
+        except Exception as e:
+            print(f"Error flushing Kafka producer: {e}")
+        finally:
+            self.producer.close()
+
+        elapsed = time.perf_counter() - self.started
+        for topic, sent in self.sent.items():
+            print(f"Published {self.delivered[topic]}/{sent} messages to {topic} "
+                  f"({self.failed[topic]} failed) in {elapsed:.2f}s "
+                  f"({self.delivered[topic] / max(elapsed, 1e-9):.0f} msg/s)")
+        if self.last_error:
+            print(f"Last Kafka delivery error: {self.last_error}")
+
+        return self.succeeded and all(self.delivered[topic] == sent for topic, sent in self.sent.items())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+PUBLISHERS = {
+    'sync': SyncKafkaPublisher,
+    'async': AsyncKafkaPublisher
+}
+
+
+def create_publisher(producer: Optional[Any] = None, mode: str = KAFKA_PUBLISH_MODE):
+    return PUBLISHERS[mode](producer)
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -7,9 +8,24 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent
 
 load_dotenv(PROJECT_ROOT / '.env')
 
-GLOBAL_TERRORISM_CSV = PROJECT_ROOT / 'data' / 'globalterrorismdb_0718dist.csv'
-SECONDARY_TERROR_CSV = PROJECT_ROOT / 'data' / 'RAND_Database_of_Worldwide_Terrorism_Incidents.csv'
+GLOBAL_TERRORISM_CSV = Path(os.environ.get(
+    'GLOBAL_TERRORISM_CSV', PROJECT_ROOT / 'data' / 'globalterrorismdb_0718dist.csv'
+))
+SECONDARY_TERROR_CSV = Path(os.environ.get(
+    'SECONDARY_TERROR_CSV', PROJECT_ROOT / 'data' / 'RAND_Database_of_Worldwide_Terrorism_Incidents.csv'
+))
 # GLOBAL_TERRORISM_CSV = PROJECT_ROOT / 'data' / 'GLOBAL_TERRORISM_CSV.csv'
 # SECONDARY_TERROR_CSV = PROJECT_ROOT / 'data' / 'SECONDARY_TERROR_CSV.csv'
 MERGED_FILES = PROJECT_ROOT / 'data' / 'merged_files' / f'final-data-{formatted_datetime()}.csv'
+MERGED_DATASET_DIR = PROJECT_ROOT / 'data' / 'merged_dataset' / f'final-data-{formatted_datetime()}'
 NEO4J_QUERIES = PROJECT_ROOT / 'data' / f'neo4j-queries-{formatted_datetime()}.cypher'
+COLUMNAR_CACHE_DIR = Path(os.environ.get('COLUMNAR_CACHE_DIR', PROJECT_ROOT / 'data' / 'columnar_cache'))
+INGESTION_MANIFEST_DIR = PROJECT_ROOT / 'data' / 'manifest'
+DEAD_LETTER_FILE = PROJECT_ROOT / 'data' / 'dead_letter' / f'rejected-events-{formatted_datetime()}.jsonl'
+NEO4J_IMPORT_DIR = PROJECT_ROOT / 'data' / 'neo4j_import' / f'import-{formatted_datetime()}'
+ENTITY_REGISTRY_FILE = PROJECT_ROOT / 'data' / 'entity_registry' / 'entities.sqlite3'
+BENCHMARK_DATA_DIR = PROJECT_ROOT / 'data' / 'benchmarks' / 'synthetic'
+BENCHMARK_RESULTS_DIR = PROJECT_ROOT / 'data' / 'benchmarks' / 'results'
+PIPELINE_METRICS_TEXTFILE = Path(os.environ.get(
+    'PIPELINE_METRICS_TEXTFILE', PROJECT_ROOT / 'data' / 'metrics' / 'pipeline_stages.prom'
+))
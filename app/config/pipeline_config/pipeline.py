@@ -0,0 +1,51 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv(verbose=True)
+
+PIPELINE_MODE: str = os.environ.get('PIPELINE_MODE', 'batch')
+STREAMING_CHUNK_SIZE: int = int(os.environ.get('STREAMING_CHUNK_SIZE', 50_000))
+COLUMNAR_CACHE_ENABLED: bool = os.environ.get('COLUMNAR_CACHE_ENABLED', 'true').lower() == 'true'
+MERGED_OUTPUT_FORMAT: str = os.environ.get('MERGED_OUTPUT_FORMAT', 'csv')
+MERGED_PARQUET_COMPRESSION: str = os.environ.get('MERGED_PARQUET_COMPRESSION', 'zstd')
+MERGED_PARQUET_FLUSH_ROWS: int = int(os.environ.get('MERGED_PARQUET_FLUSH_ROWS', 500_000))
+SCHEMA_MEMORY_REPORT: bool = os.environ.get('SCHEMA_MEMORY_REPORT', 'false').lower() == 'true'
+CSV_PARSE_WORKERS: int = int(os.environ.get('CSV_PARSE_WORKERS', os.cpu_count() or 1))
+PARALLEL_PARSE_MIN_BYTES: int = int(os.environ.get('PARALLEL_PARSE_MIN_BYTES', 32 << 20))
+PROCESS_START_METHOD: str = os.environ.get('PROCESS_START_METHOD', 'spawn')
+EVENT_ID_MODE: str = os.environ.get('EVENT_ID_MODE', 'random')
+MERGE_MODE: str = os.environ.get('MERGE_MODE', 'single')
+MERGE_WORKERS: int = int(os.environ.get('MERGE_WORKERS', os.cpu_count() or 1))
+MERGE_PARTITION_FREQ: str = os.environ.get('MERGE_PARTITION_FREQ', 'year')
+MERGE_PARTITIONS_PER_WORKER: int = int(os.environ.get('MERGE_PARTITIONS_PER_WORKER', 2))
+VALIDATION_BATCH_SIZE: int = int(os.environ.get('VALIDATION_BATCH_SIZE', 10_000))
+VALIDATION_WORKERS: int = int(os.environ.get('VALIDATION_WORKERS', os.cpu_count() or 1))
+VALIDATION_CHUNK_SIZE: int = int(os.environ.get('VALIDATION_CHUNK_SIZE', 20_000))
+VALIDATION_ORDERED: bool = os.environ.get('VALIDATION_ORDERED', 'true').lower() == 'true'
+KAFKA_MESSAGE_FORMAT: str = os.environ.get('KAFKA_MESSAGE_FORMAT', 'json')
+KAFKA_PUBLISH_MODE: str = os.environ.get('KAFKA_PUBLISH_MODE', 'sync')
+KAFKA_LINGER_MS: int = int(os.environ.get('KAFKA_LINGER_MS', 50))
+KAFKA_BATCH_SIZE_BYTES: int = int(os.environ.get('KAFKA_BATCH_SIZE_BYTES', 1 << 20))
+KAFKA_BUFFER_MEMORY: int = int(os.environ.get('KAFKA_BUFFER_MEMORY', 128 << 20))
+KAFKA_COMPRESSION: str = os.environ.get('KAFKA_COMPRESSION', 'gzip')
+KAFKA_MAX_IN_FLIGHT: int = int(os.environ.get('KAFKA_MAX_IN_FLIGHT', 5))
+KAFKA_FLUSH_TIMEOUT_S: float = float(os.environ.get('KAFKA_FLUSH_TIMEOUT_S', 300))
+SINK_QUEUE_SIZE: int = int(os.environ.get('SINK_QUEUE_SIZE', 4))
+KAFKA_EVENT_KEY: str = os.environ.get('KAFKA_EVENT_KEY', 'event_id')
+KAFKA_GRAPH_KEY: str = os.environ.get('KAFKA_GRAPH_KEY', 'entity')
+KAFKA_TOPIC_PARTITIONS: int = int(os.environ.get('KAFKA_TOPIC_PARTITIONS', 0))
+GRAPH_MESSAGE_FORMAT: str = os.environ.get('GRAPH_MESSAGE_FORMAT', 'statements')
+GRAPH_ENVELOPE_MAX_STATEMENTS: int = int(os.environ.get('GRAPH_ENVELOPE_MAX_STATEMENTS', 500))
+GRAPH_ENVELOPE_MAX_BYTES: int = int(os.environ.get('GRAPH_ENVELOPE_MAX_BYTES', 512 << 10))
+GRAPH_ENVELOPE_COMPRESSION: str = os.environ.get('GRAPH_ENVELOPE_COMPRESSION', 'zlib')
+GRAPH_STATEMENT_MODE: str = os.environ.get('GRAPH_STATEMENT_MODE', 'literal')
+GRAPH_UNWIND_BATCH_SIZE: int = int(os.environ.get('GRAPH_UNWIND_BATCH_SIZE', 1_000))
+GRAPH_STREAM_BATCH_ROWS: int = int(os.environ.get('GRAPH_STREAM_BATCH_ROWS', 10_000))
+GRAPH_SCHEMA_BOOTSTRAP: bool = os.environ.get('GRAPH_SCHEMA_BOOTSTRAP', 'true').lower() == 'true'
+CYPHER_TRANSACTION_SIZE: int = int(os.environ.get('CYPHER_TRANSACTION_SIZE', 1_000))
+CYPHER_SCRIPT_COMPRESSION: str = os.environ.get('CYPHER_SCRIPT_COMPRESSION', 'gzip')
+CYPHER_SCRIPT_MAX_BYTES: int = int(os.environ.get('CYPHER_SCRIPT_MAX_BYTES', 64 << 20))
+ENTITY_REGISTRY_ENABLED: bool = os.environ.get('ENTITY_REGISTRY_ENABLED', 'true').lower() == 'true'
+PIPELINE_METRICS: str = os.environ.get('PIPELINE_METRICS', 'off')
+PIPELINE_METRICS_TRACE_MEMORY: bool = os.environ.get('PIPELINE_METRICS_TRACE_MEMORY', 'false').lower() == 'true'
+PIPELINE_METRICS_DEEP_MEMORY: bool = os.environ.get('PIPELINE_METRICS_DEEP_MEMORY', 'false').lower() == 'true'
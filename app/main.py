@@ -1,39 +1,152 @@
 import os
 
-from app.config.kafka_config.producer import produce_batch
-from app.config.local_files_config.local_files import MERGED_FILES, NEO4J_QUERIES
-from app.repositories.local_files_repository import save_dataframe_to_csv
+from app.config.kafka_config.publisher import create_publisher
+from app.config.local_files_config.local_files import MERGED_FILES, NEO4J_QUERIES, NEO4J_IMPORT_DIR
+from app.config.pipeline_config.pipeline import PIPELINE_MODE, STREAMING_CHUNK_SIZE
+from app.repositories.merged_dataset_repository import open_merged_writer, save_merged_dataframe
 from app.services.data_processor_service import (
-    create_data_processing_pipeline, add_event_id, prepare_data_for_neo4j, generate_neo4j_cypher_script
+    create_data_processing_pipeline, add_event_id, prepare_data_for_neo4j, generate_neo4j_cypher_script,
+    stream_data_processing_pipeline
 )
-from app.services.data_validator_service import dataframe_to_pydantic_models, prepare_models_for_kafka
-from app.services.neo4j__structure_service import create_neo4j_queries, Neo4jProcessor
+from app.services.data_validator_service import validate_dataframe_in_batches
+from app.repositories.manifest_repository import IngestionManifest
+from app.services.parallel_validation_service import iter_encoded_chunks
+from app.services.sink_service import run_sinks
+from app.services.incremental_service import create_incremental_processing_pipeline, commit_incremental_run
+from app.services.neo4j__structure_service import Neo4jProcessor
+from app.services.bulk_import_service import export_bulk_import, validate_bulk_import, bulk_import_command
+from app.services.topic_routing_service import (
+    publish_events, publish_graph_queries, publish_graph_schema, publish_graph_stream, publishing_session,
+    finish_publishing, publish_event_tombstones, publish_graph_retractions, PlacementState
+)
+from app.utils.save_ne4j_queries_util import save_neo4j_queries
 
 
 def main():
     merged_df = create_data_processing_pipeline()
     merged_df = add_event_id(merged_df)
-    save_dataframe_to_csv(merged_df, MERGED_FILES)
 
-    validated_events = dataframe_to_pydantic_models(merged_df)
+    # save_neo4j_queries(validated_events, NEO4J_QUERIES)
+    with publishing_session() as (publisher, registry):
+        sinks_completed = run_sinks(
+            merged_df,
+            publisher,
+            csv_path=MERGED_FILES,
+            events_topic=os.environ['TERROR_EVENTS'],
+            graph_topic=os.environ['NEO4J_ENTITIES'],
+            registry=registry
+        )
 
-    kafka_messages = prepare_models_for_kafka(validated_events)
+        if not sinks_completed and registry:
+            registry.rollback()
 
-    produce_batch(
-        topic=os.environ['TERROR_EVENTS'],
-        messages=kafka_messages,
-        batch_size=100
-    )
 
-    # save_neo4j_queries(validated_events, NEO4J_QUERIES)
-    neo4j_messages = create_neo4j_queries(validated_events)
+def main_streaming(chunk_size: int = STREAMING_CHUNK_SIZE):
+    processor = Neo4jProcessor()
+    placement = PlacementState()
+
+    with publishing_session() as (publisher, registry), open_merged_writer() as merged_writer:
+        publish_graph_schema(publisher, os.environ['NEO4J_ENTITIES'])
+
+        for merged_df in stream_data_processing_pipeline(chunk_size):
+            merged_df = add_event_id(merged_df)
+            merged_writer.write(merged_df)
+
+            validated_events = validate_dataframe_in_batches(merged_df)
+
+            publish_events(publisher, os.environ['TERROR_EVENTS'], validated_events)
+
+            publish_graph_stream(
+                publisher,
+                os.environ['NEO4J_ENTITIES'],
+                validated_events,
+                placement,
+                registry,
+                processor
+            )
+
 
-    produce_batch(
-        topic=os.environ['NEO4J_ENTITIES'],
-        messages=neo4j_messages,
-        batch_size=100
+def main_incremental():
+    manifest = IngestionManifest().load()
+    merged_df, changed_events, superseded, source_rows = create_incremental_processing_pipeline(manifest)
+    replaced = manifest.known_events(changed_events.index)
+
+    if not merged_df.empty:
+        save_merged_dataframe(merged_df)
+
+    validated_events = validate_dataframe_in_batches(merged_df)
+
+    publisher = create_publisher()
+    schema_published = publish_graph_schema(publisher, os.environ['NEO4J_ENTITIES'])
+    retractions_published = (
+        publish_event_tombstones(publisher, os.environ['TERROR_EVENTS'], superseded)
+        and publish_graph_retractions(publisher, os.environ['NEO4J_ENTITIES'], superseded + replaced)
+    )
+    events_published = publish_events(publisher, os.environ['TERROR_EVENTS'], validated_events)
+
+    processor = Neo4jProcessor(known_entities=manifest.entities)
+    entities_published = publish_graph_stream(
+        publisher,
+        os.environ['NEO4J_ENTITIES'],
+        validated_events,
+        PlacementState(),
+        processor=processor
     )
 
+    published = schema_published and retractions_published and events_published and entities_published
+    if finish_publishing(publisher, None, published):
+        commit_incremental_run(manifest, changed_events, superseded, source_rows, processor.emitted_entities)
+
+
+def main_parallel():
+    merged_df = create_data_processing_pipeline()
+    merged_df = add_event_id(merged_df)
+    save_merged_dataframe(merged_df)
+
+    placement = PlacementState()
+
+    with publishing_session() as (publisher, registry):
+        publish_graph_schema(publisher, os.environ['NEO4J_ENTITIES'])
+
+        for kafka_messages, kafka_keys, graph_queries, _ in iter_encoded_chunks(merged_df, with_graph_queries=True):
+            publisher.publish(
+                topic=os.environ['TERROR_EVENTS'],
+                messages=kafka_messages,
+                keys=kafka_keys
+            )
+
+            publish_graph_queries(publisher, os.environ['NEO4J_ENTITIES'], graph_queries, placement, registry)
+
+
+def main_bulk_import():
+    merged_df = create_data_processing_pipeline()
+    merged_df = add_event_id(merged_df)
+
+    validated_events = validate_dataframe_in_batches(merged_df)
+
+    export_bulk_import(validated_events, NEO4J_IMPORT_DIR)
+    print(f"Validated bulk import files: {validate_bulk_import(NEO4J_IMPORT_DIR)}")
+    print(f"Load them with: {bulk_import_command(NEO4J_IMPORT_DIR)}")
+
+
+def main_cypher_script():
+    merged_df = create_data_processing_pipeline()
+    merged_df = add_event_id(merged_df)
+
+    validated_events = validate_dataframe_in_batches(merged_df)
+
+    save_neo4j_queries(validated_events, NEO4J_QUERIES)
+
+
+PIPELINE_MODES = {
+    'batch': main,
+    'streaming': main_streaming,
+    'incremental': main_incremental,
+    'parallel': main_parallel,
+    'bulk_import': main_bulk_import,
+    'cypher_script': main_cypher_script
+}
+
 
 if __name__ == '__main__':
-    main()
+    PIPELINE_MODES[PIPELINE_MODE]()
@@ -0,0 +1,203 @@
+import hashlib
+import json
+import operator
+import os
+from pathlib import Path
+from typing import List, Optional, Any, Dict, Iterator, Tuple
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from app.config.local_files_config.local_files import COLUMNAR_CACHE_DIR
+from app.repositories.parallel_csv_repository import read_csv_dataframe
+from app.repositories.source_schema import dtypes_signature
+
+Filters = List[Tuple[str, str, Any]]
+
+HASH_BLOCK_SIZE: int = 1 << 20
+ROW_GROUP_SIZE: int = 100_000
+
+FILTER_OPERATORS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    'in': lambda series, values: series.isin(values),
+    'not in': lambda series, values: ~series.isin(values)
+}
+
+
+def file_content_hash(file_path: Path) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        while block := f.read(HASH_BLOCK_SIZE):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_paths(file_path: Path, cache_dir: Path = COLUMNAR_CACHE_DIR) -> Tuple[Path, Path]:
+    stem = Path(file_path).stem
+    return cache_dir / f'{stem}.parquet', cache_dir / f'{stem}.meta.json'
+
+
+def read_cache_metadata(meta_path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def is_cache_valid(
+        file_path: Path,
+        columns: Optional[List[str]],
+        dtypes: Optional[Dict[str, Any]] = None,
+        cache_dir: Path = COLUMNAR_CACHE_DIR
+) -> bool:
+    data_path, meta_path = cache_paths(file_path, cache_dir)
+    meta = read_cache_metadata(meta_path)
+    if meta is None or not data_path.exists():
+        return False
+
+    if meta.get('dtypes') != dtypes_signature(dtypes or {}):
+        return False
+
+    if columns is not None and not set(columns).issubset(meta['columns']):
+        return False
+
+    stat = os.stat(file_path)
+    if meta['size'] != stat.st_size:
+        return False
+    if meta['mtime_ns'] == stat.st_mtime_ns:
+        return True
+
+    if meta['hash'] != file_content_hash(file_path):
+        return False
+
+    meta['mtime_ns'] = stat.st_mtime_ns
+    write_cache_metadata(meta_path, meta)
+    return True
+
+
+def write_cache_metadata(meta_path: Path, meta: Dict[str, Any]) -> None:
+    tmp_path = meta_path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, meta_path)
+
+
+def build_columnar_cache(
+        file_path: Path,
+        columns: Optional[List[str]] = None,
+        dtypes: Optional[Dict[str, Any]] = None,
+        cache_dir: Path = COLUMNAR_CACHE_DIR,
+        compression: str = 'zstd'
+) -> Path:
+    data_path, meta_path = cache_paths(file_path, cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    stat = os.stat(file_path)
+    df = read_csv_dataframe(file_path, columns, dtypes)
+
+    tmp_path = data_path.with_suffix('.tmp')
+    pq.write_table(
+        pa.Table.from_pandas(df, preserve_index=False),
+        tmp_path,
+        compression=compression,
+        row_group_size=ROW_GROUP_SIZE
+    )
+    os.replace(tmp_path, data_path)
+
+    write_cache_metadata(meta_path, {
+        'source': str(file_path),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'hash': file_content_hash(file_path),
+        'columns': list(df.columns),
+        'dtypes': dtypes_signature(dtypes or {})
+    })
+
+    print(f'Columnar cache for {file_path} was written to {data_path}')
+    return data_path
+
+
+def ensure_columnar_cache(
+        file_path: Path,
+        source_columns: Optional[List[str]] = None,
+        dtypes: Optional[Dict[str, Any]] = None,
+        cache_dir: Path = COLUMNAR_CACHE_DIR
+) -> Path:
+    if is_cache_valid(file_path, source_columns, dtypes, cache_dir):
+        return cache_paths(file_path, cache_dir)[0]
+    return build_columnar_cache(file_path, source_columns, dtypes, cache_dir)
+
+
+def arrow_to_pandas(data: pa.Table | pa.RecordBatch, dtypes: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+    df = data.to_pandas()
+    object_columns = df.columns[df.dtypes == object]
+    df[object_columns] = df[object_columns].where(df[object_columns].notna(), np.nan)
+
+    mismatched = {
+        column: dtype for column, dtype in (dtypes or {}).items()
+        if column in df.columns and df[column].dtype != pd.api.types.pandas_dtype(dtype)
+    }
+    return df.astype(mismatched) if mismatched else df
+
+
+def load_cached_dataframe(
+        file_path: Path,
+        source_columns: Optional[List[str]] = None,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Filters] = None,
+        dtypes: Optional[Dict[str, Any]] = None,
+        cache_dir: Path = COLUMNAR_CACHE_DIR
+) -> pd.DataFrame:
+    dataset = ds.dataset(ensure_columnar_cache(file_path, source_columns, dtypes, cache_dir), format='parquet')
+    table = dataset.to_table(
+        columns=columns or source_columns,
+        filter=pq.filters_to_expression(filters) if filters else None
+    )
+    return arrow_to_pandas(table, dtypes)
+
+
+def iter_cached_dataframe_chunks(
+        file_path: Path,
+        chunk_size: int,
+        source_columns: Optional[List[str]] = None,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Filters] = None,
+        dtypes: Optional[Dict[str, Any]] = None,
+        cache_dir: Path = COLUMNAR_CACHE_DIR
+) -> Iterator[pd.DataFrame]:
+    dataset = ds.dataset(ensure_columnar_cache(file_path, source_columns, dtypes, cache_dir), format='parquet')
+    batches = dataset.to_batches(
+        columns=columns or source_columns,
+        filter=pq.filters_to_expression(filters) if filters else None,
+        batch_size=chunk_size
+    )
+    for batch in batches:
+        if batch.num_rows:
+            yield arrow_to_pandas(batch, dtypes)
+
+
+def year_range_filter(start_year: Optional[int] = None, end_year: Optional[int] = None,
+                      column: str = 'iyear') -> Filters:
+    filters: Filters = []
+    if start_year is not None:
+        filters.append((column, '>=', start_year))
+    if end_year is not None:
+        filters.append((column, '<=', end_year))
+    return filters
+
+
+def apply_filters(df: pd.DataFrame, filters: Optional[Filters]) -> pd.DataFrame:
+    if not filters:
+        return df
+    mask = pd.Series(True, index=df.index)
+    for column, op, value in filters:
+        mask &= FILTER_OPERATORS[op](df[column], value)
+    return df[mask]
@@ -0,0 +1,51 @@
+import sqlite3
+from pathlib import Path
+from typing import Iterable, Set, Optional
+
+from app.config.local_files_config.local_files import ENTITY_REGISTRY_FILE
+from app.config.pipeline_config.pipeline import ENTITY_REGISTRY_ENABLED
+from app.utils.formatted_date_util import formatted_datetime
+
+
+class EntityRegistry:
+    def __init__(self, path: Path = ENTITY_REGISTRY_FILE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS entities ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "entity_key TEXT NOT NULL UNIQUE, "
+            "kind TEXT NOT NULL, "
+            "published_at TEXT NOT NULL)"
+        )
+        self.published: Set[str] = {key for (key,) in self.connection.execute("SELECT entity_key FROM entities")}
+        self.pending: Set[str] = set()
+
+    def is_published(self, key: str) -> bool:
+        return key in self.published
+
+    def stage(self, keys: Iterable[str]) -> None:
+        self.pending.update(key for key in keys if key not in self.published)
+
+    def commit(self) -> int:
+        published_at = formatted_datetime()
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO entities (entity_key, kind, published_at) VALUES (?, ?, ?)",
+                ((key, key.split(':', 1)[0], published_at) for key in self.pending)
+            )
+        committed = len(self.pending)
+        self.published |= self.pending
+        self.pending = set()
+        return committed
+
+    def rollback(self) -> None:
+        self.pending = set()
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+def open_entity_registry(enabled: bool = ENTITY_REGISTRY_ENABLED) -> Optional[EntityRegistry]:
+    return EntityRegistry() if enabled else None
@@ -1,11 +1,18 @@
 from functools import partial
-from typing import List, Optional, Any
+from pathlib import Path
+from typing import List, Optional, Any, Iterator, Dict
 import pandas as pd
 
 from app.config.local_files_config.local_files import GLOBAL_TERRORISM_CSV, SECONDARY_TERROR_CSV
+from app.config.pipeline_config.pipeline import COLUMNAR_CACHE_ENABLED, SCHEMA_MEMORY_REPORT
+from app.repositories.columnar_cache_repository import (
+    Filters, load_cached_dataframe, iter_cached_dataframe_chunks, apply_filters
+)
+from app.repositories.parallel_csv_repository import read_csv_dataframe
+from app.repositories.source_schema import primary_df_dtypes, secondary_df_dtypes, print_schema_memory_report
 
 primary_df_columns: List[str] = [
-    'iyear', 'imonth', 'iday', 'country_txt', 'region_txt',
+    'eventid', 'iyear', 'imonth', 'iday', 'country_txt', 'region_txt',
     'provstate', 'city', 'latitude', 'longitude', 'summary',
     'attacktype1_txt', 'attacktype2_txt', 'attacktype3_txt',
     'targtype1_txt', 'targsubtype1_txt', 'targtype2_txt',
@@ -20,12 +27,58 @@ secondary_df_columns: List[str] = ['Date', 'City', 'Country', 'Injuries', 'Fatal
 def load_csv_dataframe(
         file_path: str,
         columns: Optional[List[str]] = None,
-        low_memory: bool = False
+        low_memory: bool = False,
+        dtypes: Optional[Dict[str, Any]] = None
+) -> pd.DataFrame:
+    return read_csv_dataframe(file_path, columns, dtypes, low_memory)
+
+
+def iter_csv_dataframe_chunks(
+        file_path: str,
+        chunk_size: int,
+        columns: Optional[List[str]] = None,
+        dtypes: Optional[Dict[str, Any]] = None
+) -> Iterator[pd.DataFrame]:
+    with pd.read_csv(file_path, encoding='latin1', usecols=columns, chunksize=chunk_size, dtype=dtypes) as reader:
+        yield from reader
+
+
+def load_source_dataframe(
+        file_path: str,
+        source_columns: Optional[List[str]] = None,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Filters] = None,
+        dtypes: Optional[Dict[str, Any]] = None,
+        use_cache: bool = COLUMNAR_CACHE_ENABLED
 ) -> pd.DataFrame:
-    if columns:
-        return pd.read_csv(file_path, encoding='latin1', usecols=columns, low_memory=low_memory)
+    if use_cache:
+        df = load_cached_dataframe(file_path, source_columns, columns, filters, dtypes)
     else:
-        return pd.read_csv(file_path, encoding='latin1', low_memory=low_memory)
+        df = apply_filters(load_csv_dataframe(file_path, source_columns, dtypes=dtypes), filters)
+        df = df[columns] if columns else df
+
+    if SCHEMA_MEMORY_REPORT:
+        print_schema_memory_report(df, Path(file_path).name)
+
+    return df
+
+
+def iter_source_dataframe_chunks(
+        file_path: str,
+        chunk_size: int,
+        source_columns: Optional[List[str]] = None,
+        columns: Optional[List[str]] = None,
+        filters: Optional[Filters] = None,
+        dtypes: Optional[Dict[str, Any]] = None,
+        use_cache: bool = COLUMNAR_CACHE_ENABLED
+) -> Iterator[pd.DataFrame]:
+    if use_cache:
+        yield from iter_cached_dataframe_chunks(file_path, chunk_size, source_columns, columns, filters, dtypes)
+        return
+
+    for chunk in iter_csv_dataframe_chunks(file_path, chunk_size, source_columns, dtypes):
+        chunk = apply_filters(chunk, filters)
+        yield chunk[columns] if columns else chunk
 
 
 def save_dataframe_to_csv(
@@ -57,13 +110,22 @@ def save_dataframe_to_csv(
 
 
 load_primary_csv: partial[pd.DataFrame] = partial(
-    load_csv_dataframe,
+    load_source_dataframe,
+    file_path=GLOBAL_TERRORISM_CSV,
+    source_columns=primary_df_columns,
+    dtypes=primary_df_dtypes
+)
+
+iter_primary_csv_chunks: partial[Iterator[pd.DataFrame]] = partial(
+    iter_source_dataframe_chunks,
     file_path=GLOBAL_TERRORISM_CSV,
-    columns=primary_df_columns
+    source_columns=primary_df_columns,
+    dtypes=primary_df_dtypes
 )
 
 load_secondary_csv: partial[pd.DataFrame] = partial(
-    load_csv_dataframe,
+    load_source_dataframe,
     file_path=SECONDARY_TERROR_CSV,
-    columns=secondary_df_columns
+    source_columns=secondary_df_columns,
+    dtypes=secondary_df_dtypes
 )
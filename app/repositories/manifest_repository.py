@@ -0,0 +1,88 @@
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Set
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.config.local_files_config.local_files import INGESTION_MANIFEST_DIR
+from app.utils.formatted_date_util import formatted_datetime
+
+
+class IngestionManifest:
+    def __init__(self, manifest_dir: Path = INGESTION_MANIFEST_DIR):
+        self.manifest_dir = Path(manifest_dir)
+        self.source_rows: Dict[str, np.ndarray] = {}
+        self.events: pd.DataFrame = pd.DataFrame({
+            'fingerprint': pd.Series(dtype=np.uint64),
+            'merge_key': pd.Series(dtype=np.uint64)
+        })
+        self.entities: Set[str] = set()
+
+    def _path(self, name: str) -> Path:
+        return self.manifest_dir / f'{name}.parquet'
+
+    def known_rows(self, source: str) -> np.ndarray:
+        return self.source_rows.get(source, np.array([], dtype=np.uint64))
+
+    def add_rows(self, source: str, fingerprints: np.ndarray) -> None:
+        self.source_rows[source] = np.union1d(self.known_rows(source), fingerprints)
+
+    def add_events(self, events: pd.DataFrame) -> None:
+        self.events = pd.concat([self.events[~self.events.index.isin(events.index)], events])
+
+    def known_events(self, event_ids: pd.Index) -> List[str]:
+        return event_ids[event_ids.isin(self.events.index)].tolist()
+
+    def remove_events(self, event_ids: List[str]) -> None:
+        self.events = self.events[~self.events.index.isin(event_ids)]
+
+    def load(self) -> 'IngestionManifest':
+        meta_path = self.manifest_dir / 'manifest.json'
+        if not meta_path.exists():
+            return self
+
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+
+        for source in meta.get('sources', []):
+            self.source_rows[source] = pq.read_table(self._path(f'rows_{source}')).column('fingerprint').to_numpy()
+
+        self.events = pq.read_table(self._path('events')).to_pandas().set_index('event_id').rename_axis(None)
+        self.entities = set(pq.read_table(self._path('entities')).column('entity_key').to_pylist())
+        return self
+
+    def _write_table(self, name: str, table: pa.Table) -> None:
+        tmp_path = self._path(name).with_suffix('.tmp')
+        pq.write_table(table, tmp_path, compression='zstd')
+        os.replace(tmp_path, self._path(name))
+
+    def save(self) -> None:
+        self.manifest_dir.mkdir(parents=True, exist_ok=True)
+
+        for source, fingerprints in self.source_rows.items():
+            self._write_table(f'rows_{source}', pa.table({'fingerprint': pa.array(fingerprints, pa.uint64())}))
+        self._write_table('events', pa.table({
+            'event_id': pa.array(self.events.index.to_numpy(), pa.string()),
+            'fingerprint': pa.array(self.events['fingerprint'].to_numpy(), pa.uint64()),
+            'merge_key': pa.array(self.events['merge_key'].to_numpy(), pa.uint64())
+        }))
+        self._write_table('entities', pa.table({'entity_key': pa.array(sorted(self.entities), pa.string())}))
+
+        meta_path = self.manifest_dir / 'manifest.json'
+        tmp_path = meta_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'updated_at': formatted_datetime(),
+                'sources': sorted(self.source_rows),
+                'counts': {
+                    **{f'rows_{source}': len(rows) for source, rows in self.source_rows.items()},
+                    'events': len(self.events),
+                    'entities': len(self.entities)
+                }
+            }, f, indent=2)
+        os.replace(tmp_path, meta_path)
+
+        print(f'Ingestion manifest was saved to {self.manifest_dir}')
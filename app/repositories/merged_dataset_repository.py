@@ -0,0 +1,208 @@
+import json
+import operator
+import os
+import shutil
+from functools import reduce
+from pathlib import Path
+from typing import List, Optional, Any, Dict, Iterable
+from urllib.parse import unquote
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from app.config.local_files_config.local_files import MERGED_FILES, MERGED_DATASET_DIR
+from app.config.pipeline_config.pipeline import (
+    MERGED_OUTPUT_FORMAT, MERGED_PARQUET_COMPRESSION, MERGED_PARQUET_FLUSH_ROWS
+)
+from app.repositories.columnar_cache_repository import Filters, arrow_to_pandas
+from app.repositories.local_files_repository import save_dataframe_to_csv
+from app.utils.formatted_date_util import formatted_datetime
+
+PARTITION_SCHEMA: pa.Schema = pa.schema([('year', pa.int32()), ('region', pa.string())])
+MANIFEST_NAME: str = '_manifest.json'
+NULL_PARTITION: str = '__HIVE_DEFAULT_PARTITION__'
+
+
+def partition_table(df: pd.DataFrame) -> pa.Table:
+    partitioned = df.assign(
+        year=df['event_date'].dt.year.astype('Int32'),
+        region=df['region'].astype(object).where(df['region'].notna(), None)
+    )
+    return pa.Table.from_pandas(partitioned, preserve_index=False)
+
+
+def merge_statistics(statistics: Dict[str, Dict[str, Any]], metadata: pq.FileMetaData) -> None:
+    for row_group in range(metadata.num_row_groups):
+        group = metadata.row_group(row_group)
+        for index in range(group.num_columns):
+            column = group.column(index)
+            if column.statistics is None:
+                continue
+            stats = statistics.setdefault(column.path_in_schema, {'null_count': 0})
+            stats['null_count'] += column.statistics.null_count or 0
+            if column.statistics.has_min_max:
+                low, high = column.statistics.min, column.statistics.max
+                stats['min'] = low if 'min' not in stats else min(stats['min'], low)
+                stats['max'] = high if 'max' not in stats else max(stats['max'], high)
+
+
+class MergedDatasetWriter:
+    def __init__(
+            self,
+            dataset_dir: Path = MERGED_DATASET_DIR,
+            compression: str = MERGED_PARQUET_COMPRESSION,
+            flush_rows: int = MERGED_PARQUET_FLUSH_ROWS
+    ):
+        self.dataset_dir = Path(dataset_dir)
+        self.temp_dir = self.dataset_dir.with_name(self.dataset_dir.name + '.tmp')
+        self.compression = compression
+        self.flush_rows = flush_rows
+        self.buffered: List[pa.Table] = []
+        self.columns: Optional[List[str]] = None
+        self.dtypes: Dict[str, str] = {}
+        self.files: List[Dict[str, Any]] = []
+        self.statistics: Dict[str, Dict[str, Any]] = {}
+        self.batches = 0
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        self.temp_dir.mkdir(parents=True)
+
+    def _record_file(self, written_file: Any) -> None:
+        relative = Path(written_file.path).relative_to(self.temp_dir)
+        values = dict(unquote(part).split('=', 1) for part in relative.parts[:-1])
+        partition = {
+            name: None if values[name] == NULL_PARTITION else int(values[name]) if pa.types.is_integer(field.type)
+            else values[name]
+            for name, field in zip(PARTITION_SCHEMA.names, PARTITION_SCHEMA)
+        }
+        self.files.append({
+            'path': relative.as_posix(),
+            'partition': partition,
+            'rows': written_file.metadata.num_rows,
+            'bytes': os.path.getsize(written_file.path)
+        })
+        merge_statistics(self.statistics, written_file.metadata)
+
+    def write(self, df: pd.DataFrame) -> None:
+        if self.columns is None:
+            self.columns = list(df.columns)
+            self.dtypes = {column: str(dtype) for column, dtype in df.dtypes.items()}
+        if df.empty:
+            return
+
+        self.buffered.append(partition_table(df))
+        if sum(table.num_rows for table in self.buffered) >= self.flush_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.buffered:
+            return
+
+        ds.write_dataset(
+            pa.concat_tables(self.buffered, promote_options='permissive'),
+            self.temp_dir,
+            format='parquet',
+            partitioning=ds.partitioning(PARTITION_SCHEMA, flavor='hive'),
+            basename_template=f'part-{self.batches:05d}-{{i}}.parquet',
+            existing_data_behavior='overwrite_or_ignore',
+            file_options=ds.ParquetFileFormat().make_write_options(compression=self.compression),
+            file_visitor=self._record_file
+        )
+        self.buffered = []
+        self.batches += 1
+
+    def close(self) -> Path:
+        self.flush()
+        manifest = {
+            'created_at': formatted_datetime(),
+            'format': 'parquet',
+            'compression': self.compression,
+            'partitioning': PARTITION_SCHEMA.names,
+            'columns': self.columns or [],
+            'dtypes': self.dtypes,
+            'rows': sum(file['rows'] for file in self.files),
+            'files': self.files,
+            'statistics': {
+                column: stats for column, stats in self.statistics.items() if column not in PARTITION_SCHEMA.names
+            }
+        }
+        with open(self.temp_dir / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, default=str, indent=2)
+
+        if self.dataset_dir.exists():
+            shutil.rmtree(self.dataset_dir)
+        os.replace(self.temp_dir, self.dataset_dir)
+
+        print(f"Merged dataset with {manifest['rows']} rows in {len(self.files)} files was saved to {self.dataset_dir}")
+        return self.dataset_dir
+
+    def abort(self) -> None:
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def __enter__(self) -> 'MergedDatasetWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class MergedCsvWriter:
+    def __init__(self, path: Path = MERGED_FILES):
+        self.path = path
+        self.batches = 0
+
+    def write(self, df: pd.DataFrame) -> None:
+        save_dataframe_to_csv(df, self.path, mode='w' if self.batches == 0 else 'a', header=self.batches == 0)
+        self.batches += 1
+
+    def __enter__(self) -> 'MergedCsvWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+def open_merged_writer(
+        output_format: str = MERGED_OUTPUT_FORMAT,
+        csv_path: Path = MERGED_FILES,
+        dataset_dir: Path = MERGED_DATASET_DIR
+) -> MergedCsvWriter | MergedDatasetWriter:
+    return MergedDatasetWriter(dataset_dir) if output_format == 'parquet' else MergedCsvWriter(csv_path)
+
+
+def save_merged_dataframe(df: pd.DataFrame, output_format: str = MERGED_OUTPUT_FORMAT) -> None:
+    with open_merged_writer(output_format) as writer:
+        writer.write(df)
+
+
+def read_dataset_manifest(dataset_dir: Path) -> Dict[str, Any]:
+    with open(Path(dataset_dir) / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_merged_dataset(
+        dataset_dir: Path,
+        columns: Optional[List[str]] = None,
+        years: Optional[Iterable[int]] = None,
+        regions: Optional[Iterable[str]] = None,
+        filters: Optional[Filters] = None
+) -> pd.DataFrame:
+    manifest = read_dataset_manifest(dataset_dir)
+    dataset = ds.dataset(dataset_dir, format='parquet', partitioning=ds.partitioning(PARTITION_SCHEMA, flavor='hive'))
+
+    expressions = [pq.filters_to_expression(filters)] if filters else []
+    if years is not None:
+        expressions.append(ds.field('year').isin(list(years)))
+    if regions is not None:
+        expressions.append(ds.field('region').isin(list(regions)))
+
+    table = dataset.to_table(
+        columns=columns or manifest['columns'],
+        filter=reduce(operator.and_, expressions) if expressions else None
+    )
+    return arrow_to_pandas(table, {
+        column: dtype for column, dtype in manifest['dtypes'].items() if column in table.column_names
+    })
@@ -0,0 +1,109 @@
+import io
+import os
+from pathlib import Path
+from typing import List, Optional, Any, Dict, Tuple
+import pandas as pd
+
+from app.config.pipeline_config.pipeline import CSV_PARSE_WORKERS, PARALLEL_PARSE_MIN_BYTES
+from app.utils.categorical_util import concat_preserving_categoricals
+from app.utils.parallel_util import create_process_pool
+
+SCAN_BLOCK_SIZE: int = 8 << 20
+QUOTE: bytes = b'"'
+NEWLINE: bytes = b'\n'
+
+
+def read_header(file_path: Path) -> Tuple[List[str], int]:
+    with open(file_path, 'rb') as f:
+        header_line = f.readline()
+    names = pd.read_csv(io.BytesIO(header_line), encoding='latin1', nrows=0).columns.tolist()
+    return names, len(header_line)
+
+
+def find_line_boundaries(file_path: Path, data_start: int, parts: int) -> List[int]:
+    size = os.path.getsize(file_path)
+    targets = [data_start + (size - data_start) * i // parts for i in range(1, parts)]
+    boundaries = [data_start]
+
+    in_quotes = False
+    block_start = data_start
+    with open(file_path, 'rb') as f:
+        f.seek(data_start)
+        while targets and (block := f.read(SCAN_BLOCK_SIZE)):
+            position = 0
+            while targets:
+                search_from = max(targets[0] - block_start, position)
+                newline = block.find(NEWLINE, search_from)
+                if newline == -1:
+                    break
+
+                in_quotes ^= block.count(QUOTE, position, newline) % 2 == 1
+                position = newline + 1
+                if not in_quotes:
+                    boundaries.append(block_start + position)
+                    targets.pop(0)
+
+            in_quotes ^= block.count(QUOTE, position) % 2 == 1
+            block_start += len(block)
+
+    boundaries.append(size)
+    return sorted(set(boundaries))
+
+
+def parse_byte_range(
+        file_path: Path,
+        start: int,
+        end: int,
+        names: List[str],
+        columns: Optional[List[str]],
+        dtypes: Optional[Dict[str, Any]]
+) -> pd.DataFrame:
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    return pd.read_csv(
+        io.BytesIO(data),
+        encoding='latin1',
+        header=None,
+        names=names,
+        usecols=columns,
+        dtype=dtypes,
+        low_memory=False
+    )
+
+
+def read_csv_parallel(
+        file_path: Path,
+        columns: Optional[List[str]] = None,
+        dtypes: Optional[Dict[str, Any]] = None,
+        workers: Optional[int] = None
+) -> pd.DataFrame:
+    workers = workers or os.cpu_count() or 1
+    names, data_start = read_header(file_path)
+    boundaries = find_line_boundaries(file_path, data_start, workers)
+    ranges = [(start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start]
+
+    if len(ranges) <= 1:
+        return pd.read_csv(file_path, encoding='latin1', usecols=columns, dtype=dtypes, low_memory=False)
+
+    with create_process_pool(min(workers, len(ranges))) as executor:
+        parts = list(executor.map(
+            parse_byte_range,
+            *zip(*[(file_path, start, end, names, columns, dtypes) for start, end in ranges])
+        ))
+
+    df = concat_preserving_categoricals(parts, ignore_index=True)
+    return df[[col for col in names if columns is None or col in columns]]
+
+
+def read_csv_dataframe(
+        file_path: Path,
+        columns: Optional[List[str]] = None,
+        dtypes: Optional[Dict[str, Any]] = None,
+        low_memory: bool = False,
+        workers: int = CSV_PARSE_WORKERS
+) -> pd.DataFrame:
+    if workers > 1 and os.path.getsize(file_path) >= PARALLEL_PARSE_MIN_BYTES:
+        return read_csv_parallel(file_path, columns, dtypes, workers)
+    return pd.read_csv(file_path, encoding='latin1', usecols=columns, low_memory=low_memory, dtype=dtypes)
@@ -0,0 +1,86 @@
+from typing import Dict, Any
+import numpy as np
+import pandas as pd
+
+CATEGORY = 'category'
+
+primary_df_dtypes: Dict[str, Any] = {
+    'eventid': 'Int64',
+    'iyear': 'Int16',
+    'imonth': 'Int8',
+    'iday': 'Int8',
+    'country_txt': CATEGORY,
+    'region_txt': CATEGORY,
+    'provstate': CATEGORY,
+    'city': CATEGORY,
+    'latitude': np.float64,
+    'longitude': np.float64,
+    'summary': object,
+    'attacktype1_txt': CATEGORY,
+    'attacktype2_txt': CATEGORY,
+    'attacktype3_txt': CATEGORY,
+    'targtype1_txt': CATEGORY,
+    'targsubtype1_txt': CATEGORY,
+    'targtype2_txt': CATEGORY,
+    'targsubtype2_txt': CATEGORY,
+    'targtype3_txt': CATEGORY,
+    'targsubtype3_txt': CATEGORY,
+    'gname': CATEGORY,
+    'gsubname': CATEGORY,
+    'gname2': CATEGORY,
+    'gsubname2': CATEGORY,
+    'gname3': CATEGORY,
+    'gsubname3': CATEGORY,
+    'nkill': np.float32,
+    'nkillter': np.float32,
+    'nwound': np.float32,
+    'nwoundte': np.float32,
+    'nperps': np.float32,
+    'nperpcap': np.float32
+}
+
+secondary_df_dtypes: Dict[str, Any] = {
+    'Date': object,
+    'City': CATEGORY,
+    'Country': CATEGORY,
+    'Injuries': np.float32,
+    'Fatalities': np.float32,
+    'Description': object
+}
+
+
+def dtypes_signature(dtypes: Dict[str, Any]) -> Dict[str, str]:
+    return {column: str(pd.api.types.pandas_dtype(dtype)) for column, dtype in dtypes.items()}
+
+
+def inferred_dtype(dtype: Any) -> Any:
+    if isinstance(dtype, pd.CategoricalDtype):
+        return object
+    if pd.api.types.is_float_dtype(dtype):
+        return np.float64
+    if pd.api.types.is_integer_dtype(dtype):
+        return np.float64 if isinstance(dtype, pd.api.extensions.ExtensionDtype) else np.int64
+    return dtype
+
+
+def schema_memory_report(df: pd.DataFrame) -> pd.DataFrame:
+    rows = [
+        {
+            'column': column,
+            'dtype': str(df[column].dtype),
+            'inferred_bytes': df[column].astype(inferred_dtype(df[column].dtype)).memory_usage(index=False, deep=True),
+            'typed_bytes': df[column].memory_usage(index=False, deep=True)
+        }
+        for column in df.columns
+    ]
+    report = pd.DataFrame(rows)
+    report['saved_bytes'] = report['inferred_bytes'] - report['typed_bytes']
+    report['saved_pct'] = (100 * report['saved_bytes'] / report['inferred_bytes'].clip(lower=1)).round(1)
+    return report.sort_values('saved_bytes', ascending=False, ignore_index=True)
+
+
+def print_schema_memory_report(df: pd.DataFrame, name: str) -> None:
+    report = schema_memory_report(df)
+    print(f'Memory saved by typed schema for {name}: '
+          f'{report["saved_bytes"].sum() / 2 ** 20:.1f} MiB of {report["inferred_bytes"].sum() / 2 ** 20:.1f} MiB')
+    print(report.to_string(index=False))
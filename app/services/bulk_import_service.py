@@ -0,0 +1,160 @@
+import csv
+import hashlib
+from collections import Counter
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple, Set, Any
+
+from app.models.terror_event import TerrorEvent
+from app.services.neo4j__structure_service import (
+    ENTITY_SHAPES, RELATIONSHIP_SHAPES, Neo4jProcessor
+)
+from app.utils.stage_metrics_util import metered
+
+NODE_HEADERS: Dict[str, List[str]] = {
+    'Attack': [
+        'id:ID(Attack)', 'date', 'data_source', 'num_killed:float', 'num_wounded:float', 'total_casualties:float',
+        'num_perpetrators:long', 'num_perpetrators_captured:long', 'summary', 'description', ':LABEL'
+    ],
+    'Location': [
+        ':ID(Location)', 'country', 'city', 'region', 'province', 'latitude', 'longitude', ':LABEL'
+    ],
+    'TerrorGroup': [':ID(TerrorGroup)', 'name', ':LABEL'],
+    'AttackType': [':ID(AttackType)', 'type', ':LABEL'],
+    'Target': [':ID(Target)', 'type', ':LABEL']
+}
+RELATIONSHIP_HEADERS: Dict[str, List[str]] = {
+    shape: [':START_ID(Attack)', f':END_ID({label})', ':TYPE']
+    for shape, label in RELATIONSHIP_SHAPES.items()
+}
+
+
+def import_files(import_dir: Path, name: str) -> Tuple[Path, Path]:
+    return import_dir / f'{name}_header.csv', import_dir / f'{name}.csv'
+
+
+def entity_node_id(entity_key: str) -> str:
+    return hashlib.blake2b(entity_key.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def node_record(header: List[str], node_id: str, label: str, props: Dict[str, Any]) -> List[Any]:
+    record = []
+    for column in header:
+        name, _, kind = column.partition(':')
+        if kind.startswith('ID'):
+            record.append(node_id)
+        elif kind == 'LABEL':
+            record.append(label)
+        else:
+            record.append(props.get(name, ''))
+    return record
+
+
+def open_import_writer(stack: ExitStack, import_dir: Path, name: str, header: List[str]) -> Any:
+    header_path, data_path = import_files(import_dir, name)
+    with open(header_path, 'w', encoding='utf-8', newline='') as f:
+        csv.writer(f).writerow(header)
+    return csv.writer(stack.enter_context(open(data_path, 'w', encoding='utf-8', newline='')))
+
+
+@metered('export_bulk_import')
+def export_bulk_import(events: Iterable[TerrorEvent], import_dir: Path) -> Dict[str, int]:
+    import_dir = Path(import_dir)
+    import_dir.mkdir(parents=True, exist_ok=True)
+
+    counts: Counter = Counter()
+    entity_ids: Dict[str, str] = {}
+    attack_ids: Set[str] = set()
+    relationships: List[Tuple[str, str, str]] = []
+    duplicate_attack = False
+
+    with ExitStack() as stack:
+        writers = {
+            name: open_import_writer(stack, import_dir, name, header)
+            for name, header in {**NODE_HEADERS, **RELATIONSHIP_HEADERS}.items()
+        }
+
+        for shape, props, key, dependency in Neo4jProcessor().iter_event_rows(events):
+            if shape in ENTITY_SHAPES:
+                if key in entity_ids:
+                    counts[f'duplicate {shape}'] += 1
+                    continue
+                node_id = entity_ids[key] = entity_node_id(key)
+                writers[shape].writerow(node_record(NODE_HEADERS[shape], node_id, shape, props))
+                counts[shape] += 1
+            elif shape == 'Attack':
+                duplicate_attack = key in attack_ids
+                if duplicate_attack:
+                    counts['duplicate Attack'] += 1
+                    continue
+                attack_ids.add(key)
+                writers[shape].writerow(node_record(NODE_HEADERS[shape], key, shape, props))
+                counts[shape] += 1
+            elif not duplicate_attack:
+                relationships.append((shape, props['id'], dependency))
+
+        for shape, start_id, dependency in relationships:
+            if dependency in entity_ids:
+                writers[shape].writerow([start_id, entity_ids[dependency], shape])
+                counts[shape] += 1
+
+    print(f"Bulk import files were saved to {import_dir}: {dict(counts)}")
+    return dict(counts)
+
+
+def read_import_table(import_dir: Path, name: str) -> Iterator[List[str]]:
+    header_path, data_path = import_files(import_dir, name)
+    with open(header_path, 'r', encoding='utf-8', newline='') as f:
+        header = next(csv.reader(f))
+    with open(data_path, 'r', encoding='utf-8', newline='') as f:
+        yield header
+        yield from csv.reader(f)
+
+
+@metered('validate_bulk_import')
+def validate_bulk_import(import_dir: Path) -> Dict[str, int]:
+    import_dir = Path(import_dir)
+    node_ids: Dict[str, Set[str]] = {}
+    failures = []
+
+    for label in NODE_HEADERS:
+        table = read_import_table(import_dir, label)
+        header = next(table)
+        id_column = next(i for i, column in enumerate(header) if ':ID(' in column)
+        ids = node_ids[label] = set()
+        duplicates = 0
+        for record in table:
+            duplicates += record[id_column] in ids
+            ids.add(record[id_column])
+        if duplicates:
+            failures.append(f"{label}: {duplicates} duplicate node ids")
+
+    relationship_counts = {}
+    for shape in RELATIONSHIP_HEADERS:
+        table = read_import_table(import_dir, shape)
+        next(table)
+        end_ids = node_ids[RELATIONSHIP_SHAPES[shape]]
+        total = dangling = 0
+        for start_id, end_id, _ in table:
+            total += 1
+            dangling += start_id not in node_ids['Attack'] or end_id not in end_ids
+        relationship_counts[shape] = total
+        if dangling:
+            failures.append(f"{shape}: {dangling} of {total} relationships have a missing endpoint")
+
+    if failures:
+        raise ValueError(f"Bulk import files in {import_dir} are inconsistent: {failures}")
+
+    return {**{label: len(ids) for label, ids in node_ids.items()}, **relationship_counts}
+
+
+def bulk_import_command(import_dir: Path, database: str = 'neo4j') -> str:
+    import_dir = Path(import_dir)
+    nodes = ' '.join(
+        f"--nodes={','.join(str(path) for path in import_files(import_dir, label))}" for label in NODE_HEADERS
+    )
+    relationships = ' '.join(
+        f"--relationships={','.join(str(path) for path in import_files(import_dir, shape))}"
+        for shape in RELATIONSHIP_HEADERS
+    )
+    return f"neo4j-admin database import full {nodes} {relationships} --multiline-fields=true {database}"
@@ -1,14 +1,29 @@
-from typing import List, Tuple, Callable, Any, Optional, Union, Dict, Generator
+from typing import List, Tuple, Callable, Any, Optional, Union, Dict, Generator, Iterator, Set
 import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from functools import reduce
 import uuid
 
-from app.repositories.local_files_repository import load_primary_csv, load_secondary_csv
+from app.config.pipeline_config.pipeline import (
+    EVENT_ID_MODE, MERGE_MODE, MERGE_WORKERS, MERGE_PARTITION_FREQ, MERGE_PARTITIONS_PER_WORKER
+)
+from app.repositories.local_files_repository import (
+    load_primary_csv, load_secondary_csv, iter_primary_csv_chunks, primary_df_columns
+)
+from app.repositories.source_schema import primary_df_dtypes
+from app.services.graph_schema_service import schema_statements, check_indexed_lookups
 from app.services.rename_columns_service import rename_secondary_df_columns, rename_event_record_columns
+from app.utils.categorical_util import (
+    align_categorical_columns, concat_preserving_categoricals, is_categorical, map_categories, category_apply
+)
+from app.utils.content_hash_util import content_hash_ids
+from app.utils.cypher_properties_util import render_properties
+from app.utils.parallel_util import create_process_pool
+from app.utils.stage_metrics_util import pipeline_metrics, metered
 
 ESSENTIAL_COLUMNS: List[str] = [
-    'date',
+    'date', 'eventid',
     'country_txt', 'city', 'region_txt', 'provstate',
     'latitude', 'longitude',
     'nkill', 'nkillter', 'nwound', 'nwoundte', 'total_casualties', 'nperps', 'nperpcap',
@@ -19,17 +34,38 @@ ESSENTIAL_COLUMNS: List[str] = [
     'summary', 'Description', 'data_source'
 ]
 
+MERGE_KEYS: List[str] = ['date', 'country_txt', 'city']
 
-def convert_dates_primary_df(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
+PRIMARY_DATE_COLUMNS: List[str] = ['iyear', 'imonth', 'iday']
 
-    df.insert(0, 'date', pd.NaT)
+MISSING_DATE_PARTITION: int = np.iinfo(np.int64).max
+
+EVENT_ID_COLUMNS: List[str] = ['gtd_event_id', 'event_date', 'country', 'city']
+
+NEO4J_EVENT_PROPERTIES: List[str] = ['event_id', 'event_date', 'description', 'num_killed', 'num_wounded', 'data_source']
 
+NEO4J_EVENT_LINKS: List[Tuple[str, str, str]] = [
+    ('country', 'Country', 'OCCURRED_IN'),
+    ('terror_group_name', 'TerrorGroup', 'PERPETRATED_BY'),
+    ('city', 'City', 'OCCURRED_IN_CITY')
+]
+
+
+def primary_dated_rows(df: pd.DataFrame) -> pd.Series:
     valid_dates = df['iyear'].notna()
     valid_dates &= df['imonth'].notna()
     valid_dates &= df['iday'].notna()
     valid_dates &= df['imonth'] != 0
     valid_dates &= df['iday'] != 0
+    return valid_dates
+
+
+def convert_dates_primary_df(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+
+    df.insert(0, 'date', pd.NaT)
+
+    valid_dates = primary_dated_rows(df)
 
     df.loc[valid_dates, 'date'] = pd.to_datetime(dict(
         year=df.loc[valid_dates, 'iyear'],
@@ -42,8 +78,8 @@ def convert_dates_primary_df(df: pd.DataFrame) -> pd.DataFrame:
 
 def convert_dates_secondary_df(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
-    df.insert(0, 'date', pd.to_datetime(df['Date'], format='%d-%b-%y'))
-    df['date'] = df['date'].apply(lambda x: x.replace(year=x.year - 100) if x.year > 2020 else x)
+    dates = pd.to_datetime(df['Date'], format='%d-%b-%y')
+    df.insert(0, 'date', dates.mask(dates.dt.year > 2020, dates - pd.DateOffset(years=100)))
     return df
 
 
@@ -61,7 +97,7 @@ def prepare_secondary_dataframe(df: pd.DataFrame) -> pd.DataFrame:
 
 
 def perform_initial_merge(primary_df: pd.DataFrame, secondary_df: pd.DataFrame) -> pd.DataFrame:
-    MERGE_KEYS: List[str] = ['date', 'country_txt', 'city']
+    primary_df, secondary_df = align_categorical_columns(primary_df, secondary_df, MERGE_KEYS)
 
     merged = pd.merge(
         primary_df,
@@ -81,15 +117,13 @@ def perform_initial_merge(primary_df: pd.DataFrame, secondary_df: pd.DataFrame)
     return merged
 
 
-def process_matched_records(df: pd.DataFrame) -> pd.DataFrame:
+def split_matched_records(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
     matched_mask = df['_merge'] == 'both'
 
-    if not matched_mask.any():
-        return df
-
     matched_rows = df[matched_mask].groupby(
-        ['date', 'country_txt', 'city'],
-        as_index=False
+        MERGE_KEYS,
+        as_index=False,
+        observed=True
     ).first()
 
     for col in ['nkill', 'nwound', 'total_casualties', 'Description']:
@@ -104,8 +138,11 @@ def process_matched_records(df: pd.DataFrame) -> pd.DataFrame:
     ]
     matched_rows = matched_rows.drop(columns=duplicate_cols, errors='ignore')
 
-    unmatched_rows = df[~matched_mask]
-    return pd.concat([matched_rows, unmatched_rows], ignore_index=True)
+    return matched_rows, df[~matched_mask]
+
+
+def process_matched_records(df: pd.DataFrame) -> pd.DataFrame:
+    return concat_preserving_categoricals(list(split_matched_records(df)), ignore_index=True)
 
 
 def cleanup_final_dataframe(df: pd.DataFrame, essential_columns: Optional[List[str]] = None) -> pd.DataFrame:
@@ -121,13 +158,13 @@ def merge_and_enrich_dataframes(primary_df: pd.DataFrame, secondary_df: pd.DataF
     Union[Tuple[pd.DataFrame, pd.DataFrame], pd.DataFrame]]
 
     pipeline: List[PipelineStep] = [
-        lambda dfs: (
+        pipeline_metrics.step('prepare_dataframes', lambda dfs: (
             prepare_primary_dataframe(dfs[0]),
             prepare_secondary_dataframe(dfs[1])
-        ),
-        lambda dfs: perform_initial_merge(*dfs),
-        process_matched_records,
-        cleanup_final_dataframe
+        )),
+        pipeline_metrics.step('perform_initial_merge', lambda dfs: perform_initial_merge(*dfs)),
+        pipeline_metrics.step('process_matched_records', process_matched_records),
+        pipeline_metrics.step('cleanup_final_dataframe', cleanup_final_dataframe)
     ]
 
     result = reduce(
@@ -139,6 +176,62 @@ def merge_and_enrich_dataframes(primary_df: pd.DataFrame, secondary_df: pd.DataF
     return result
 
 
+def merge_partition(primary_df: pd.DataFrame, secondary_df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    return split_matched_records(perform_initial_merge(
+        prepare_primary_dataframe(primary_df),
+        prepare_secondary_dataframe(secondary_df)
+    ))
+
+
+def partition_keys(dates: pd.Series, partition_freq: str) -> pd.Series:
+    keys = dates.dt.year * 100 + (dates.dt.month if partition_freq == 'month' else 0)
+    return keys.fillna(MISSING_DATE_PARTITION).astype(np.int64)
+
+
+def plan_partition_buckets(primary_keys: pd.Series, secondary_keys: pd.Series, buckets: int) -> pd.Series:
+    sizes = pd.concat([primary_keys, secondary_keys]).value_counts().sort_index()
+    cumulative = sizes.cumsum() - sizes
+    return (cumulative * buckets // sizes.sum()).astype(np.int64)
+
+
+def merge_and_enrich_dataframes_partitioned(
+        primary_df: pd.DataFrame,
+        secondary_df: pd.DataFrame,
+        workers: int = MERGE_WORKERS,
+        partition_freq: str = MERGE_PARTITION_FREQ,
+        partitions_per_worker: int = MERGE_PARTITIONS_PER_WORKER
+) -> pd.DataFrame:
+    primary_keys = partition_keys(primary_df['date'], partition_freq)
+    secondary_keys = partition_keys(secondary_df['date'], partition_freq)
+    bucket_of = plan_partition_buckets(primary_keys, secondary_keys, max(1, workers * partitions_per_worker))
+
+    primary_groups = dict(list(primary_df.groupby(primary_keys.map(bucket_of), sort=False)))
+    secondary_groups = dict(list(secondary_df.groupby(secondary_keys.map(bucket_of), sort=False)))
+
+    partitions = sorted(primary_groups.keys() | secondary_groups.keys())
+    primary_parts = [primary_groups.get(key, primary_df.iloc[0:0]) for key in partitions]
+    secondary_parts = [secondary_groups.get(key, secondary_df.iloc[0:0]) for key in partitions]
+
+    if workers <= 1:
+        results = list(map(merge_partition, primary_parts, secondary_parts))
+    else:
+        with create_process_pool(min(workers, len(partitions))) as executor:
+            results = list(executor.map(merge_partition, primary_parts, secondary_parts))
+
+    matched_parts = [matched for matched, _ in results]
+    unmatched_parts = [unmatched for _, unmatched in results]
+    merged = concat_preserving_categoricals(matched_parts + unmatched_parts, ignore_index=True)
+
+    return cleanup_final_dataframe(merged)
+
+
+def clean_strings(series: pd.Series) -> pd.Series:
+    if series.dtype != object:
+        return series
+    cleaned = series.str.strip().str.title()
+    return cleaned.where(cleaned.notna(), series)
+
+
 def normalize_data(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
 
@@ -155,11 +248,13 @@ def normalize_data(df: pd.DataFrame) -> pd.DataFrame:
         'num_perpetrators', 'num_perpetrators_captured'
     ]
     for col in numeric_columns:
-        df[col] = df[col].apply(lambda x: np.nan if x is None or x < 0 else x)
+        negative = df[col] < 0
+        if negative.any():
+            df[col] = df[col].mask(negative)
 
     string_columns = ['country', 'city', 'region', 'province_or_state']
     for col in string_columns:
-        df[col] = df[col].apply(lambda x: x.strip().title() if isinstance(x, str) else x)
+        df[col] = map_categories(df[col], clean_strings) if is_categorical(df[col]) else clean_strings(df[col])
 
     target_columns = ['target_type_1', 'target_type_2', 'target_type_3']
     for col in target_columns:
@@ -171,138 +266,177 @@ def normalize_data(df: pd.DataFrame) -> pd.DataFrame:
 def create_data_processing_pipeline() -> pd.DataFrame:
     PipelineStep = Callable[[Any], Any]
 
-    def load_dataframes(_: Any) -> Tuple[pd.DataFrame, pd.DataFrame]:
-        return load_primary_csv(), load_secondary_csv()
+    def load_and_convert_dataframes(_: Any) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            primary_future = executor.submit(lambda: convert_dates_primary_df(load_primary_csv()))
+            secondary_future = executor.submit(lambda: convert_dates_secondary_df(load_secondary_csv()))
+            return primary_future.result(), secondary_future.result()
 
-    def convert_dates(dfs: Tuple[pd.DataFrame, pd.DataFrame]) -> Tuple[pd.DataFrame, pd.DataFrame]:
-        primary_df, secondary_df = dfs
-        return (
-            convert_dates_primary_df(primary_df),
-            convert_dates_secondary_df(secondary_df)
-        )
+    merge_step = merge_and_enrich_dataframes_partitioned if MERGE_MODE == 'partitioned' else merge_and_enrich_dataframes
 
     pipeline: List[PipelineStep] = [
-        load_dataframes,
-        convert_dates,
-        lambda dfs: merge_and_enrich_dataframes(*dfs),
+        pipeline_metrics.step('load_and_convert_dataframes', load_and_convert_dataframes),
+        pipeline_metrics.step(merge_step.__name__, lambda dfs: merge_step(*dfs)),
+        pipeline_metrics.step('rename_event_record_columns', rename_event_record_columns),
+        pipeline_metrics.step('normalize_data', normalize_data)
     ]
 
-    result = reduce(
+    return reduce(
         lambda data, step: step(data),
         pipeline,
         None
     )
-    result = rename_event_record_columns(result)
 
-    return normalize_data(result)
 
+def primary_day_keys(df: pd.DataFrame) -> np.ndarray:
+    days = df[PRIMARY_DATE_COLUMNS].astype(np.int64).to_numpy()
+    return days[:, 0] * 10_000 + days[:, 1] * 100 + days[:, 2]
+
+
+def iter_day_aligned_chunks(chunks: Iterator[pd.DataFrame]) -> Generator[pd.DataFrame, None, None]:
+    carry: Optional[pd.DataFrame] = None
+    emitted_days: Set[int] = set()
+
+    def emit(dated: pd.DataFrame, undated: pd.DataFrame) -> pd.DataFrame:
+        days = set(primary_day_keys(dated).tolist())
+        if days & emitted_days:
+            raise ValueError(
+                f"Streaming mode requires the primary CSV grouped by {', '.join(PRIMARY_DATE_COLUMNS)}, "
+                f"but {len(days & emitted_days)} days reappear after their chunk was merged; "
+                f"sort the file by date or use PIPELINE_MODE=batch"
+            )
+        emitted_days.update(days)
+        parts = [part for part in (dated, undated) if not part.empty]
+        return concat_preserving_categoricals(parts, ignore_index=True) if len(parts) > 1 else parts[0]
+
+    for chunk in chunks:
+        dated = primary_dated_rows(chunk)
+        undated = chunk[~dated]
+        chunk = chunk[dated]
+        if carry is not None and not carry.empty:
+            chunk = concat_preserving_categoricals([carry, chunk], ignore_index=True)
+
+        days = primary_day_keys(chunk)
+        same_day = days == days[-1:]
+
+        if not same_day.all() or not undated.empty:
+            yield emit(chunk[~same_day], undated)
+        carry = chunk[same_day]
+
+    if carry is not None and not carry.empty:
+        yield emit(carry, carry.iloc[0:0])
+
+
+def stream_data_processing_pipeline(chunk_size: int) -> Generator[pd.DataFrame, None, None]:
+    secondary_df = prepare_secondary_dataframe(convert_dates_secondary_df(load_secondary_csv()))
+    secondary_keys = pd.MultiIndex.from_frame(secondary_df[MERGE_KEYS])
+    secondary_matched = np.zeros(len(secondary_df), dtype=bool)
+
+    def finalize(primary_df: pd.DataFrame, secondary_subset: pd.DataFrame) -> pd.DataFrame:
+        merged = cleanup_final_dataframe(
+            process_matched_records(perform_initial_merge(primary_df, secondary_subset))
+        )
+        return normalize_data(rename_event_record_columns(merged))
 
-def add_event_id(df):
-    df['event_id'] = df.apply(
-        lambda row: uuid.uuid4().hex, axis=1
+    empty_primary_df = prepare_primary_dataframe(
+        convert_dates_primary_df(pd.DataFrame(columns=primary_df_columns).astype(primary_df_dtypes))
     )
+
+    for chunk in iter_day_aligned_chunks(iter_primary_csv_chunks(chunk_size=chunk_size)):
+        primary_df = prepare_primary_dataframe(convert_dates_primary_df(chunk))
+        empty_primary_df = primary_df.iloc[0:0]
+
+        in_chunk = secondary_keys.isin(pd.MultiIndex.from_frame(primary_df[MERGE_KEYS]))
+        secondary_matched |= in_chunk
+
+        yield pipeline_metrics.run('merge_chunk', finalize, primary_df, secondary_df[in_chunk])
+
+    yield pipeline_metrics.run('merge_chunk', finalize, empty_primary_df, secondary_df[~secondary_matched])
+
+
+@metered('add_event_id')
+def add_event_id(df: pd.DataFrame, mode: str = EVENT_ID_MODE) -> pd.DataFrame:
+    if mode == 'content_hash':
+        df['event_id'] = content_hash_ids(df, EVENT_ID_COLUMNS)
+    else:
+        df['event_id'] = [uuid.uuid4().hex for _ in range(len(df))]
     return df
 
 
+def neo4j_linked_values(df: pd.DataFrame, column: str) -> pd.DataFrame:
+    values = df[column]
+    present = values.notna() & (category_apply(values, lambda v: v.astype(str) != '', False).astype(bool))
+    return df.loc[present, ['event_id', column]].set_axis(['from', 'to'], axis=1)
+
+
+@metered('prepare_data_for_neo4j')
 def prepare_data_for_neo4j(df):
     neo4j_data = {
-        "nodes": [],
+        "nodes": {"Event": df[NEO4J_EVENT_PROPERTIES].drop_duplicates(ignore_index=True)},
         "relationships": []
     }
 
-    for _, row in df.iterrows():
-        event_node = {
-            "label": "Event",
-            "properties": {
-                "event_id": row["event_id"],
-                "event_date": row.get("event_date"),
-                "description": row.get("description"),
-                "num_killed": row.get("num_killed", 0),
-                "num_wounded": row.get("num_wounded", 0),
-                "data_source": row.get("data_source")
-            }
-        }
-        neo4j_data["nodes"].append(event_node)
-
-        if row.get("country"):
-            country_node = {
-                "label": "Country",
-                "properties": {"name": row["country"]}
-            }
-            neo4j_data["nodes"].append(country_node)
-
-            relationship = {
-                "from": event_node["properties"]["event_id"],
-                "to": country_node["properties"]["name"],
-                "type": "OCCURRED_IN",
-                "properties": {}
-            }
-            neo4j_data["relationships"].append(relationship)
-
-        if row.get("terror_group_name"):
-            terror_group_node = {
-                "label": "TerrorGroup",
-                "properties": {"name": row["terror_group_name"]}
-            }
-            neo4j_data["nodes"].append(terror_group_node)
-
-            relationship = {
-                "from": event_node["properties"]["event_id"],
-                "to": terror_group_node["properties"]["name"],
-                "type": "PERPETRATED_BY",
-                "properties": {}
-            }
-            neo4j_data["relationships"].append(relationship)
-
-        if row.get("city"):
-            city_node = {
-                "label": "City",
-                "properties": {"name": row["city"]}
-            }
-            neo4j_data["nodes"].append(city_node)
-
-            relationship = {
-                "from": event_node["properties"]["event_id"],
-                "to": city_node["properties"]["name"],
-                "type": "OCCURRED_IN_CITY",
-                "properties": {}
-            }
-            neo4j_data["relationships"].append(relationship)
-
-    neo4j_data["nodes"] = list({frozenset(node["properties"].items()): node for node in neo4j_data["nodes"]}.values())
+    for column, label, rel_type in NEO4J_EVENT_LINKS:
+        edges = neo4j_linked_values(df, column)
+        neo4j_data["nodes"][label] = edges[['to']].drop_duplicates(ignore_index=True).set_axis(['name'], axis=1)
+        neo4j_data["relationships"].append({
+            "from_label": "Event",
+            "to_label": label,
+            "type": rel_type,
+            "edges": edges.reset_index(drop=True)
+        })
 
     return neo4j_data
 
 
+def cypher_script_value(value: Any) -> str:
+    if isinstance(value, str):
+        return f'"{value.replace(chr(34), chr(39)).replace(chr(10), " ")}"'
+    return str(value)
+
+
+def cypher_script_values(series: pd.Series) -> pd.Series:
+    if pd.api.types.is_datetime64_any_dtype(series):
+        series = series.astype('category')
+    elif pd.api.types.is_float_dtype(series):
+        series = series.astype('float64')
+    return category_apply(
+        series,
+        lambda values: pd.Series([cypher_script_value(v) for v in values.tolist()], index=values.index, dtype=object)
+    )
+
+
+def cypher_script_properties(nodes: pd.DataFrame) -> pd.DataFrame:
+    properties = nodes.drop(columns='description', errors='ignore')
+    return properties.apply(
+        lambda values: values.where(~category_apply(values, lambda v: v.astype(str).str.lower() == 'nan', False).astype(bool))
+        if values.dtype == object or is_categorical(values) else values
+    )
+
+
+@metered('generate_neo4j_cypher_script')
 def generate_neo4j_cypher_script(neo4j_data):
     script = []
+    checked = []
 
-    for node in neo4j_data['nodes']:
-        label = node['label']
-        properties = ", ".join([
-            f"{key}: {f'\"{value.replace(chr(34), chr(39)).replace(chr(10), " ")}\"' if isinstance(value, str) else value}"
-            for key, value in node['properties'].items()
-            if value is not None and str(value).lower() != 'nan' and key != "description"
-        ])
-        script.append(f"MERGE (:{label} {{{properties}}})")
+    for label, nodes in neo4j_data['nodes'].items():
+        properties = cypher_script_properties(nodes)
+        statements = f"MERGE (:{label} {{" + render_properties(properties, cypher_script_values) + "})"
+        script.append(statements)
+        checked.extend(statements[~properties.notna().duplicated()])
 
     for relationship in neo4j_data['relationships']:
-        if 'from' not in relationship or 'to' not in relationship:
+        edges = relationship['edges']
+        if 'from' not in edges.columns or 'to' not in edges.columns:
             raise ValueError("Missing 'from' or 'to' field in relationship")
 
-        from_id = relationship['from']
-        to_id = relationship['to']
-        rel_type = relationship['type']
-        properties = ", ".join([
-            f"{key}: {f'\"{value}\"' if isinstance(value, str) else value}"
-            for key, value in relationship.get('properties', {}).items()
-            if value is not None
-        ])
-        properties_str = f" {{{properties}}}" if properties else ""
-
-        script.append(
-            f"MATCH (a {{event_id: \"{from_id}\"}}), (b {{name: \"{to_id}\"}})"
-            f" MERGE (a)-[:{rel_type}{properties_str}]->(b)"
+        statements = (
+            f"MATCH (a:{relationship['from_label']} {{event_id: \"" + edges['from'].astype(str) + "\"}), "
+            f"(b:{relationship['to_label']} {{name: \"" + edges['to'].astype(str) + f"\"}}) MERGE (a)-[:{relationship['type']}]->(b)"
         )
+        script.append(statements)
+        checked.extend(statements.iloc[:1])
 
-    return "\n".join(script)
+    check_indexed_lookups(checked)
+    statements = np.concatenate([statements.to_numpy(dtype=object) for statements in script]).tolist()
+    return "\n".join(schema_statements(neo4j_data['nodes']) + statements)
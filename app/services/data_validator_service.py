@@ -1,24 +1,40 @@
 import json
-from typing import List
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Tuple, Generator
 from datetime import datetime
+import numpy as np
 import pandas as pd
+from pydantic import TypeAdapter, ValidationError
 
+from app.config.local_files_config.local_files import DEAD_LETTER_FILE
+from app.config.pipeline_config.pipeline import VALIDATION_BATCH_SIZE
 from app.models.terror_event import TerrorEvent
+from app.utils.stage_metrics_util import metered
 
+attack_type_cols: List[str] = ["attack_type_1", "attack_type_2", "attack_type_3"]
+target_cols: List[str] = [
+    "target_type_1", "target_subtype_1",
+    "target_type_2", "target_subtype_2",
+    "target_type_3", "target_subtype_3"
+]
+terror_group_cols: List[str] = [
+    "terror_group_name", "terror_group_subname",
+    "secondary_terror_group_name", "secondary_terror_group_subname",
+    "tertiary_terror_group_name", "tertiary_terror_group_subname"
+]
+
+list_field_columns: Dict[str, List[str]] = {
+    "attack_types": attack_type_cols,
+    "target_details": target_cols,
+    "terror_groups": terror_group_cols
+}
+
+terror_events_adapter: TypeAdapter[List[TerrorEvent]] = TypeAdapter(List[TerrorEvent])
 
-def dataframe_to_pydantic_models(df: pd.DataFrame) -> List[TerrorEvent]:
-    attack_type_cols = ["attack_type_1", "attack_type_2", "attack_type_3"]
-    target_cols = [
-        "target_type_1", "target_subtype_1",
-        "target_type_2", "target_subtype_2",
-        "target_type_3", "target_subtype_3"
-    ]
-    terror_group_cols = [
-        "terror_group_name", "terror_group_subname",
-        "secondary_terror_group_name", "secondary_terror_group_subname",
-        "tertiary_terror_group_name", "tertiary_terror_group_subname"
-    ]
 
+@metered('dataframe_to_pydantic_models')
+def dataframe_to_pydantic_models(df: pd.DataFrame) -> List[TerrorEvent]:
     return [
         TerrorEvent(
             **{
@@ -43,6 +59,120 @@ def dataframe_to_pydantic_models(df: pd.DataFrame) -> List[TerrorEvent]:
     ]
 
 
+def collect_list_column(df: pd.DataFrame, columns: List[str]) -> List[List[Any]]:
+    present = [col for col in columns if col in df.columns]
+    values = df[present].to_numpy(dtype=object)
+    mask = pd.notna(values)
+
+    flat = values[mask].tolist()
+    ends = np.cumsum(mask.sum(axis=1)).tolist()
+    starts = [0] + ends[:-1]
+    return [flat[start:end] for start, end in zip(starts, ends)]
+
+
+def dataframe_to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    df = df.reset_index(drop=True)
+    scalar_fields = [
+        key for key in TerrorEvent.model_fields
+        if key in df.columns and key not in list_field_columns
+    ]
+
+    records = df[scalar_fields].astype(object)
+    records = records.where(records.notna(), None)
+    for field, columns in list_field_columns.items():
+        records[field] = collect_list_column(df, columns)
+
+    return records.to_dict('records')
+
+
+def validate_records(records: List[Dict[str, Any]]) -> Tuple[List[TerrorEvent], Dict[int, List[str]]]:
+    try:
+        return terror_events_adapter.validate_python(records), {}
+    except ValidationError as e:
+        rejected: Dict[int, List[str]] = {}
+        for error in e.errors(include_url=False):
+            index, *field = error['loc']
+            rejected.setdefault(index, []).append(f"{'.'.join(map(str, field))}: {error['msg']}")
+
+        accepted = [record for i, record in enumerate(records) if i not in rejected]
+        return terror_events_adapter.validate_python(accepted), rejected
+
+
+def write_dead_letters(rejected: List[Dict[str, Any]], dead_letter_path: Path) -> None:
+    dead_letter_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(dead_letter_path, 'a', encoding='utf-8') as f:
+        for entry in rejected:
+            f.write(json.dumps(entry, default=str) + '\n')
+
+
+def collect_validation_results(
+        df: pd.DataFrame,
+        batch_size: int = VALIDATION_BATCH_SIZE,
+        row_offset: int = 0
+) -> Tuple[List[TerrorEvent], List[Dict[str, Any]]]:
+    events: List[TerrorEvent] = []
+    dead_letters: List[Dict[str, Any]] = []
+
+    for offset in range(0, len(df), batch_size):
+        records = dataframe_to_records(df.iloc[offset:offset + batch_size])
+        valid, rejected = validate_records(records)
+        events.extend(valid)
+        dead_letters.extend(
+            {'row': row_offset + offset + index, 'errors': reasons, 'record': records[index]}
+            for index, reasons in rejected.items()
+        )
+
+    return events, dead_letters
+
+
+@metered('validate_batches', lambda result: len(result[0]))
+def validate_batches(
+        df: pd.DataFrame,
+        batch_size: int = VALIDATION_BATCH_SIZE,
+        dead_letter_path: Path = DEAD_LETTER_FILE,
+        row_offset: int = 0
+) -> Tuple[List[TerrorEvent], int]:
+    events, dead_letters = collect_validation_results(df, batch_size, row_offset)
+    if dead_letters:
+        write_dead_letters(dead_letters, dead_letter_path)
+    return events, len(dead_letters)
+
+
+def report_validation(rows: int, elapsed: float, rejected_count: int, dead_letter_path: Path) -> None:
+    print(f"Validated {rows} rows in {elapsed:.2f}s ({rows / max(elapsed, 1e-9):.0f} rows/s), "
+          f"rejected {rejected_count}" + (f" to {dead_letter_path}" if rejected_count else ""))
+
+
+def iter_validated_batches(
+        df: pd.DataFrame,
+        batch_size: int = VALIDATION_BATCH_SIZE,
+        dead_letter_path: Path = DEAD_LETTER_FILE
+) -> Generator[Tuple[pd.DataFrame, List[TerrorEvent]], None, None]:
+    start = time.perf_counter()
+    rejected_total = 0
+
+    for offset in range(0, len(df), batch_size):
+        batch = df.iloc[offset:offset + batch_size]
+        events, rejected_count = validate_batches(batch, batch_size, dead_letter_path, offset)
+        rejected_total += rejected_count
+        yield batch, events
+
+    report_validation(len(df), time.perf_counter() - start, rejected_total, dead_letter_path)
+
+
+@metered('validate_dataframe_in_batches')
+def validate_dataframe_in_batches(
+        df: pd.DataFrame,
+        batch_size: int = VALIDATION_BATCH_SIZE,
+        dead_letter_path: Path = DEAD_LETTER_FILE
+) -> List[TerrorEvent]:
+    start = time.perf_counter()
+    events, rejected_count = validate_batches(df, batch_size, dead_letter_path)
+    report_validation(len(df), time.perf_counter() - start, rejected_count, dead_letter_path)
+    return events
+
+
+@metered('prepare_models_for_kafka')
 def prepare_models_for_kafka(models: List[TerrorEvent]) -> List[str]:
     def convert_dates(data: dict) -> dict:
         return {
@@ -0,0 +1,136 @@
+import json
+import struct
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Tuple, Union, get_args, get_origin
+
+from app.config.pipeline_config.pipeline import KAFKA_MESSAGE_FORMAT
+from app.models.terror_event import TerrorEvent
+from app.services.data_validator_service import prepare_models_for_kafka
+from app.utils.stage_metrics_util import metered
+
+BINARY_MAGIC = b'TE'
+BINARY_SCHEMA_VERSION = 1
+BINARY_HEADER = struct.Struct('<2sBI')
+UINT32 = struct.Struct('<I')
+UINT16 = struct.Struct('<H')
+INT64 = struct.Struct('<q')
+FLOAT64 = struct.Struct('<d')
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+
+def field_kind(annotation: Any) -> str:
+    if get_origin(annotation) is Union:
+        annotation = next(arg for arg in get_args(annotation) if arg is not type(None))
+    if get_origin(annotation) is list:
+        return 'list'
+    return {datetime: 'datetime', float: 'float', int: 'int'}.get(annotation, 'str')
+
+
+EVENT_FIELDS: List[Tuple[str, str]] = [
+    (name, field_kind(field.annotation)) for name, field in TerrorEvent.model_fields.items()
+]
+DATE_FIELDS = frozenset(name for name, kind in EVENT_FIELDS if kind == 'datetime')
+
+
+def event_to_dict(model: TerrorEvent) -> Dict[str, Any]:
+    values = model.__dict__
+    fields_set = model.model_fields_set
+    return {
+        name: values[name].isoformat() if name in DATE_FIELDS else values[name]
+        for name, _ in EVENT_FIELDS
+        if name in fields_set and values[name] is not None
+    }
+
+
+def encode_events_json(models: List[TerrorEvent]) -> List[bytes]:
+    return [json.dumps(event_to_dict(model)).encode('utf-8') for model in models]
+
+
+def encode_string(value: str) -> bytes:
+    encoded = value.encode('utf-8')
+    return UINT32.pack(len(encoded)) + encoded
+
+
+def encode_value(kind: str, value: Any) -> bytes:
+    if kind == 'str':
+        return encode_string(value)
+    if kind == 'float':
+        return FLOAT64.pack(value)
+    if kind == 'int':
+        return INT64.pack(value)
+    if kind == 'datetime':
+        return INT64.pack((value - EPOCH) // MICROSECOND)
+    return UINT16.pack(len(value)) + b''.join(map(encode_string, value))
+
+
+def encode_event_binary(model: TerrorEvent) -> bytes:
+    values = model.__dict__
+    fields_set = model.model_fields_set
+    presence = 0
+    parts = []
+
+    for bit, (name, kind) in enumerate(EVENT_FIELDS):
+        value = values[name]
+        if name in fields_set and value is not None:
+            presence |= 1 << bit
+            parts.append(encode_value(kind, value))
+
+    return BINARY_HEADER.pack(BINARY_MAGIC, BINARY_SCHEMA_VERSION, presence) + b''.join(parts)
+
+
+def encode_events_binary(models: List[TerrorEvent]) -> List[bytes]:
+    return [encode_event_binary(model) for model in models]
+
+
+def decode_string(payload: bytes, offset: int) -> Tuple[str, int]:
+    (length,) = UINT32.unpack_from(payload, offset)
+    start = offset + UINT32.size
+    return payload[start:start + length].decode('utf-8'), start + length
+
+
+def decode_value(kind: str, payload: bytes, offset: int) -> Tuple[Any, int]:
+    if kind == 'str':
+        return decode_string(payload, offset)
+    if kind == 'float':
+        return FLOAT64.unpack_from(payload, offset)[0], offset + FLOAT64.size
+    if kind == 'int':
+        return INT64.unpack_from(payload, offset)[0], offset + INT64.size
+    if kind == 'datetime':
+        return EPOCH + INT64.unpack_from(payload, offset)[0] * MICROSECOND, offset + INT64.size
+
+    (count,) = UINT16.unpack_from(payload, offset)
+    offset += UINT16.size
+    items = []
+    for _ in range(count):
+        item, offset = decode_string(payload, offset)
+        items.append(item)
+    return items, offset
+
+
+def decode_event_binary(payload: bytes) -> Dict[str, Any]:
+    magic, version, presence = BINARY_HEADER.unpack_from(payload)
+    if magic != BINARY_MAGIC or version != BINARY_SCHEMA_VERSION:
+        raise ValueError(f"Unsupported event payload: magic {magic!r}, schema version {version}")
+
+    event = {}
+    offset = BINARY_HEADER.size
+    for bit, (name, kind) in enumerate(EVENT_FIELDS):
+        if presence >> bit & 1:
+            event[name], offset = decode_value(kind, payload, offset)
+    return event
+
+
+MESSAGE_ENCODERS = {
+    'legacy': prepare_models_for_kafka,
+    'json': encode_events_json,
+    'binary': encode_events_binary
+}
+
+
+@metered('encode_events_for_kafka')
+def encode_events_for_kafka(
+        models: List[TerrorEvent],
+        message_format: str = KAFKA_MESSAGE_FORMAT
+) -> List[Union[str, bytes]]:
+    return MESSAGE_ENCODERS[message_format](models)
@@ -0,0 +1,78 @@
+import struct
+import zlib
+from itertools import repeat
+from typing import List, Dict, Optional, Tuple, Union
+
+from app.config.pipeline_config.pipeline import (
+    GRAPH_ENVELOPE_MAX_STATEMENTS, GRAPH_ENVELOPE_MAX_BYTES, GRAPH_ENVELOPE_COMPRESSION
+)
+
+ENVELOPE_MAGIC = b'NQ'
+ENVELOPE_VERSION = 1
+ENVELOPE_HEADER = struct.Struct('<2sBBI')
+ENVELOPE_CODECS = {'none': 0, 'zlib': 1}
+
+Envelopes = Tuple[List[bytes], Optional[List[str]], Optional[List[int]]]
+
+
+def encode_envelope(statements: List[Union[str, bytes]], compression: str = GRAPH_ENVELOPE_COMPRESSION) -> bytes:
+    encoded = [statement if isinstance(statement, bytes) else statement.encode('utf-8') for statement in statements]
+    offsets = [0]
+    for statement in encoded:
+        offsets.append(offsets[-1] + len(statement))
+
+    body = b''.join(encoded)
+    codec = ENVELOPE_CODECS[compression]
+    return (
+        ENVELOPE_HEADER.pack(ENVELOPE_MAGIC, ENVELOPE_VERSION, codec, len(encoded))
+        + struct.pack(f'<{len(offsets)}I', *offsets)
+        + (zlib.compress(body) if codec else body)
+    )
+
+
+def decode_envelope(payload: bytes) -> List[str]:
+    magic, version, codec, count = ENVELOPE_HEADER.unpack_from(payload)
+    if magic != ENVELOPE_MAGIC or version != ENVELOPE_VERSION:
+        raise ValueError(f"Unsupported graph envelope: magic {magic!r}, version {version}")
+
+    offsets = struct.unpack_from(f'<{count + 1}I', payload, ENVELOPE_HEADER.size)
+    body = payload[ENVELOPE_HEADER.size + 4 * (count + 1):]
+    body = zlib.decompress(body) if codec else body
+    return [body[start:end].decode('utf-8') for start, end in zip(offsets, offsets[1:])]
+
+
+def pack_envelopes(
+        messages: List[Union[str, bytes]],
+        keys: Optional[List[str]] = None,
+        partitions: Optional[List[int]] = None,
+        max_statements: int = GRAPH_ENVELOPE_MAX_STATEMENTS,
+        max_bytes: int = GRAPH_ENVELOPE_MAX_BYTES
+) -> Envelopes:
+    envelopes, envelope_keys, envelope_partitions = [], [], []
+    open_envelopes: Dict[Optional[int], Tuple[List[Union[str, bytes]], int, Optional[str]]] = {}
+
+    def seal(partition: Optional[int]) -> None:
+        statements, _, key = open_envelopes.pop(partition)
+        envelopes.append(encode_envelope(statements))
+        envelope_keys.append(key)
+        envelope_partitions.append(partition)
+
+    for message, key, partition in zip(messages, keys or repeat(None), partitions or repeat(None)):
+        size = len(message if isinstance(message, bytes) else message.encode('utf-8'))
+        if partition in open_envelopes:
+            statements, total, _ = open_envelopes[partition]
+            if len(statements) >= max_statements or total + size > max_bytes:
+                seal(partition)
+
+        statements, total, first_key = open_envelopes.get(partition, ([], 0, key))
+        statements.append(message)
+        open_envelopes[partition] = (statements, total + size, first_key)
+
+    for partition in list(open_envelopes):
+        seal(partition)
+
+    return (
+        envelopes,
+        envelope_keys if keys else None,
+        envelope_partitions if partitions else None
+    )
@@ -0,0 +1,82 @@
+import re
+from typing import List, Dict, Tuple, Iterable, Optional
+
+from app.services.neo4j__structure_service import ENTITY_SHAPES, RELATIONSHIP_SHAPES, literal_statement, unwind_statement
+
+GRAPH_LOOKUP_SCHEMA: Dict[str, List[Tuple[Tuple[str, ...], bool]]] = {
+    'Attack': [(('id',), True)],
+    'Location': [(('country', 'city'), True)],
+    'TerrorGroup': [(('name',), True)],
+    'AttackType': [(('type',), True)],
+    'Target': [(('type',), True)],
+    'Event': [(('event_id',), True)],
+    'Country': [(('name',), True)],
+    'City': [(('name',), True)]
+}
+
+SAMPLE_ROWS = {
+    'Attack': {'id': 'id', 'date': 'date', 'data_source': 'source'},
+    'Location': {'country': 'country', 'city': 'city', 'region': 'region'},
+    'TerrorGroup': {'name': 'name'},
+    'AttackType': {'type': 'type'},
+    'Target': {'type': 'type'},
+    'OCCURRED_AT': {'id': 'id', 'country': 'country', 'city': 'city'},
+    'CONDUCTED_BY': {'id': 'id', 'name': 'name'},
+    'TYPE_OF': {'id': 'id', 'type': 'type'},
+    'TARGETED': {'id': 'id', 'type': 'type'}
+}
+
+STRING_LITERAL = re.compile(r"'(?:\\.|[^'\\])*'|\"(?:\\.|[^\"\\])*\"")
+CLAUSE = re.compile(r"\b(MATCH|MERGE|CREATE|SET|UNWIND|WITH|RETURN)\b")
+NODE_PATTERN = re.compile(r"\(\s*\w*\s*(?::\s*(\w+))?\s*\{([^}]*)\}\s*\)")
+PROPERTY_KEY = re.compile(r"(\w+)\s*:")
+
+
+def schema_statements(labels: Optional[Iterable[str]] = None) -> List[str]:
+    statements = []
+    for label in labels or GRAPH_LOOKUP_SCHEMA:
+        for properties, unique in GRAPH_LOOKUP_SCHEMA.get(label, []):
+            name = f"{label.lower()}_{'_'.join(properties)}"
+            targets = ', '.join(f"n.{prop}" for prop in properties)
+            statements.append(
+                f"CREATE CONSTRAINT {name}_unique IF NOT EXISTS FOR (n:{label}) "
+                f"REQUIRE {targets if len(properties) == 1 else f'({targets})'} IS UNIQUE"
+                if unique else
+                f"CREATE INDEX {name}_index IF NOT EXISTS FOR (n:{label}) ON ({targets})"
+            )
+    return statements
+
+
+def is_backed(label: Optional[str], keys: set) -> bool:
+    return bool(label) and any(set(properties) <= keys for properties, _ in GRAPH_LOOKUP_SCHEMA.get(label, []))
+
+
+def unbacked_lookups(statement: str) -> List[str]:
+    stripped = STRING_LITERAL.sub("''", statement)
+    parts = CLAUSE.split(stripped)
+    lookups = []
+    for clause, body in zip(parts[1::2], parts[2::2]):
+        if clause not in ('MATCH', 'MERGE'):
+            continue
+        for label, properties in NODE_PATTERN.findall(body):
+            if not is_backed(label, set(PROPERTY_KEY.findall(properties))):
+                lookups.append(f"({':' + label if label else ''} {{{properties.strip()}}})")
+    return lookups
+
+
+def check_indexed_lookups(statements: Iterable[str]) -> None:
+    failures = [
+        f"{statement[:120]} -> {', '.join(lookups)}"
+        for statement in statements
+        if (lookups := unbacked_lookups(statement))
+    ]
+    if failures:
+        raise ValueError(f"{len(failures)} graph lookups have no backing index or constraint: {failures[:5]}")
+
+
+def sample_graph_statements() -> List[str]:
+    return [
+        statement
+        for shape, row in SAMPLE_ROWS.items()
+        for statement in (literal_statement(shape, row), unwind_statement(shape, tuple(row)))
+    ]
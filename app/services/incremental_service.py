@@ -0,0 +1,117 @@
+from typing import List, Tuple, Set
+import numpy as np
+import pandas as pd
+
+from app.repositories.local_files_repository import load_primary_csv, load_secondary_csv
+from app.repositories.manifest_repository import IngestionManifest
+from app.services.data_processor_service import (
+    MERGE_KEYS, convert_dates_primary_df, convert_dates_secondary_df, merge_and_enrich_dataframes,
+    normalize_data, add_event_id
+)
+from app.services.rename_columns_service import rename_event_record_columns, rename_secondary_df_columns
+
+PRIMARY_SOURCE: str = 'primary'
+SECONDARY_SOURCE: str = 'secondary'
+
+SourceRows = Tuple[str, np.ndarray]
+
+
+def row_fingerprints(df: pd.DataFrame) -> np.ndarray:
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+def merge_key_index(df: pd.DataFrame) -> pd.MultiIndex:
+    return pd.MultiIndex.from_frame(df[MERGE_KEYS])
+
+
+def merge_key_hashes(df: pd.DataFrame) -> pd.Series:
+    return pd.util.hash_pandas_object(df[MERGE_KEYS], index=False)
+
+
+def select_affected_rows(
+        primary_df: pd.DataFrame,
+        secondary_df: pd.DataFrame,
+        new_primary: np.ndarray,
+        new_secondary: np.ndarray
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    primary_keys = merge_key_index(primary_df)
+    secondary_keys = merge_key_index(rename_secondary_df_columns(secondary_df))
+
+    affected = primary_keys[new_primary].append(secondary_keys[new_secondary]).unique()
+    return primary_df[primary_keys.isin(affected)], secondary_df[secondary_keys.isin(affected)]
+
+
+def event_records(df: pd.DataFrame, merge_keys: pd.Series) -> pd.DataFrame:
+    return pd.DataFrame({
+        'fingerprint': row_fingerprints(df.drop(columns=['event_id'])),
+        'merge_key': merge_keys.loc[df.index].to_numpy()
+    }, index=df['event_id'].to_numpy())
+
+
+def select_changed_events(
+        df: pd.DataFrame,
+        events: pd.DataFrame,
+        manifest: IngestionManifest
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    pairs = pd.MultiIndex.from_arrays([events.index, events['fingerprint']])
+    known_pairs = pd.MultiIndex.from_arrays([manifest.events.index, manifest.events['fingerprint']])
+    changed = ~pairs.isin(known_pairs)
+    return df[changed], events[changed]
+
+
+def select_superseded_events(events: pd.DataFrame, manifest: IngestionManifest, affected_keys: np.ndarray) -> List[str]:
+    known = manifest.events
+    superseded = known['merge_key'].isin(affected_keys) & ~known.index.isin(events.index)
+    return known.index[superseded].tolist()
+
+
+def create_incremental_processing_pipeline(
+        manifest: IngestionManifest
+) -> Tuple[pd.DataFrame, pd.DataFrame, List[str], List[SourceRows]]:
+    primary_raw, secondary_raw = load_primary_csv(), load_secondary_csv()
+    primary_fingerprints = row_fingerprints(primary_raw)
+    secondary_fingerprints = row_fingerprints(secondary_raw)
+
+    new_primary = ~np.isin(primary_fingerprints, manifest.known_rows(PRIMARY_SOURCE))
+    new_secondary = ~np.isin(secondary_fingerprints, manifest.known_rows(SECONDARY_SOURCE))
+    print(f'Incremental run: {new_primary.sum()} new primary rows, {new_secondary.sum()} new secondary rows')
+
+    source_rows = [(PRIMARY_SOURCE, primary_fingerprints), (SECONDARY_SOURCE, secondary_fingerprints)]
+
+    primary_df, secondary_df = select_affected_rows(
+        convert_dates_primary_df(primary_raw),
+        convert_dates_secondary_df(secondary_raw),
+        new_primary,
+        new_secondary
+    )
+    affected_keys = np.union1d(
+        merge_key_hashes(primary_df),
+        merge_key_hashes(rename_secondary_df_columns(secondary_df))
+    )
+
+    merged = merge_and_enrich_dataframes(primary_df, secondary_df)
+    merge_keys = merge_key_hashes(merged)
+    merged = add_event_id(normalize_data(rename_event_record_columns(merged)), mode='content_hash')
+
+    events = event_records(merged, merge_keys)
+    changed_df, changed_events = select_changed_events(merged, events, manifest)
+    superseded = select_superseded_events(events, manifest, affected_keys)
+    print(f'Incremental run: {len(changed_df)} new or changed events, {len(superseded)} superseded events')
+
+    return changed_df, changed_events, superseded, source_rows
+
+
+def commit_incremental_run(
+        manifest: IngestionManifest,
+        changed_events: pd.DataFrame,
+        superseded: List[str],
+        source_rows: List[SourceRows],
+        emitted_entities: Set[str]
+) -> None:
+    for source, fingerprints in source_rows:
+        manifest.add_rows(source, fingerprints)
+
+    manifest.remove_events(superseded)
+    manifest.add_events(changed_events)
+    manifest.entities |= emitted_entities
+    manifest.save()
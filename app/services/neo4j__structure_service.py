@@ -1,154 +1,283 @@
-from typing import List, Set
+import json
+from typing import List, Set, Optional, Tuple, Dict, Any, Iterable, Iterator
 
 from app.models.terror_event import TerrorEvent
+from app.utils.stage_metrics_util import metered
+
+GraphRow = Tuple[str, Dict[str, Any], str, Optional[str]]
+
+ENTITY_SHAPES = {
+    'Location': 'l',
+    'TerrorGroup': 'g',
+    'AttackType': 'at',
+    'Target': 't'
+}
+ENTITY_KEYS = {
+    'Location': ('country', 'city'),
+    'TerrorGroup': ('name',),
+    'AttackType': ('type',),
+    'Target': ('type',)
+}
+RELATIONSHIP_SHAPES = {
+    'OCCURRED_AT': 'Location',
+    'CONDUCTED_BY': 'TerrorGroup',
+    'TYPE_OF': 'AttackType',
+    'TARGETED': 'Target'
+}
+
+
+def clean_string(text: str) -> str:
+    if text is None:
+        return ""
+    return text.replace("'", "\\'")
+
+
+def literal_properties(row: Dict[str, Any]) -> str:
+    return ', '.join(f"{k}: '{clean_string(v)}'" for k, v in row.items())
+
+
+def literal_statement(shape: str, row: Dict[str, Any]) -> str:
+    if shape == 'Attack':
+        return f"CREATE (a:Attack {{{', '.join(f'{k}: {repr(v)}' for k, v in row.items())}}})"
+
+    if shape in ENTITY_SHAPES:
+        alias = ENTITY_SHAPES[shape]
+        keys = {k: v for k, v in row.items() if k in ENTITY_KEYS[shape]}
+        extra = {k: v for k, v in row.items() if k not in ENTITY_KEYS[shape]}
+        merge = f"MERGE ({alias}:{shape} {{{literal_properties(keys)}}})"
+        return f"{merge} SET {alias} += {{{literal_properties(extra)}}}" if extra else merge
+
+    label = RELATIONSHIP_SHAPES[shape]
+    alias = ENTITY_SHAPES[label]
+    entity = {k: v for k, v in row.items() if k != 'id'}
+    return (
+        f"MATCH (a:Attack {{id: '{row['id']}'}}), "
+        f"({alias}:{label} {{{literal_properties(entity)}}}) "
+        f"CREATE (a)-[:{shape}]->({alias})"
+    )
+
+
+def unwind_statement(shape: str, fields: Tuple[str, ...]) -> str:
+    if shape == 'Attack':
+        return "UNWIND $rows AS row CREATE (a:Attack) SET a = row"
+
+    if shape in ENTITY_SHAPES:
+        alias = ENTITY_SHAPES[shape]
+        props = ', '.join(f"{field}: row.{field}" for field in fields if field in ENTITY_KEYS[shape])
+        merge = f"UNWIND $rows AS row MERGE ({alias}:{shape} {{{props}}})"
+        return f"{merge} SET {alias} += row" if set(fields) - set(ENTITY_KEYS[shape]) else merge
+
+    label = RELATIONSHIP_SHAPES[shape]
+    alias = ENTITY_SHAPES[label]
+    props = ', '.join(f"{field}: row.{field}" for field in fields if field != 'id')
+    return (
+        f"UNWIND $rows AS row MATCH (a:Attack {{id: row.id}}), "
+        f"({alias}:{label} {{{props}}}) CREATE (a)-[:{shape}]->({alias})"
+    )
+
+
+def literal_retraction(event_id: str) -> str:
+    return f"MATCH (a:Attack {{id: '{clean_string(event_id)}'}}) DETACH DELETE a"
+
+
+def unwind_retraction() -> str:
+    return "UNWIND $rows AS row MATCH (a:Attack {id: row.id}) DETACH DELETE a"
 
 
 class Neo4jProcessor:
-    def __init__(self):
+    def __init__(self, known_entities: Optional[Set[str]] = None):
         self.locations: Set[tuple] = set()
+        self.location_variants: Dict[tuple, tuple] = {}
         self.terror_groups: Set[str] = set()
         self.attack_types: Set[str] = set()
         self.targets: Set[str] = set()
-        self.cypher_queries: List[str] = []
+        self.graph_rows: List[GraphRow] = []
+        self.known_entities: Set[str] = known_entities or set()
+        self.emitted_entities: Set[str] = set()
 
     def _clean_string(self, text: str) -> str:
-        if text is None:
-            return ""
-        return text.replace("'", "\\'")
+        return clean_string(text)
 
     def _is_valid_string(self, value: str) -> bool:
         return value and value.strip() and value.lower() != "unknown"
 
+    def _is_new_entity(self, label: str, key) -> bool:
+        entity_key = f"{label}:{key}"
+        if entity_key in self.known_entities:
+            return False
+        self.emitted_entities.add(entity_key)
+        return True
+
+    def _event_location(self, event: TerrorEvent) -> Optional[tuple]:
+        if not (self._is_valid_string(event.country) and self._is_valid_string(event.city)):
+            return None
+        return self.location_variants.setdefault((event.country, event.city), (
+            event.country,
+            event.city,
+            event.region if self._is_valid_string(event.region) else None,
+            event.province_or_state if self._is_valid_string(event.province_or_state) else None,
+            event.latitude if event.latitude is not None else None,
+            event.longitude if event.longitude is not None else None
+        ))
+
+    def _event_entities(self, event: TerrorEvent) -> Iterator[Tuple[str, Any]]:
+        location = self._event_location(event)
+        if location:
+            yield 'Location', location
+        for group in event.terror_groups or []:
+            if self._is_valid_string(group):
+                yield 'TerrorGroup', group
+        for attack_type in event.attack_types or []:
+            if self._is_valid_string(attack_type):
+                yield 'AttackType', attack_type
+        for target in event.target_details or []:
+            if self._is_valid_string(target):
+                yield 'Target', target
+
+    def _entity_sets(self) -> Dict[str, Set]:
+        return {
+            'Location': self.locations,
+            'TerrorGroup': self.terror_groups,
+            'AttackType': self.attack_types,
+            'Target': self.targets
+        }
+
     def _extract_unique_entities(self, events: List[TerrorEvent]):
+        entity_sets = self._entity_sets()
         for event in events:
-            if self._is_valid_string(event.country) and self._is_valid_string(event.city):
-                location = (
-                    self._clean_string(event.country),
-                    self._clean_string(event.city),
-                    self._clean_string(event.region) if self._is_valid_string(event.region) else None,
-                    self._clean_string(event.province_or_state) if self._is_valid_string(
-                        event.province_or_state) else None,
-                    event.latitude if event.latitude is not None else None,
-                    event.longitude if event.longitude is not None else None
-                )
-                self.locations.add(location)
-
-            if event.terror_groups:
-                self.terror_groups.update(
-                    group for group in event.terror_groups
-                    if self._is_valid_string(group)
-                )
-            if event.attack_types:
-                self.attack_types.update(
-                    attack_type for attack_type in event.attack_types
-                    if self._is_valid_string(attack_type)
-                )
-            if event.target_details:
-                self.targets.update(
-                    target for target in event.target_details
-                    if self._is_valid_string(target)
-                )
+            for label, entity in self._event_entities(event):
+                entity_sets[label].add(entity)
+
+    def _location_row(self, loc: tuple) -> Optional[GraphRow]:
+        cleaned = tuple(self._clean_string(v) if isinstance(v, str) else v for v in loc)
+        if not self._is_new_entity("Location", cleaned):
+            return None
+        country, city, region, province, lat, lon = loc
+        props = {
+            'country': country,
+            'city': city,
+            'region': region,
+            'province': province,
+            'latitude': lat,
+            'longitude': lon
+        }
+        row = {k: v if isinstance(v, str) else str(v) for k, v in props.items() if v is not None}
+        return 'Location', row, f"Location:{cleaned[0]}|{cleaned[1]}", None
+
+    def _entity_row(self, label: str, entity) -> Optional[GraphRow]:
+        if label == 'Location':
+            return self._location_row(entity)
+        if not self._is_new_entity(label, entity):
+            return None
+        return label, {'name' if label == 'TerrorGroup' else 'type': entity}, f"{label}:{entity}", None
 
     def _generate_entity_queries(self):
-        for loc in self.locations:
-            country, city, region, province, lat, lon = loc
-            props = {
-                'country': country,
-                'city': city,
-                'region': region,
-                'province': province,
-                'latitude': lat,
-                'longitude': lon
-            }
-            props_str = ', '.join(f"{k}: '{v}'" for k, v in props.items() if v is not None)
-            self.cypher_queries.append(f"MERGE (l:Location {{{props_str}}})")
-
-        for group in self.terror_groups:
-            if group and group.lower() != "unknown":
-                self.cypher_queries.append(f"MERGE (g:TerrorGroup {{name: '{self._clean_string(group)}'}})")
-
-        for attack_type in self.attack_types:
-            self.cypher_queries.append(f"MERGE (at:AttackType {{type: '{self._clean_string(attack_type)}'}})")
-
-        for target in self.targets:
-            self.cypher_queries.append(f"MERGE (t:Target {{type: '{self._clean_string(target)}'}})")
+        for label, entities in self._entity_sets().items():
+            for entity in entities:
+                if row := self._entity_row(label, entity):
+                    self.graph_rows.append(row)
+
+    def _attack_rows(self, event: TerrorEvent) -> Iterator[GraphRow]:
+        if not self._is_valid_string(event.event_id):
+            return
+
+        attack_props = {
+            'id': event.event_id,
+            'date': event.event_date.isoformat(),
+            'data_source': event.data_source
+        }
+
+        numeric_props = {
+            'num_killed': event.num_killed,
+            'num_wounded': event.num_wounded,
+            'total_casualties': event.total_casualties,
+            'num_perpetrators': event.num_perpetrators,
+            'num_perpetrators_captured': event.num_perpetrators_captured
+        }
+        attack_props.update({k: v for k, v in numeric_props.items() if v is not None and v >= 0})
+
+        text_props = {
+            'summary': event.summary,
+            'description': event.description
+        }
+        attack_props.update({k: v for k, v in text_props.items()
+                             if self._is_valid_string(v)})
+
+        yield 'Attack', attack_props, event.event_id, None
+
+        if self._is_valid_string(event.country) and self._is_valid_string(event.city):
+            yield from self._relationship_rows(event)
+
+    def _relationship_rows(self, event: TerrorEvent) -> Iterator[GraphRow]:
+        yield (
+            'OCCURRED_AT',
+            {'id': event.event_id, 'country': event.country, 'city': event.city},
+            event.event_id,
+            f"Location:{self._clean_string(event.country)}|{self._clean_string(event.city)}"
+        )
+
+        for group in event.terror_groups or []:
+            if self._is_valid_string(group):
+                yield 'CONDUCTED_BY', {'id': event.event_id, 'name': group}, event.event_id, f"TerrorGroup:{group}"
+
+        for attack_type in event.attack_types or []:
+            if self._is_valid_string(attack_type):
+                yield 'TYPE_OF', {'id': event.event_id, 'type': attack_type}, event.event_id, f"AttackType:{attack_type}"
+
+        for target in event.target_details or []:
+            if self._is_valid_string(target):
+                yield 'TARGETED', {'id': event.event_id, 'type': target}, event.event_id, f"Target:{target}"
 
     def _generate_attack_queries(self, events: List[TerrorEvent]):
         for event in events:
-            if not self._is_valid_string(event.event_id):
-                continue
-
-            attack_props = {
-                'id': event.event_id,
-                'date': event.event_date.isoformat(),
-                'data_source': event.data_source
-            }
-
-            numeric_props = {
-                'num_killed': event.num_killed,
-                'num_wounded': event.num_wounded,
-                'total_casualties': event.total_casualties,
-                'num_perpetrators': event.num_perpetrators,
-                'num_perpetrators_captured': event.num_perpetrators_captured
-            }
-            attack_props.update({k: v for k, v in numeric_props.items() if v is not None and v >= 0})
-
-            text_props = {
-                'summary': event.summary,
-                'description': event.description
-            }
-            attack_props.update({k: v for k, v in text_props.items()
-                                 if self._is_valid_string(v)})
-
-            props_str = ', '.join(f"{k}: {repr(v)}" for k, v in attack_props.items())
-            self.cypher_queries.append(f"CREATE (a:Attack {{{props_str}}})")
-
-            if self._is_valid_string(event.country) and self._is_valid_string(event.city):
-                self._create_relationships(event)
-
-    def _create_relationships(self, event: TerrorEvent):
-        if self._is_valid_string(event.country) and self._is_valid_string(event.city):
-            self.cypher_queries.append(
-                f"MATCH (a:Attack {{id: '{event.event_id}'}}), "
-                f"(l:Location {{country: '{self._clean_string(event.country)}', "
-                f"city: '{self._clean_string(event.city)}'}}) "
-                f"CREATE (a)-[:OCCURRED_AT]->(l)"
-            )
-
-        if event.terror_groups:
-            for group in event.terror_groups:
-                if self._is_valid_string(group):
-                    self.cypher_queries.append(
-                        f"MATCH (a:Attack {{id: '{event.event_id}'}}), "
-                        f"(g:TerrorGroup {{name: '{self._clean_string(group)}'}}) "
-                        f"CREATE (a)-[:CONDUCTED_BY]->(g)"
-                    )
-
-        if event.attack_types:
-            for attack_type in event.attack_types:
-                if self._is_valid_string(attack_type):
-                    self.cypher_queries.append(
-                        f"MATCH (a:Attack {{id: '{event.event_id}'}}), "
-                        f"(at:AttackType {{type: '{self._clean_string(attack_type)}'}}) "
-                        f"CREATE (a)-[:TYPE_OF]->(at)"
-                    )
-
-        if event.target_details:
-            for target in event.target_details:
-                if self._is_valid_string(target):
-                    self.cypher_queries.append(
-                        f"MATCH (a:Attack {{id: '{event.event_id}'}}), "
-                        f"(t:Target {{type: '{self._clean_string(target)}'}}) "
-                        f"CREATE (a)-[:TARGETED]->(t)"
-                    )
+            self.graph_rows.extend(self._attack_rows(event))
 
-    def process_events(self, events: List[TerrorEvent]) -> List[str]:
+    def process_event_rows(self, events: List[TerrorEvent]) -> List[GraphRow]:
         self._extract_unique_entities(events)
         self._generate_entity_queries()
         self._generate_attack_queries(events)
-        return self.cypher_queries
+        return self.graph_rows
+
+    @metered('neo4j_process_events')
+    def process_events(self, events: List[TerrorEvent]) -> List[str]:
+        return [literal_statement(shape, row) for shape, row, _, _ in self.process_event_rows(events)]
+
+    def iter_event_rows(self, events: Iterable[TerrorEvent]) -> Iterator[GraphRow]:
+        entity_sets = self._entity_sets()
+        for event in events:
+            for label, entity in self._event_entities(event):
+                if entity not in entity_sets[label]:
+                    entity_sets[label].add(entity)
+                    if row := self._entity_row(label, entity):
+                        yield row
+            yield from self._attack_rows(event)
+
+    def iter_statements(self, events: Iterable[TerrorEvent]) -> Iterator[str]:
+        return (literal_statement(shape, row) for shape, row, _, _ in self.iter_event_rows(events))
 
 
 def create_neo4j_queries(events: List[TerrorEvent]) -> List[str]:
     processor = Neo4jProcessor()
     return processor.process_events(events)
+
+
+def create_graph_rows(events: List[TerrorEvent]) -> List[GraphRow]:
+    processor = Neo4jProcessor()
+    return processor.process_event_rows(events)
+
+
+def stream_neo4j_queries(events: Iterable[TerrorEvent]) -> Iterator[str]:
+    processor = Neo4jProcessor()
+    return processor.iter_statements(events)
+
+
+def registry_key(row: GraphRow) -> str:
+    shape, props, key, _ = row
+    if shape in ENTITY_SHAPES:
+        return f"{shape}:{json.dumps(props, ensure_ascii=False)}"
+    return f"Attack:{key}"
+
+
+def entity_key_row(row: GraphRow) -> GraphRow:
+    label = RELATIONSHIP_SHAPES[row[0]]
+    return label, {key: row[1][key] for key in ENTITY_KEYS[label]}, row[3], None
@@ -0,0 +1,53 @@
+import time
+from functools import partial
+from pathlib import Path
+from typing import List, Dict, Tuple, Generator, Union, Optional, Any
+import pandas as pd
+
+from app.config.local_files_config.local_files import DEAD_LETTER_FILE
+from app.config.pipeline_config.pipeline import (
+    VALIDATION_BATCH_SIZE, VALIDATION_WORKERS, VALIDATION_CHUNK_SIZE, VALIDATION_ORDERED
+)
+from app.services.data_validator_service import collect_validation_results, write_dead_letters, report_validation
+from app.services.event_serializer_service import encode_events_for_kafka
+from app.services.neo4j__structure_service import create_graph_rows, GraphRow
+from app.services.topic_routing_service import event_message_keys
+from app.utils.parallel_util import imap_bounded, create_process_pool
+
+EncodedChunk = Tuple[List[Union[str, bytes]], Optional[List[str]], List[GraphRow], int]
+ValidatedChunk = Tuple[List[Union[str, bytes]], Optional[List[str]], List[GraphRow], List[Dict[str, Any]]]
+
+
+def encode_chunk(
+        chunk: Tuple[int, pd.DataFrame],
+        batch_size: int,
+        with_graph_queries: bool
+) -> ValidatedChunk:
+    row_offset, df = chunk
+    events, dead_letters = collect_validation_results(df, batch_size, row_offset)
+    graph_queries = create_graph_rows(events) if with_graph_queries else []
+    return encode_events_for_kafka(events), event_message_keys(events), graph_queries, dead_letters
+
+
+def iter_encoded_chunks(
+        df: pd.DataFrame,
+        workers: int = VALIDATION_WORKERS,
+        chunk_size: int = VALIDATION_CHUNK_SIZE,
+        ordered: bool = VALIDATION_ORDERED,
+        with_graph_queries: bool = False,
+        batch_size: int = VALIDATION_BATCH_SIZE,
+        dead_letter_path: Path = DEAD_LETTER_FILE
+) -> Generator[EncodedChunk, None, None]:
+    start = time.perf_counter()
+    rejected_total = 0
+    chunks = ((offset, df.iloc[offset:offset + chunk_size]) for offset in range(0, len(df), chunk_size))
+    encode = partial(encode_chunk, batch_size=batch_size, with_graph_queries=with_graph_queries)
+
+    with create_process_pool(workers) as executor:
+        for messages, keys, graph_queries, dead_letters in imap_bounded(executor, encode, chunks, 2 * workers, ordered):
+            if dead_letters:
+                write_dead_letters(dead_letters, dead_letter_path)
+            rejected_total += len(dead_letters)
+            yield messages, keys, graph_queries, len(dead_letters)
+
+    report_validation(len(df), time.perf_counter() - start, rejected_total, dead_letter_path)
@@ -21,6 +21,7 @@ rename_event_record_columns = partial(
     rename_columns,
     column_mapping={
         "date": "event_date",
+        "eventid": "gtd_event_id",
         "country_txt": "country",
         "city": "city",
         "region_txt": "region",
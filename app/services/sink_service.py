@@ -0,0 +1,67 @@
+import time
+from functools import partial
+from pathlib import Path
+from typing import Iterator, List, Tuple, Optional
+import pandas as pd
+
+from app.config.pipeline_config.pipeline import SINK_QUEUE_SIZE, VALIDATION_BATCH_SIZE, MERGED_OUTPUT_FORMAT
+from app.models.terror_event import TerrorEvent
+from app.repositories.entity_registry_repository import EntityRegistry
+from app.repositories.merged_dataset_repository import open_merged_writer
+from app.services.data_validator_service import iter_validated_batches
+from app.services.topic_routing_service import publish_events, publish_graph_schema, publish_graph_stream, PlacementState
+from app.utils.fanout_util import fan_out
+
+ValidatedBatch = Tuple[pd.DataFrame, List[TerrorEvent]]
+
+
+def write_merged_sink(batches: Iterator[ValidatedBatch], path: Path, output_format: str) -> None:
+    with open_merged_writer(output_format, csv_path=path) as writer:
+        for df, _ in batches:
+            writer.write(df)
+
+
+def publish_events_sink(batches: Iterator[ValidatedBatch], publisher, topic: str) -> None:
+    for _, events in batches:
+        if not publish_events(publisher, topic, events):
+            raise RuntimeError(f"publishing to {topic} failed")
+
+
+def publish_graph_sink(
+        batches: Iterator[ValidatedBatch],
+        publisher,
+        topic: str,
+        registry: Optional[EntityRegistry] = None
+) -> None:
+    if not publish_graph_schema(publisher, topic):
+        raise RuntimeError(f"publishing to {topic} failed")
+
+    events = (event for _, batch_events in batches for event in batch_events)
+    if not publish_graph_stream(publisher, topic, events, PlacementState(), registry):
+        raise RuntimeError(f"publishing to {topic} failed")
+
+
+def run_sinks(
+        df: pd.DataFrame,
+        publisher,
+        csv_path: Path,
+        events_topic: str,
+        graph_topic: str,
+        registry: Optional[EntityRegistry] = None,
+        batch_size: int = VALIDATION_BATCH_SIZE,
+        queue_size: int = SINK_QUEUE_SIZE,
+        output_format: str = MERGED_OUTPUT_FORMAT
+) -> bool:
+    start = time.perf_counter()
+    errors = fan_out(
+        iter_validated_batches(df, batch_size),
+        {
+            'merged': partial(write_merged_sink, path=csv_path, output_format=output_format),
+            'events': partial(publish_events_sink, publisher=publisher, topic=events_topic),
+            'graph': partial(publish_graph_sink, publisher=publisher, topic=graph_topic, registry=registry)
+        },
+        queue_size
+    )
+
+    print(f"Sinks finished in {time.perf_counter() - start:.2f}s" + (f", failed: {', '.join(errors)}" if errors else ""))
+    return not errors
@@ -0,0 +1,258 @@
+import json
+from contextlib import contextmanager
+from itertools import islice
+from typing import List, Dict, Optional, Set, Tuple, Any, Iterator, Iterable
+
+from kafka.partitioner.default import murmur2
+
+from app.config.pipeline_config.pipeline import (
+    KAFKA_EVENT_KEY, KAFKA_GRAPH_KEY, GRAPH_MESSAGE_FORMAT, GRAPH_STATEMENT_MODE, GRAPH_UNWIND_BATCH_SIZE,
+    GRAPH_SCHEMA_BOOTSTRAP, GRAPH_STREAM_BATCH_ROWS, EVENT_ID_MODE
+)
+from app.config.kafka_config.publisher import create_publisher
+from app.models.terror_event import TerrorEvent
+from app.repositories.entity_registry_repository import EntityRegistry, open_entity_registry
+from app.services.event_serializer_service import encode_events_for_kafka
+from app.services.graph_envelope_service import pack_envelopes
+from app.services.graph_schema_service import schema_statements, check_indexed_lookups, sample_graph_statements
+from app.services.neo4j__structure_service import (
+    GraphRow, ENTITY_SHAPES, Neo4jProcessor, literal_statement, unwind_statement, entity_key_row, registry_key, literal_retraction, unwind_retraction
+)
+from app.utils.stage_metrics_util import pipeline_metrics, metered
+
+PlannedRow = Tuple[GraphRow, Optional[int]]
+GraphMessages = Tuple[List[Any], Optional[List[str]], Optional[List[int]]]
+
+
+def key_partition(key: str, partitions: int) -> int:
+    return (murmur2(key.encode('utf-8')) & 0x7fffffff) % partitions
+
+
+def event_message_keys(models: List[TerrorEvent], key_mode: str = KAFKA_EVENT_KEY) -> Optional[List[str]]:
+    return [model.event_id for model in models] if key_mode == 'event_id' else None
+
+
+class PlacementState:
+    def __init__(self):
+        self.placed: Dict[str, Set[Optional[int]]] = {}
+
+    def place(self, entity_key: str, partition: Optional[int]) -> bool:
+        partitions = self.placed.setdefault(entity_key, set())
+        if partition in partitions:
+            return False
+        partitions.add(partition)
+        return True
+
+
+def plan_graph_partitions(rows: List[GraphRow], partitions: int, state: PlacementState) -> List[PlannedRow]:
+    batch_entities: Dict[str, GraphRow] = {}
+    event_rows: List[GraphRow] = []
+    for row in rows:
+        if row[0] in ENTITY_SHAPES:
+            batch_entities.setdefault(row[2], row)
+        else:
+            event_rows.append(row)
+
+    event_partitions = [key_partition(row[2], partitions) for row in event_rows]
+    required: Dict[str, Dict[int, GraphRow]] = {}
+    for row, partition in zip(event_rows, event_partitions):
+        if row[3] is not None:
+            required.setdefault(row[3], {}).setdefault(partition, row)
+
+    planned: List[PlannedRow] = []
+    for entity_key, row in batch_entities.items():
+        for partition in required.pop(entity_key, None) or [key_partition(entity_key, partitions)]:
+            if state.place(entity_key, partition):
+                planned.append((row, partition))
+
+    for entity_key, dependents in required.items():
+        for partition, dependent in dependents.items():
+            if state.place(entity_key, partition):
+                planned.append((entity_key_row(dependent), partition))
+
+    planned.extend(zip(event_rows, event_partitions))
+    return planned
+
+
+def render_literal_messages(planned: List[PlannedRow], keyed: bool) -> GraphMessages:
+    return (
+        [literal_statement(row[0], row[1]) for row, _ in planned],
+        [row[2] for row, _ in planned] if keyed else None,
+        [partition for _, partition in planned] if keyed else None
+    )
+
+
+def statement_phase(shape: str) -> int:
+    return 0 if shape in ENTITY_SHAPES else 1 if shape == 'Attack' else 2
+
+
+def render_unwind_messages(
+        planned: List[PlannedRow],
+        keyed: bool,
+        batch_size: int = GRAPH_UNWIND_BATCH_SIZE
+) -> GraphMessages:
+    groups: Dict[Tuple, List[GraphRow]] = {}
+    for row, partition in planned:
+        fields = () if row[0] == 'Attack' else tuple(row[1])
+        groups.setdefault((partition, statement_phase(row[0]), row[0], fields), []).append(row)
+
+    messages, keys, partitions = [], [], []
+    for (partition, _, shape, fields), rows in sorted(groups.items(), key=lambda item: item[0][:2]):
+        statement = unwind_statement(shape, fields)
+        iterator = iter(rows)
+        while batch := list(islice(iterator, batch_size)):
+            messages.append(json.dumps({
+                'statement': statement,
+                'parameters': {'rows': [row[1] for row in batch]}
+            }).encode('utf-8'))
+            keys.append(batch[0][2])
+            partitions.append(partition)
+
+    return messages, keys if keyed else None, partitions if keyed else None
+
+
+def claim_new_rows(rows: List[GraphRow], registry: EntityRegistry, event_id_mode: str = EVENT_ID_MODE) -> List[GraphRow]:
+    fresh = [row for row in rows if not registry.is_published(registry_key(row))]
+    registered_shapes = {*ENTITY_SHAPES, 'Attack'} if event_id_mode == 'content_hash' else set(ENTITY_SHAPES)
+    registry.stage(registry_key(row) for row in fresh if row[0] in registered_shapes)
+    return fresh
+
+
+@metered('publish_graph_schema')
+def publish_graph_schema(
+        publisher: Any,
+        topic: str,
+        key_mode: str = KAFKA_GRAPH_KEY,
+        statement_mode: str = GRAPH_STATEMENT_MODE,
+        message_format: str = GRAPH_MESSAGE_FORMAT,
+        enabled: bool = GRAPH_SCHEMA_BOOTSTRAP
+) -> bool:
+    if not enabled:
+        return True
+
+    check_indexed_lookups(sample_graph_statements())
+    statements = schema_statements(['Attack', *ENTITY_SHAPES])
+    if statement_mode == 'unwind':
+        statements = [json.dumps({'statement': statement, 'parameters': {}}).encode('utf-8') for statement in statements]
+
+    if key_mode == 'entity':
+        count = publisher.partition_count(topic)
+        messages = statements * count
+        keys = ['schema'] * len(messages)
+        partitions = [partition for partition in range(count) for _ in statements]
+    else:
+        messages, keys, partitions = statements, None, None
+
+    if message_format == 'envelope':
+        messages, keys, partitions = pack_envelopes(messages, keys, partitions)
+
+    return publisher.publish(topic, messages, keys, partitions)
+
+
+@metered('publish_events')
+def publish_events(publisher: Any, topic: str, events: List[TerrorEvent]) -> bool:
+    return publisher.publish(topic, encode_events_for_kafka(events), event_message_keys(events))
+
+
+@metered('publish_graph_queries')
+def publish_graph_queries(
+        publisher: Any,
+        topic: str,
+        rows: List[GraphRow],
+        state: PlacementState,
+        registry: Optional[EntityRegistry] = None,
+        key_mode: str = KAFKA_GRAPH_KEY,
+        statement_mode: str = GRAPH_STATEMENT_MODE,
+        message_format: str = GRAPH_MESSAGE_FORMAT
+) -> bool:
+    if registry:
+        rows = claim_new_rows(rows, registry)
+
+    keyed = key_mode == 'entity'
+    if keyed:
+        planned = plan_graph_partitions(rows, publisher.partition_count(topic), state)
+    else:
+        planned = [(row, None) for row in rows if row[0] not in ENTITY_SHAPES or state.place(row[2], None)]
+
+    if statement_mode == 'unwind':
+        messages, keys, partitions = render_unwind_messages(planned, keyed)
+    else:
+        messages, keys, partitions = render_literal_messages(planned, keyed)
+
+    if message_format == 'envelope':
+        messages, keys, partitions = pack_envelopes(messages, keys, partitions)
+
+    return publisher.publish(topic, messages, keys, partitions)
+
+
+def publish_event_tombstones(publisher: Any, topic: str, event_ids: List[str]) -> bool:
+    return not event_ids or publisher.publish(topic, [None] * len(event_ids), event_ids)
+
+
+def publish_graph_retractions(
+        publisher: Any,
+        topic: str,
+        event_ids: List[str],
+        key_mode: str = KAFKA_GRAPH_KEY,
+        statement_mode: str = GRAPH_STATEMENT_MODE,
+        message_format: str = GRAPH_MESSAGE_FORMAT
+) -> bool:
+    if not event_ids:
+        return True
+
+    if statement_mode == 'unwind':
+        messages = [
+            json.dumps({'statement': unwind_retraction(), 'parameters': {'rows': [{'id': event_id}]}}).encode('utf-8')
+            for event_id in event_ids
+        ]
+    else:
+        messages = [literal_retraction(event_id) for event_id in event_ids]
+
+    keys, partitions = None, None
+    if key_mode == 'entity':
+        count = publisher.partition_count(topic)
+        keys, partitions = event_ids, [key_partition(event_id, count) for event_id in event_ids]
+
+    if message_format == 'envelope':
+        messages, keys, partitions = pack_envelopes(messages, keys, partitions)
+
+    return publisher.publish(topic, messages, keys, partitions)
+
+
+@metered('publish_graph_stream')
+def publish_graph_stream(
+        publisher: Any,
+        topic: str,
+        events: Iterable[TerrorEvent],
+        state: PlacementState,
+        registry: Optional[EntityRegistry] = None,
+        processor: Optional[Neo4jProcessor] = None,
+        batch_size: int = GRAPH_STREAM_BATCH_ROWS
+) -> bool:
+    rows = (processor or Neo4jProcessor()).iter_event_rows(events)
+    while batch := list(islice(rows, batch_size)):
+        if not publish_graph_queries(publisher, topic, batch, state, registry):
+            return False
+    return True
+
+
+def finish_publishing(publisher: Any, registry: Optional[EntityRegistry], completed: bool = True) -> bool:
+    delivered = pipeline_metrics.run('flush_publisher', publisher.close) and completed
+    if registry:
+        if delivered:
+            print(f"Registered {registry.commit()} newly published graph entities and events")
+        else:
+            registry.rollback()
+        registry.close()
+    return delivered
+
+
+@contextmanager
+def publishing_session() -> Iterator[Tuple[Any, Optional[EntityRegistry]]]:
+    publisher, registry = create_publisher(), open_entity_registry()
+    completed = False
+    try:
+        yield publisher, registry
+        completed = True
+    finally:
+        finish_publishing(publisher, registry, completed)
@@ -0,0 +1,71 @@
+from typing import Any, List, Tuple, Callable
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+
+def is_categorical(series: pd.Series) -> bool:
+    return isinstance(series.dtype, pd.CategoricalDtype)
+
+
+def union_categorical_dtype(*series: pd.Series) -> pd.CategoricalDtype:
+    categoricals = [s.astype('category') for s in series]
+    non_empty = [c for c in categoricals if len(c.cat.categories)]
+    if not non_empty:
+        return categoricals[0].dtype
+
+    categories = union_categoricals(non_empty, sort_categories=True, ignore_order=True).categories
+    return pd.CategoricalDtype(categories)
+
+
+def align_categorical_columns(
+        left: pd.DataFrame,
+        right: pd.DataFrame,
+        columns: List[str]
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    columns = [
+        col for col in columns
+        if col in left.columns and col in right.columns and (is_categorical(left[col]) or is_categorical(right[col]))
+    ]
+    if not columns:
+        return left, right
+
+    left, right = left.copy(), right.copy()
+    for col in columns:
+        dtype = union_categorical_dtype(left[col], right[col])
+        left[col] = left[col].astype(dtype)
+        right[col] = right[col].astype(dtype)
+    return left, right
+
+
+def concat_preserving_categoricals(frames: List[pd.DataFrame], **kwargs) -> pd.DataFrame:
+    categorical_columns = {
+        col for df in frames for col in df.columns if is_categorical(df[col])
+    }
+    aligned = [df.copy() for df in frames]
+    for col in categorical_columns:
+        present = [df[col] for df in aligned if col in df.columns]
+        dtype = union_categorical_dtype(*present)
+        for df in aligned:
+            if col in df.columns:
+                df[col] = df[col].astype(dtype)
+    return pd.concat(aligned, **kwargs)
+
+
+def map_categories(series: pd.Series, func: Callable[[pd.Series], pd.Series]) -> pd.Series:
+    mapped = func(pd.Series(series.cat.categories))
+    codes, categories = pd.factorize(mapped)
+    series_codes = series.cat.codes.to_numpy()
+    new_codes = np.where(series_codes >= 0, codes[series_codes], -1)
+    return pd.Series(
+        pd.Categorical.from_codes(new_codes, categories=categories),
+        index=series.index,
+        name=series.name
+    )
+
+
+def category_apply(series: pd.Series, func: Callable[[pd.Series], pd.Series], missing: Any = None) -> pd.Series:
+    if not is_categorical(series):
+        return func(series)
+    mapped = func(pd.Series(series.cat.categories, dtype=object)).to_numpy(dtype=object)
+    return pd.Series(np.append(mapped, missing)[series.cat.codes.to_numpy()], index=series.index, dtype=object)
@@ -0,0 +1,52 @@
+from typing import List
+import numpy as np
+import pandas as pd
+
+HASH_KEYS: List[str] = ['e7a1c0d94b2f6853', '3f9d2b71c6e04a58']
+
+HEX_TABLE: np.ndarray = np.array([f'{i:02x}'.encode() for i in range(256)], dtype='S2')
+
+
+def canonical_key_frame(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    keys = {}
+    for col in columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            keys[col] = series
+        elif pd.api.types.is_datetime64_any_dtype(series):
+            keys[col] = series.to_numpy().astype('datetime64[D]').astype(str)
+        elif pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            keys[col] = series.astype('Int64').astype(str).to_numpy()
+        else:
+            keys[col] = series.astype(str).to_numpy()
+    return pd.DataFrame(keys, index=df.index)
+
+
+def hash_rows_128(keys: pd.DataFrame) -> np.ndarray:
+    halves = [
+        pd.util.hash_pandas_object(keys, index=False, hash_key=hash_key).to_numpy()
+        for hash_key in HASH_KEYS
+    ]
+    return np.column_stack(halves).astype('>u8')
+
+
+def hex_digests(hashes: np.ndarray) -> np.ndarray:
+    raw = np.ascontiguousarray(hashes).view(np.uint8).reshape(len(hashes), hashes.shape[1] * hashes.itemsize)
+    hexed = np.ascontiguousarray(HEX_TABLE[raw])
+    return hexed.view(f'S{2 * raw.shape[1]}').ravel().astype(str)
+
+
+def content_hash_ids(df: pd.DataFrame, columns: List[str]) -> pd.Series:
+    keys = canonical_key_frame(df, columns)
+    ids = pd.Series(hex_digests(hash_rows_128(keys)), index=df.index)
+
+    duplicated = ids.duplicated(keep=False)
+    if duplicated.any():
+        occurrence = ids[duplicated].groupby(ids[duplicated]).cumcount()
+        keys = keys[duplicated].assign(_occurrence=occurrence.astype(str))
+        ids[duplicated] = hex_digests(hash_rows_128(keys))
+
+    if ids.duplicated().any():
+        raise ValueError(f"Content hash collision for {ids.duplicated().sum()} event ids")
+
+    return ids
@@ -0,0 +1,29 @@
+from typing import Callable
+import pandas as pd
+
+from app.utils.categorical_util import category_apply
+
+
+def python_repr(series: pd.Series) -> pd.Series:
+    return category_apply(
+        series,
+        lambda values: pd.Series(list(map(repr, values.tolist())), index=values.index, dtype=object)
+    )
+
+
+def quoted(series: pd.Series) -> pd.Series:
+    return category_apply(series, lambda values: "'" + values.astype(str).str.replace("'", "\\'", regex=False) + "'")
+
+
+def render_properties(
+        frame: pd.DataFrame,
+        formatter: Callable[[pd.Series], pd.Series] = quoted
+) -> pd.Series:
+    properties = pd.Series('', index=frame.index, dtype=object)
+    for column in frame.columns:
+        values = frame[column]
+        present = values.notna()
+        rendered = pd.Series('', index=frame.index, dtype=object)
+        rendered[present] = ', ' + column + ': ' + formatter(values[present])
+        properties = properties + rendered
+    return properties.str[2:]
@@ -0,0 +1,46 @@
+import queue
+import threading
+from typing import Callable, Iterable, Iterator, Dict, Any
+
+END_OF_STREAM = object()
+
+
+def drain_queue(source: queue.Queue, finished: threading.Event) -> Iterator[Any]:
+    while (item := source.get()) is not END_OF_STREAM:
+        yield item
+    finished.set()
+
+
+def run_sink(name: str, sink: Callable[[Iterator[Any]], Any], source: queue.Queue, errors: Dict[str, Exception]) -> None:
+    finished = threading.Event()
+    try:
+        sink(drain_queue(source, finished))
+    except Exception as e:
+        errors[name] = e
+        print(f"Sink {name} failed: {e}")
+        if not finished.is_set():
+            for _ in drain_queue(source, finished):
+                pass
+
+
+def fan_out(
+        items: Iterable[Any],
+        sinks: Dict[str, Callable[[Iterator[Any]], Any]],
+        queue_size: int = 4
+) -> Dict[str, Exception]:
+    errors: Dict[str, Exception] = {}
+    queues = {name: queue.Queue(maxsize=queue_size) for name in sinks}
+    threads = [
+        threading.Thread(target=run_sink, args=(name, sink, queues[name], errors), name=f"sink-{name}", daemon=True)
+        for name, sink in sinks.items()
+    ]
+    [thread.start() for thread in threads]
+
+    try:
+        for item in items:
+            [sink_queue.put(item) for sink_queue in queues.values()]
+    finally:
+        [sink_queue.put(END_OF_STREAM) for sink_queue in queues.values()]
+        [thread.join() for thread in threads]
+
+    return errors
@@ -0,0 +1,70 @@
+import multiprocessing
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from functools import partial
+from typing import Callable, Iterable, Iterator, Any, Deque, Set
+
+from app.config.pipeline_config.pipeline import PROCESS_START_METHOD
+from app.utils.stage_metrics_util import pipeline_metrics, reset_worker_metrics, run_metered_task
+
+
+def relay_metered_result(future: Future, task: Future) -> None:
+    if future.done():
+        return
+    if task.cancelled():
+        future.cancel()
+    elif task.exception() is not None:
+        future.set_exception(task.exception())
+    else:
+        result, records = task.result()
+        pipeline_metrics.replay(records)
+        future.set_result(result)
+
+
+class MeteredProcessPool(ProcessPoolExecutor):
+    def submit(self, fn: Callable[..., Any], /, *args, **kwargs) -> Future:
+        if not pipeline_metrics.enabled:
+            return super().submit(fn, *args, **kwargs)
+
+        future: Future = Future()
+        task = super().submit(run_metered_task, fn, *args, **kwargs)
+        task.add_done_callback(partial(relay_metered_result, future))
+        return future
+
+
+def create_process_pool(max_workers: int, start_method: str = PROCESS_START_METHOD) -> ProcessPoolExecutor:
+    return MeteredProcessPool(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context(start_method),
+        initializer=reset_worker_metrics
+    )
+
+
+def imap_bounded(
+        executor: Executor,
+        func: Callable[..., Any],
+        items: Iterable[Any],
+        max_in_flight: int,
+        ordered: bool = True
+) -> Iterator[Any]:
+    items = iter(items)
+
+    if ordered:
+        pending: Deque[Future] = deque()
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= max_in_flight:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+        return
+
+    in_flight: Set[Future] = set()
+    for item in items:
+        in_flight.add(executor.submit(func, item))
+        if len(in_flight) >= max_in_flight:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            yield from (future.result() for future in done)
+    while in_flight:
+        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+        yield from (future.result() for future in done)
@@ -1,13 +1,138 @@
-from typing import List
+import gzip
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Iterable, List, Optional, BinaryIO
 
+from app.config.pipeline_config.pipeline import (
+    CYPHER_TRANSACTION_SIZE, CYPHER_SCRIPT_COMPRESSION, CYPHER_SCRIPT_MAX_BYTES
+)
 from app.models.terror_event import TerrorEvent
-from app.services.neo4j__structure_service import Neo4jProcessor
+from app.services.graph_schema_service import schema_statements
+from app.services.neo4j__structure_service import Neo4jProcessor, ENTITY_SHAPES, literal_statement
+from app.utils.stage_metrics_util import metered
 
 
-def save_neo4j_queries(events: List[TerrorEvent], output_path: str):
+class CypherScriptWriter:
+    def __init__(
+            self,
+            output_path: Path,
+            transaction_size: int = CYPHER_TRANSACTION_SIZE,
+            compression: str = CYPHER_SCRIPT_COMPRESSION,
+            max_file_bytes: int = CYPHER_SCRIPT_MAX_BYTES
+    ):
+        self.output_path = Path(output_path)
+        self.transaction_size = transaction_size
+        self.compression = compression
+        self.max_file_bytes = max_file_bytes
+        self.paths: List[Path] = []
+        self.parts = 0
+        self.raw: Optional[BinaryIO] = None
+        self.file: Optional[BinaryIO] = None
+        self.pending_statements = 0
+
+    def _part_path(self, index: int) -> Path:
+        path = self.output_path if index == 0 else self.output_path.with_name(
+            f"{self.output_path.stem}.{index:04d}{self.output_path.suffix}"
+        )
+        return path.with_name(path.name + '.gz') if self.compression == 'gzip' else path
+
+    def _temp_path(self, index: int) -> Path:
+        path = self._part_path(index)
+        return path.with_name(path.name + '.tmp')
+
+    def _open(self) -> None:
+        temp_path = self._temp_path(self.parts)
+        temp_path.parent.mkdir(parents=True, exist_ok=True)
+        self.raw = open(temp_path, 'wb')
+        self.file = gzip.GzipFile(fileobj=self.raw, mode='wb') if self.compression == 'gzip' else self.raw
+
+    def _write(self, line: str) -> None:
+        if self.file is None:
+            self._open()
+        self.file.write(f"{line}\n".encode('utf-8'))
+
+    def _close_file(self) -> None:
+        self.commit()
+        if self.file is None:
+            return
+        self.file.close()
+        self.raw.close()
+        self.file = self.raw = None
+        self.parts += 1
+
+    def commit(self) -> None:
+        if self.pending_statements:
+            self._write(':commit')
+            self.pending_statements = 0
+            if self.max_file_bytes and self.raw.tell() >= self.max_file_bytes:
+                self._close_file()
+
+    def write_schema(self, statement: str) -> None:
+        self.commit()
+        self._write(f"{statement};")
+
+    def write(self, statement: str) -> None:
+        if not self.pending_statements:
+            self._write(':begin')
+        self._write(f"{statement};")
+        self.pending_statements += 1
+        if self.pending_statements >= self.transaction_size:
+            self.commit()
+
+    def finish(self) -> List[Path]:
+        self._close_file()
+        for index in range(self.parts):
+            os.replace(self._temp_path(index), self._part_path(index))
+            self.paths.append(self._part_path(index))
+        return self.paths
+
+    def abort(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.raw.close()
+            self.file = self.raw = None
+            self.parts += 1
+        for index in range(self.parts):
+            self._temp_path(index).unlink(missing_ok=True)
+
+    def __enter__(self) -> 'CypherScriptWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.finish()
+        else:
+            self.abort()
+
+
+@metered('save_neo4j_queries')
+def save_neo4j_queries(
+        events: Iterable[TerrorEvent],
+        output_path: str,
+        transaction_size: int = CYPHER_TRANSACTION_SIZE,
+        compression: str = CYPHER_SCRIPT_COMPRESSION,
+        max_file_bytes: int = CYPHER_SCRIPT_MAX_BYTES
+) -> List[Path]:
     processor = Neo4jProcessor()
-    queries = processor.process_events(events)
+    writer = CypherScriptWriter(output_path, transaction_size, compression, max_file_bytes)
+
+    with tempfile.TemporaryFile('w+', encoding='utf-8') as spool, writer:
+        for statement in schema_statements(['Attack', *ENTITY_SHAPES]):
+            writer.write_schema(statement)
+
+        for shape, row, _, _ in processor.iter_event_rows(events):
+            statement = literal_statement(shape, row)
+            if shape in ENTITY_SHAPES:
+                writer.write(statement)
+            else:
+                spool.write(json.dumps(statement) + '\n')
+        writer.commit()
+
+        spool.seek(0)
+        for line in spool:
+            writer.write(json.loads(line))
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        for i, query in enumerate(queries, 1):
-            f.write(f"{query};\n")
\ No newline at end of file
+    print(f"Cypher script was saved to {', '.join(str(path) for path in writer.paths)}")
+    return writer.paths
@@ -0,0 +1,261 @@
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import pandas as pd
+
+from app.config.local_files_config.local_files import PIPELINE_METRICS_TEXTFILE
+from app.config.pipeline_config.pipeline import (
+    PIPELINE_METRICS, PIPELINE_METRICS_TRACE_MEMORY, PIPELINE_METRICS_DEEP_MEMORY
+)
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+StageRecord = Dict[str, Any]
+StageHook = Callable[[StageRecord], None]
+
+RSS_UNIT_BYTES = 1 if sys.platform == 'darwin' else 1024
+
+PROMETHEUS_METRICS: List[Tuple[str, str, str, str]] = [
+    ('pipeline_stage_runs_total', 'runs', 'counter', 'Runs of the pipeline stage'),
+    ('pipeline_stage_failures_total', 'failures', 'counter', 'Runs of the pipeline stage that raised'),
+    ('pipeline_stage_wall_seconds_total', 'wall_seconds', 'counter', 'Wall time spent in the pipeline stage'),
+    ('pipeline_stage_cpu_seconds_total', 'cpu_seconds', 'counter', 'Process CPU time spent in the pipeline stage'),
+    ('pipeline_stage_rows_in_total', 'rows_in', 'counter', 'Rows passed into the pipeline stage'),
+    ('pipeline_stage_rows_out_total', 'rows_out', 'counter', 'Rows returned by the pipeline stage'),
+    ('pipeline_stage_last_wall_seconds', 'last_wall_seconds', 'gauge', 'Wall time of the latest run'),
+    ('pipeline_stage_frame_bytes', 'frame_bytes', 'gauge', 'Memory usage of the latest DataFrame output'),
+    ('pipeline_stage_peak_rss_delta_bytes', 'peak_rss_delta_bytes', 'gauge', 'Largest peak RSS growth of one run'),
+    ('pipeline_stage_traced_peak_delta_bytes', 'traced_peak_delta_bytes', 'gauge',
+     'Largest traced allocation peak of one run')
+]
+
+
+def row_count(value: Any) -> Optional[int]:
+    if isinstance(value, (pd.DataFrame, pd.Series, list)):
+        return len(value)
+    if isinstance(value, tuple) and value and all(isinstance(item, pd.DataFrame) for item in value):
+        return sum(map(len, value))
+    return None
+
+
+def frame_bytes(value: Any, deep: bool = False) -> Optional[int]:
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=deep).sum())
+    if isinstance(value, tuple) and value and all(isinstance(item, pd.DataFrame) for item in value):
+        return sum(frame_bytes(item, deep) for item in value)
+    return None
+
+
+def max_rss_bytes() -> Optional[int]:
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * RSS_UNIT_BYTES
+
+
+class StageRun:
+    def __init__(self, args: Tuple[Any, ...]):
+        self.rows_in = next((rows for rows in map(row_count, args) if rows is not None), None)
+        self.thread = threading.get_ident()
+        self.traced_start = 0
+        self.traced_peak = 0
+        self.overlapped = False
+
+
+class PipelineMetrics:
+    def __init__(self, hooks: Optional[List[StageHook]] = None, trace_memory: bool = False, deep_memory: bool = False):
+        self.hooks: List[StageHook] = list(hooks or [])
+        self.trace_memory = trace_memory
+        self.deep_memory = deep_memory
+        self.traced_runs: List[StageRun] = []
+        self.trace_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.hooks)
+
+    def add_hook(self, hook: StageHook) -> None:
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook: StageHook) -> None:
+        self.hooks.remove(hook)
+
+    def _start_tracing(self, run: StageRun) -> None:
+        with self.trace_lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            current, peak = tracemalloc.get_traced_memory()
+            for active in self.traced_runs:
+                active.traced_peak = max(active.traced_peak, peak)
+                if active.thread != run.thread:
+                    active.overlapped = run.overlapped = True
+            tracemalloc.reset_peak()
+            run.traced_start = run.traced_peak = current
+            self.traced_runs.append(run)
+
+    def _stop_tracing(self, run: StageRun) -> Optional[int]:
+        with self.trace_lock:
+            self.traced_runs.remove(run)
+            run.traced_peak = max(run.traced_peak, tracemalloc.get_traced_memory()[1])
+            for active in self.traced_runs:
+                active.traced_peak = max(active.traced_peak, run.traced_peak)
+            return None if run.overlapped else run.traced_peak - run.traced_start
+
+    def _emit(self, record: StageRecord) -> None:
+        for hook in self.hooks:
+            try:
+                hook(record)
+            except Exception as e:
+                print(f"Pipeline metrics hook {hook} failed: {e}")
+
+    def run(self, name: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+        return self.measure(name, func, args, kwargs)
+
+    def measure(
+            self,
+            name: str,
+            func: Callable[..., Any],
+            args: Tuple[Any, ...],
+            kwargs: Dict[str, Any],
+            count_rows: Callable[[Any], Optional[int]] = row_count
+    ) -> Any:
+        if not self.hooks:
+            return func(*args, **kwargs)
+
+        run = StageRun(args)
+        trace_memory = self.trace_memory
+        if trace_memory:
+            self._start_tracing(run)
+        record: StageRecord = {'stage': name, 'status': 'ok', 'started_at': time.time(), 'rows_in': run.rows_in}
+        rss_before = max_rss_bytes()
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+
+        try:
+            result = func(*args, **kwargs)
+            record['rows_out'] = count_rows(result)
+            record['frame_bytes'] = frame_bytes(result, self.deep_memory)
+            return result
+        except BaseException:
+            record['status'] = 'error'
+            raise
+        finally:
+            record['wall_seconds'] = time.perf_counter() - wall_start
+            record['cpu_seconds'] = time.process_time() - cpu_start
+            record['peak_rss_delta_bytes'] = max_rss_bytes() - rss_before if rss_before is not None else None
+            if trace_memory:
+                record['traced_peak_delta_bytes'] = self._stop_tracing(run)
+            self._emit(record)
+
+    def step(self, name: str, func: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        return lambda data: self.run(name, func, data)
+
+    def replay(self, records: List[StageRecord]) -> None:
+        for record in records:
+            self._emit(record)
+
+
+def label_value(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def json_log_hook(record: StageRecord) -> None:
+    print(json.dumps({'event': 'pipeline_stage', **record}, default=str))
+
+
+class PrometheusTextfileHook:
+    def __init__(self, path: Path = PIPELINE_METRICS_TEXTFILE):
+        self.path = Path(path)
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.lock = threading.Lock()
+
+    def __call__(self, record: StageRecord) -> None:
+        with self.lock:
+            totals = self.stages.setdefault(record['stage'], {
+                'runs': 0, 'failures': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'rows_in': 0, 'rows_out': 0
+            })
+            totals['runs'] += 1
+            totals['failures'] += record['status'] != 'ok'
+            totals['wall_seconds'] += record['wall_seconds']
+            totals['cpu_seconds'] += record['cpu_seconds']
+            totals['rows_in'] += record['rows_in'] or 0
+            totals['rows_out'] += record.get('rows_out') or 0
+            totals['last_wall_seconds'] = record['wall_seconds']
+            if record.get('frame_bytes') is not None:
+                totals['frame_bytes'] = record['frame_bytes']
+            for field in ('peak_rss_delta_bytes', 'traced_peak_delta_bytes'):
+                if record.get(field) is not None:
+                    totals[field] = max(totals.get(field, 0), record[field])
+            self.write()
+
+    def render(self) -> str:
+        lines = []
+        for metric, field, kind, description in PROMETHEUS_METRICS:
+            samples = [(stage, totals[field]) for stage, totals in self.stages.items() if field in totals]
+            if not samples:
+                continue
+            lines += [f"# HELP {metric} {description}", f"# TYPE {metric} {kind}"]
+            lines += [f'{metric}{{stage="{label_value(stage)}"}} {value}' for stage, value in samples]
+        return '\n'.join(lines) + '\n'
+
+    def write(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(temp_path, self.path)
+
+
+METRIC_EXPORTERS: Dict[str, Callable[[], StageHook]] = {
+    'json': lambda: json_log_hook,
+    'prometheus': PrometheusTextfileHook
+}
+
+
+def create_pipeline_metrics(
+        exporters: str = PIPELINE_METRICS,
+        trace_memory: bool = PIPELINE_METRICS_TRACE_MEMORY,
+        deep_memory: bool = PIPELINE_METRICS_DEEP_MEMORY
+) -> PipelineMetrics:
+    names = [name.strip() for name in exporters.split(',') if name.strip() not in ('', 'off')]
+    unknown = [name for name in names if name not in METRIC_EXPORTERS]
+    if unknown:
+        print(f"Ignoring unknown PIPELINE_METRICS exporters {unknown}, "
+              f"expected a comma-separated list of {', '.join(METRIC_EXPORTERS)} or 'off'")
+    hooks = [METRIC_EXPORTERS[name]() for name in names if name in METRIC_EXPORTERS]
+    return PipelineMetrics(hooks, trace_memory, deep_memory)
+
+
+pipeline_metrics = create_pipeline_metrics()
+
+
+def reset_worker_metrics() -> None:
+    pipeline_metrics.hooks = []
+
+
+def run_metered_task(func: Callable[..., Any], *args, **kwargs) -> Tuple[Any, List[StageRecord]]:
+    records: List[StageRecord] = []
+    pipeline_metrics.hooks = [records.append]
+    try:
+        return func(*args, **kwargs), records
+    finally:
+        pipeline_metrics.hooks = []
+
+
+def metered(
+        name: str,
+        count_rows: Callable[[Any], Optional[int]] = row_count
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return pipeline_metrics.measure(name, func, args, kwargs, count_rows)
+        return wrapper
+    return decorator
@@ -0,0 +1,28 @@
+import pandas as pd
+import pytest
+
+from app.benchmarks.synthetic_data import write_synthetic_sources
+from app.repositories.local_files_repository import (
+    load_source_dataframe, primary_df_columns, secondary_df_columns
+)
+from app.repositories.source_schema import primary_df_dtypes, secondary_df_dtypes
+from app.services.data_processor_service import (
+    convert_dates_primary_df, convert_dates_secondary_df, merge_and_enrich_dataframes, normalize_data, add_event_id
+)
+from app.services.rename_columns_service import rename_event_record_columns
+
+
+@pytest.fixture(scope='session')
+def source_frames(tmp_path_factory):
+    primary_path, secondary_path = write_synthetic_sources(tmp_path_factory.mktemp('sources'), rows=4_000, seed=7)
+    primary_df = load_source_dataframe(primary_path, primary_df_columns, dtypes=primary_df_dtypes, use_cache=False)
+    secondary_df = load_source_dataframe(
+        secondary_path, secondary_df_columns, dtypes=secondary_df_dtypes, use_cache=False
+    )
+    return convert_dates_primary_df(primary_df), convert_dates_secondary_df(secondary_df)
+
+
+@pytest.fixture(scope='session')
+def merged_events_df(source_frames) -> pd.DataFrame:
+    merged = merge_and_enrich_dataframes(*source_frames)
+    return add_event_id(normalize_data(rename_event_record_columns(merged)), mode='content_hash')
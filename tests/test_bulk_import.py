@@ -0,0 +1,40 @@
+from collections import Counter
+
+from app.services.bulk_import_service import export_bulk_import, validate_bulk_import, read_import_table, NODE_HEADERS
+from app.services.data_validator_service import collect_validation_results
+from app.services.neo4j__structure_service import RELATIONSHIP_SHAPES, Neo4jProcessor
+
+GRAPH_SHAPES = [*NODE_HEADERS, *RELATIONSHIP_SHAPES]
+
+
+def import_records(import_dir, name):
+    table = read_import_table(import_dir, name)
+    header = [column.partition(':')[0] for column in next(table)]
+    return [{name: value for name, value in zip(header, record) if name and value != ''} for record in table]
+
+
+def test_bulk_import_round_trip_matches_cypher_path(merged_events_df, tmp_path):
+    events, _ = collect_validation_results(merged_events_df.iloc[:1_500])
+    expected = Counter(shape for shape, *_ in Neo4jProcessor().iter_event_rows(events))
+
+    exported = export_bulk_import(events, tmp_path)
+    validated = validate_bulk_import(tmp_path)
+
+    assert all(expected[shape] for shape in GRAPH_SHAPES)
+    assert {shape: validated[shape] for shape in GRAPH_SHAPES} == {shape: expected[shape] for shape in GRAPH_SHAPES}
+    assert exported == {shape: expected[shape] for shape in GRAPH_SHAPES}
+
+
+def test_bulk_import_properties_match_cypher_rows(merged_events_df, tmp_path):
+    events, _ = collect_validation_results(merged_events_df.iloc[:500])
+    rows = list(Neo4jProcessor().iter_event_rows(events))
+
+    export_bulk_import(events, tmp_path)
+
+    attacks = {record['id']: record for record in import_records(tmp_path, 'Attack')}
+    locations = {(record['country'], record['city']): record for record in import_records(tmp_path, 'Location')}
+    for shape, props, key, _ in rows:
+        if shape == 'Attack':
+            assert attacks[key] == {name: str(value) for name, value in props.items()}
+        elif shape == 'Location':
+            assert locations[(props['country'], props['city'])] == props
@@ -0,0 +1,52 @@
+import json
+
+from app.services.data_validator_service import (
+    collect_validation_results, validate_dataframe_in_batches, iter_validated_batches
+)
+
+INVALID_ROWS = [3, 17, 28]
+
+
+def corrupted_events(merged_events_df):
+    df = merged_events_df.iloc[:40].reset_index(drop=True)
+    df = df.astype({'latitude': object})
+    df.loc[INVALID_ROWS, 'latitude'] = 'not-a-number'
+    return df
+
+
+def read_dead_letters(path):
+    return [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+
+
+def test_invalid_rows_go_to_dead_letters_with_row_offsets(merged_events_df, tmp_path):
+    df = corrupted_events(merged_events_df)
+    dead_letter_path = tmp_path / 'dead.jsonl'
+
+    events = validate_dataframe_in_batches(df, batch_size=10, dead_letter_path=dead_letter_path)
+
+    valid_ids = df['event_id'].drop(index=INVALID_ROWS).tolist()
+    assert [event.event_id for event in events] == valid_ids
+    dead_letters = read_dead_letters(dead_letter_path)
+    assert [entry['row'] for entry in dead_letters] == INVALID_ROWS
+    assert [entry['record']['event_id'] for entry in dead_letters] == df.loc[INVALID_ROWS, 'event_id'].tolist()
+    assert all(error.startswith('latitude:') for entry in dead_letters for error in entry['errors'])
+
+
+def test_batched_validation_keeps_offsets_across_batches(merged_events_df, tmp_path):
+    df = corrupted_events(merged_events_df)
+    dead_letter_path = tmp_path / 'dead.jsonl'
+
+    batches = list(iter_validated_batches(df, batch_size=10, dead_letter_path=dead_letter_path))
+
+    assert [len(events) for _, events in batches] == [9, 9, 9, 10]
+    assert [entry['row'] for entry in read_dead_letters(dead_letter_path)] == INVALID_ROWS
+
+
+def test_collected_dead_letters_use_the_chunk_row_offset(merged_events_df):
+    df = corrupted_events(merged_events_df)
+
+    events, dead_letters = collect_validation_results(df.iloc[10:30], batch_size=7, row_offset=10)
+
+    assert len(events) == 18
+    assert [entry['row'] for entry in dead_letters] == [17, 28]
+    assert not any(event.event_id in {entry['record']['event_id'] for entry in dead_letters} for event in events)
@@ -0,0 +1,53 @@
+import threading
+
+from app.utils.fanout_util import fan_out
+
+
+def failing_after_end(items) -> None:
+    list(items)
+    raise RuntimeError('close failed')
+
+
+def failing_before_end(items) -> None:
+    next(items)
+    raise RuntimeError('publish failed')
+
+
+def run_with_timeout(target, timeout: float = 10.0):
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(value=target()), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), 'fan_out did not return'
+    return result['value']
+
+
+def test_fan_out_delivers_every_item_to_every_sink():
+    received = {'a': [], 'b': []}
+
+    errors = run_with_timeout(lambda: fan_out(range(10), {
+        'a': lambda items: received['a'].extend(items),
+        'b': lambda items: received['b'].extend(items)
+    }, queue_size=2))
+
+    assert errors == {}
+    assert received == {'a': list(range(10)), 'b': list(range(10))}
+
+
+def test_fan_out_returns_when_sink_fails_after_end_of_stream():
+    received = []
+
+    errors = run_with_timeout(lambda: fan_out(range(3), {'a': failing_after_end, 'b': received.extend}))
+
+    assert list(errors) == ['a']
+    assert str(errors['a']) == 'close failed'
+    assert received == [0, 1, 2]
+
+
+def test_fan_out_drains_queue_when_sink_fails_mid_stream():
+    received = []
+
+    errors = run_with_timeout(lambda: fan_out(range(20), {'a': failing_before_end, 'b': received.extend}, queue_size=1))
+
+    assert list(errors) == ['a']
+    assert received == list(range(20))
@@ -0,0 +1,65 @@
+from app.services.neo4j__structure_service import literal_statement
+from app.services.topic_routing_service import PlacementState, plan_graph_partitions, key_partition
+
+PARTITIONS = 8
+
+
+def location_row():
+    return 'Location', {'country': 'Iraq', 'city': 'Baghdad', 'region': 'Middle East'}, 'Location:Iraq|Baghdad', None
+
+
+def event_rows(event_id: str):
+    return [
+        ('Attack', {'id': event_id, 'date': '2001-09-11T00:00:00'}, event_id, None),
+        ('OCCURRED_AT', {'id': event_id, 'country': 'Iraq', 'city': 'Baghdad'}, event_id, 'Location:Iraq|Baghdad')
+    ]
+
+
+def event_ids_on_distinct_partitions(count: int):
+    ids, seen = [], set()
+    candidate = 0
+    while len(ids) < count:
+        event_id = f"event-{candidate}"
+        if key_partition(event_id, PARTITIONS) not in seen:
+            seen.add(key_partition(event_id, PARTITIONS))
+            ids.append(event_id)
+        candidate += 1
+    return ids
+
+
+def merges_by_partition(planned):
+    return {(partition, literal_statement(row[0], row[1])) for row, partition in planned if row[0] == 'Location'}
+
+
+def test_entity_is_merged_on_every_partition_that_references_it():
+    first, second, third = event_ids_on_distinct_partitions(3)
+    state = PlacementState()
+
+    planned = plan_graph_partitions([location_row(), *event_rows(first), *event_rows(second)], PARTITIONS, state)
+    later = plan_graph_partitions([*event_rows(first), *event_rows(third)], PARTITIONS, state)
+
+    full = "MERGE (l:Location {country: 'Iraq', city: 'Baghdad'}) SET l += {region: 'Middle East'}"
+    key_only = "MERGE (l:Location {country: 'Iraq', city: 'Baghdad'})"
+    assert merges_by_partition(planned) == {
+        (key_partition(first, PARTITIONS), full), (key_partition(second, PARTITIONS), full)
+    }
+    assert merges_by_partition(later) == {(key_partition(third, PARTITIONS), key_only)}
+    assert [row[0] for row, _ in later].count('OCCURRED_AT') == 2
+
+
+def test_placement_state_keeps_only_entity_keys():
+    state = PlacementState()
+
+    for event_id in event_ids_on_distinct_partitions(4):
+        plan_graph_partitions([location_row(), *event_rows(event_id)], PARTITIONS, state)
+
+    assert list(state.placed) == ['Location:Iraq|Baghdad']
+    assert len(state.placed['Location:Iraq|Baghdad']) == 4
+
+
+def test_unreferenced_entity_goes_to_its_key_partition():
+    state = PlacementState()
+
+    planned = plan_graph_partitions([location_row()], PARTITIONS, state)
+
+    assert [partition for _, partition in planned] == [key_partition('Location:Iraq|Baghdad', PARTITIONS)]
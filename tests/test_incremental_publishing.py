@@ -0,0 +1,53 @@
+from typing import Set
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import app.main as main_module
+from app.config.kafka_config.fake_producer import FakeKafkaProducer
+from app.config.kafka_config.publisher import SyncKafkaPublisher
+from app.repositories.manifest_repository import IngestionManifest
+
+
+def event_records(event_ids) -> pd.DataFrame:
+    return pd.DataFrame({
+        'fingerprint': np.arange(len(event_ids), dtype=np.uint64),
+        'merge_key': np.arange(len(event_ids), dtype=np.uint64)
+    }, index=list(event_ids))
+
+
+@pytest.fixture
+def run_incremental(tmp_path, monkeypatch):
+    manifest = IngestionManifest(tmp_path)
+    manifest.add_events(event_records(['superseded']))
+    manifest.save()
+
+    def run(fail_topics: Set[str]) -> IngestionManifest:
+        producer = FakeKafkaProducer(fail_topics=fail_topics)
+        monkeypatch.setenv('TERROR_EVENTS', 'events')
+        monkeypatch.setenv('NEO4J_ENTITIES', 'graph')
+        monkeypatch.setattr(main_module, 'IngestionManifest', lambda: IngestionManifest(tmp_path))
+        monkeypatch.setattr(main_module, 'create_publisher', lambda: SyncKafkaPublisher(producer))
+        monkeypatch.setattr(main_module, 'create_incremental_processing_pipeline', lambda _manifest: (
+            pd.DataFrame(), event_records([]), ['superseded'], [('primary', np.array([7], dtype=np.uint64))]
+        ))
+
+        main_module.main_incremental()
+        return IngestionManifest(tmp_path).load()
+
+    return run
+
+
+def test_failed_delivery_leaves_manifest_unchanged(run_incremental):
+    manifest = run_incremental({'events'})
+
+    assert manifest.events.index.tolist() == ['superseded']
+    assert manifest.known_rows('primary').size == 0
+
+
+def test_delivered_run_commits_manifest(run_incremental):
+    manifest = run_incremental(set())
+
+    assert manifest.events.empty
+    assert manifest.known_rows('primary').tolist() == [7]
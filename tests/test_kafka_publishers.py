@@ -0,0 +1,109 @@
+import sqlite3
+
+from app.config.kafka_config.fake_producer import FakeKafkaProducer
+from app.config.kafka_config.publisher import SyncKafkaPublisher, AsyncKafkaPublisher, create_publisher
+from app.repositories.entity_registry_repository import EntityRegistry
+from app.services.topic_routing_service import finish_publishing, key_partition
+
+
+def registered_keys(path) -> set:
+    with sqlite3.connect(path) as connection:
+        return {key for (key,) in connection.execute("SELECT entity_key FROM entities")}
+
+
+def test_sync_publisher_reports_delivered_messages():
+    producer = FakeKafkaProducer()
+    publisher = SyncKafkaPublisher(producer, batch_size=2)
+
+    assert publisher.publish('events', [b'1', b'2', b'3'], keys=['a', 'b', 'c'])
+    assert publisher.close()
+    assert [record[:2] for record in producer.records] == [('events', b'a'), ('events', b'b'), ('events', b'c')]
+    assert producer.closed
+
+
+def test_sync_publisher_fails_when_delivery_fails():
+    publisher = SyncKafkaPublisher(FakeKafkaProducer(fail_topics={'t'}))
+
+    assert not publisher.publish('t', [b'1', b'2'])
+    assert not publisher.close()
+
+
+def test_sync_publisher_failure_is_sticky_across_topics():
+    publisher = SyncKafkaPublisher(FakeKafkaProducer(fail_topics={'t'}))
+
+    assert not publisher.publish('t', [b'1'])
+    assert publisher.publish('ok', [b'2'])
+    assert not publisher.close()
+
+
+def test_failed_sync_delivery_does_not_commit_registry(tmp_path):
+    path = tmp_path / 'registry.sqlite'
+    registry = EntityRegistry(path)
+    registry.stage(['Country:Iraq', 'Attack:1'])
+    publisher = SyncKafkaPublisher(FakeKafkaProducer(fail_topics={'graph'}))
+
+    publisher.publish('graph', [b'MERGE (c:Country {name: "Iraq"})'])
+
+    assert not finish_publishing(publisher, registry)
+    assert registered_keys(path) == set()
+
+
+def test_delivered_sync_publishing_commits_registry(tmp_path):
+    path = tmp_path / 'registry.sqlite'
+    registry = EntityRegistry(path)
+    registry.stage(['Country:Iraq'])
+    publisher = SyncKafkaPublisher(FakeKafkaProducer())
+
+    publisher.publish('graph', [b'MERGE (c:Country {name: "Iraq"})'])
+
+    assert finish_publishing(publisher, registry)
+    assert registered_keys(path) == {'Country:Iraq'}
+
+
+def test_async_publisher_counts_deliveries_per_topic():
+    producer = FakeKafkaProducer()
+    publisher = AsyncKafkaPublisher(producer)
+
+    assert publisher.publish('events', [b'1', b'2', b'3'])
+    assert publisher.publish('graph', [b'4'])
+    assert producer.flush_count == 0
+    assert publisher.close()
+
+    assert publisher.sent == {'events': 3, 'graph': 1}
+    assert publisher.delivered == {'events': 3, 'graph': 1}
+    assert not publisher.failed
+    assert producer.closed
+
+
+def test_async_publisher_close_fails_when_a_topic_fails():
+    publisher = AsyncKafkaPublisher(FakeKafkaProducer(fail_topics={'graph'}))
+
+    assert publisher.publish('events', [b'1', b'2'])
+    assert publisher.publish('graph', [b'3'])
+    assert not publisher.close()
+
+    assert publisher.delivered == {'events': 2}
+    assert publisher.failed == {'graph': 1}
+    assert str(publisher.last_error) == 'delivery to graph failed'
+
+
+def test_async_publisher_passes_keys_and_partitions_through():
+    producer = FakeKafkaProducer(partitions=4)
+    publisher = AsyncKafkaPublisher(producer)
+
+    publisher.publish('graph', [b'1', b'2', b'3'], keys=['a', 'b', 'c'], partitions=[3, 0, 2])
+    publisher.publish('events', [b'4'], keys=['d'])
+    publisher.close()
+
+    assert [(topic, key, partition) for topic, key, partition, _ in producer.records] == [
+        ('graph', b'a', 3), ('graph', b'b', 0), ('graph', b'c', 2),
+        ('events', b'd', key_partition('d', 4))
+    ]
+    assert [value for *_, value in producer.records] == [b'1', b'2', b'3', b'4']
+
+
+def test_create_publisher_selects_the_async_publisher():
+    producer = FakeKafkaProducer()
+
+    assert isinstance(create_publisher(producer, mode='async'), AsyncKafkaPublisher)
+    assert isinstance(create_publisher(producer, mode='sync'), SyncKafkaPublisher)
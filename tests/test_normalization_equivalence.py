@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.data_processor_service import convert_dates_secondary_df, normalize_data
+
+
+def baseline_convert_dates_secondary_df(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df.insert(0, 'date', pd.to_datetime(df['Date'], format='%d-%b-%y'))
+    df['date'] = df['date'].apply(lambda x: x.replace(year=x.year - 100) if x.year > 2020 else x)
+    return df
+
+
+def baseline_normalize_data(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+
+    df = df.dropna(subset=['event_date', 'country', 'city'])
+
+    df['latitude'] = df['latitude'].fillna(np.nan)
+    df['longitude'] = df['longitude'].fillna(np.nan)
+
+    df['num_perpetrators_captured'] = df['num_perpetrators_captured'].fillna(0).astype(int)
+
+    numeric_columns = [
+        'num_killed', 'num_terrorist_killed', 'num_wounded',
+        'num_terrorist_wounded', 'total_casualties',
+        'num_perpetrators', 'num_perpetrators_captured'
+    ]
+    for col in numeric_columns:
+        df[col] = df[col].apply(lambda x: np.nan if x is None or x < 0 else x)
+
+    string_columns = ['country', 'city', 'region', 'province_or_state']
+    for col in string_columns:
+        df[col] = df[col].apply(lambda x: x.strip().title() if isinstance(x, str) else x)
+
+    target_columns = ['target_type_1', 'target_type_2', 'target_type_3']
+    for col in target_columns:
+        df[col] = df[col].fillna(np.nan)
+
+    return df
+
+
+SECONDARY_DATES = [
+    '31-Dec-20', '01-Jan-21', '29-Feb-20', '29-Feb-24', '29-Feb-68', '28-Feb-69',
+    '01-Mar-69', '29-Feb-00', '01-Jan-00', '31-Dec-99', '15-Jun-85'
+]
+
+STRING_COLUMNS = ['country', 'city', 'region', 'province_or_state']
+TARGET_COLUMNS = ['target_type_1', 'target_type_2', 'target_type_3']
+
+
+def secondary_frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        'Date': SECONDARY_DATES,
+        'City': ['Paris'] * len(SECONDARY_DATES),
+        'Country': ['France'] * len(SECONDARY_DATES)
+    })
+
+
+def event_frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        'event_date': pd.to_datetime([
+            '2020-12-31', '1921-01-01', '2020-02-29', '1924-02-29', None, '1968-02-29', '2016-02-29', '1970-01-01'
+        ]),
+        'country': ['  iraq ', 'FRANCE', 'united states', None, 'Peru', 'peru', "cote d'ivoire", 'Iraq'],
+        'city': [' baghdad', 'paris ', "o'hare", 'Lima', 'lima', 'LIMA', 'abidjan', None],
+        'region': ['middle east ', None, 'north america', 'south america', 'South America', ' south america', None,
+                   'Middle East'],
+        'province_or_state': [None, 'ile-de-france', ' illinois ', 'lima', 'Lima', np.nan, 'abidjan', 'Baghdad'],
+        'latitude': [33.3, None, 41.97, -12.04, np.nan, -12.05, 5.35, 33.3],
+        'longitude': [44.4, 2.35, None, -77.04, -77.0, np.nan, -4.0, 44.4],
+        'num_killed': [1.0, -1.0, np.nan, 0.0, 3.0, 2.0, 5.0, 1.0],
+        'num_terrorist_killed': [0.0, np.nan, -9.0, 1.0, 0.0, 0.0, 2.0, 0.0],
+        'num_wounded': [4.0, 2.0, -99.0, np.nan, 1.0, 0.0, 3.0, 0.0],
+        'num_terrorist_wounded': [np.nan, 0.0, 0.0, 1.0, -1.0, 0.0, 0.0, 0.0],
+        'total_casualties': [5, 1, 0, 0, 4, 2, 8, 1],
+        'num_perpetrators': [np.nan, -99.0, 3.0, 1.0, 2.0, np.nan, 4.0, 1.0],
+        'num_perpetrators_captured': [np.nan, 0.0, -99.0, 1.0, 0.0, 2.0, np.nan, 0.0],
+        'target_type_1': ['Military', None, 'Business', 'Police', np.nan, 'Private Citizens & Property', 'Military',
+                          'Police'],
+        'target_type_2': [None, 'Business', np.nan, None, 'Police', None, None, None],
+        'target_type_3': [np.nan, None, None, 'Utilities', None, None, 'Military', None],
+        'data_source': ['matched', 'only_in_primary', 'only_in_secondary', 'matched', 'matched', 'only_in_primary',
+                        'only_in_secondary', 'matched']
+    })
+
+
+def as_categorical(df: pd.DataFrame, columns) -> pd.DataFrame:
+    return df.astype({column: 'category' for column in columns})
+
+
+def as_object(df: pd.DataFrame) -> pd.DataFrame:
+    return df.astype({column: object for column in df.columns if isinstance(df[column].dtype, pd.CategoricalDtype)})
+
+
+def assert_same_frames(expected: pd.DataFrame, actual: pd.DataFrame) -> None:
+    pd.testing.assert_frame_equal(actual, expected)
+    assert actual.to_csv().encode('utf-8') == expected.to_csv().encode('utf-8')
+
+
+@pytest.mark.parametrize('categorical', [False, True], ids=['object', 'categorical'])
+def test_convert_dates_secondary_df_matches_baseline(categorical):
+    df = secondary_frame()
+    if categorical:
+        df = as_categorical(df, df.columns)
+
+    expected = baseline_convert_dates_secondary_df(df)
+    actual = convert_dates_secondary_df(df)
+
+    assert_same_frames(expected, actual)
+    assert actual['date'].dt.year.between(1921, 2020).all()
+    assert actual.loc[SECONDARY_DATES.index('31-Dec-20'), 'date'] == pd.Timestamp('2020-12-31')
+    assert actual.loc[SECONDARY_DATES.index('01-Jan-21'), 'date'] == pd.Timestamp('1921-01-01')
+    assert actual.loc[SECONDARY_DATES.index('29-Feb-68'), 'date'] == pd.Timestamp('1968-02-29')
+
+
+def test_normalize_data_matches_baseline():
+    df = event_frame()
+
+    assert_same_frames(baseline_normalize_data(df), normalize_data(df))
+
+
+def test_normalize_data_matches_baseline_on_categorical_input():
+    categorical_columns = [*STRING_COLUMNS, *TARGET_COLUMNS, 'data_source']
+    df = as_categorical(event_frame(), categorical_columns)
+
+    actual = normalize_data(df)
+
+    assert all(isinstance(actual[column].dtype, pd.CategoricalDtype) for column in categorical_columns)
+    assert_same_frames(as_object(baseline_normalize_data(df)), as_object(actual))
+    assert_same_frames(baseline_normalize_data(as_object(df)), as_object(actual))
+
+
+def test_normalize_data_matches_baseline_without_negatives():
+    df = event_frame()
+    numeric = df.select_dtypes('number').columns
+    df[numeric] = df[numeric].abs()
+
+    assert_same_frames(baseline_normalize_data(df), normalize_data(df))
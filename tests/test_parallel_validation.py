@@ -0,0 +1,22 @@
+from app.services.data_validator_service import collect_validation_results
+from app.services.event_serializer_service import encode_events_for_kafka
+from app.services.neo4j__structure_service import create_graph_rows
+from app.services.parallel_validation_service import iter_encoded_chunks
+
+CHUNK_SIZE = 700
+
+
+def test_parallel_chunks_match_single_process_encoding(merged_events_df, tmp_path):
+    df = merged_events_df
+    chunks = list(iter_encoded_chunks(
+        df, workers=2, chunk_size=CHUNK_SIZE, with_graph_queries=True, dead_letter_path=tmp_path / 'dead.jsonl'
+    ))
+
+    events, dead_letters = collect_validation_results(df)
+    assert [message for messages, _, _, _ in chunks for message in messages] == encode_events_for_kafka(events)
+    assert [key for _, keys, _, _ in chunks for key in keys] == [event.event_id for event in events]
+    assert sum(rejected for _, _, _, rejected in chunks) == len(dead_letters)
+
+    for (_, keys, graph_rows, _), offset in zip(chunks, range(0, len(df), CHUNK_SIZE)):
+        chunk_events, _ = collect_validation_results(df.iloc[offset:offset + CHUNK_SIZE])
+        assert sorted(map(repr, graph_rows)) == sorted(map(repr, create_graph_rows(chunk_events)))
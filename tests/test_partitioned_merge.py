@@ -0,0 +1,23 @@
+import pandas as pd
+import pytest
+
+from app.services.data_processor_service import merge_and_enrich_dataframes, merge_and_enrich_dataframes_partitioned
+
+
+def canonical(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.astype({column: object for column in df.columns if isinstance(df[column].dtype, pd.CategoricalDtype)})
+    return df.sort_values(list(df.columns), na_position='last').reset_index(drop=True)
+
+
+@pytest.mark.parametrize('workers, partition_freq', [(1, 'year'), (2, 'year'), (3, 'month')])
+def test_partitioned_merge_matches_single_process_merge(source_frames, workers, partition_freq):
+    primary_df, secondary_df = source_frames
+
+    expected = merge_and_enrich_dataframes(primary_df, secondary_df)
+    actual = merge_and_enrich_dataframes_partitioned(
+        primary_df, secondary_df, workers=workers, partition_freq=partition_freq
+    )
+
+    assert list(actual.columns) == list(expected.columns)
+    assert actual['data_source'].value_counts().to_dict() == expected['data_source'].value_counts().to_dict()
+    pd.testing.assert_frame_equal(canonical(actual), canonical(expected))
@@ -0,0 +1,70 @@
+import json
+
+import pandas as pd
+import pytest
+
+from app.services.data_processor_service import add_event_id
+from app.utils.parallel_util import create_process_pool
+from app.utils.stage_metrics_util import pipeline_metrics, json_log_hook, PrometheusTextfileHook
+
+
+def event_frame(offset: int) -> pd.DataFrame:
+    return pd.DataFrame({
+        'gtd_event_id': [offset, offset + 1],
+        'event_date': pd.to_datetime(['2001-09-11', '2001-09-12']),
+        'country': ['Iraq', 'Peru'],
+        'city': ['Baghdad', 'Lima']
+    })
+
+
+def content_hash_ids(df: pd.DataFrame) -> list:
+    return add_event_id(df, mode='content_hash')['event_id'].tolist()
+
+
+@pytest.fixture
+def metrics_hooks():
+    hooks = []
+
+    def add(hook):
+        pipeline_metrics.add_hook(hook)
+        hooks.append(hook)
+        return hook
+
+    yield add
+    [pipeline_metrics.remove_hook(hook) for hook in hooks]
+
+
+@pytest.mark.parametrize('start_method', ['spawn', 'fork'])
+def test_worker_stage_records_are_emitted_by_the_parent(start_method, metrics_hooks, tmp_path, capfd):
+    frames = [event_frame(offset) for offset in range(0, 8, 2)]
+    expected = [content_hash_ids(df.copy()) for df in frames]
+    records = []
+    metrics_hooks(records.append)
+    metrics_hooks(json_log_hook)
+    textfile = metrics_hooks(PrometheusTextfileHook(tmp_path / 'stages.prom'))
+
+    with create_process_pool(2, start_method) as executor:
+        assert list(executor.map(content_hash_ids, frames)) == expected
+
+    assert [record['stage'] for record in records] == ['add_event_id'] * 4
+    assert [record['rows_in'] for record in records] == [2] * 4
+    logged = [json.loads(line) for line in capfd.readouterr().out.splitlines() if '"pipeline_stage"' in line]
+    assert len(logged) == 4
+    assert textfile.stages['add_event_id']['runs'] == 4
+    assert 'pipeline_stage_runs_total{stage="add_event_id"} 4' in (tmp_path / 'stages.prom').read_text()
+
+
+def test_worker_pool_without_metrics_returns_plain_results():
+    with create_process_pool(2) as executor:
+        assert list(executor.map(len, [[1], [1, 2]])) == [1, 2]
+
+
+def worker_hook_count(_item) -> int:
+    return len(pipeline_metrics.hooks)
+
+
+def test_workers_do_not_build_their_own_exporters(monkeypatch):
+    monkeypatch.setenv('PIPELINE_METRICS', 'prometheus,json')
+
+    with create_process_pool(2, 'spawn') as executor:
+        assert list(executor.map(worker_hook_count, range(2))) == [0, 0]
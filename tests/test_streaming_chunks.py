@@ -0,0 +1,47 @@
+import pandas as pd
+import pytest
+
+from app.services.data_processor_service import iter_day_aligned_chunks
+
+
+def primary_chunks(days, chunk_size: int):
+    df = pd.DataFrame(days, columns=['iyear', 'imonth', 'iday']).astype({
+        'iyear': 'Int16', 'imonth': 'Int8', 'iday': 'Int8'
+    })
+    df['eventid'] = range(len(df))
+    return (df.iloc[start:start + chunk_size] for start in range(0, len(df), chunk_size))
+
+
+def emitted_days(chunk: pd.DataFrame) -> set:
+    dated = chunk[(chunk['imonth'].fillna(0) != 0) & (chunk['iday'].fillna(0) != 0)]
+    return set(dated[['iyear', 'imonth', 'iday']].astype(int).itertuples(index=False, name=None))
+
+
+def test_day_aligned_chunks_keep_each_day_in_one_chunk():
+    days = [(1970, 1, 1)] * 3 + [(1970, 1, 2)] * 4 + [(1970, 1, 3)] * 2
+
+    chunks = list(iter_day_aligned_chunks(primary_chunks(days, 2)))
+
+    assert sorted(eid for chunk in chunks for eid in chunk['eventid']) == list(range(len(days)))
+    per_chunk = [emitted_days(chunk) for chunk in chunks]
+    assert all(not (a & b) for i, a in enumerate(per_chunk) for b in per_chunk[i + 1:])
+
+
+def test_day_aligned_chunks_pass_unknown_dates_through():
+    days = [
+        (1970, 1, 1), (1970, 0, 0), (1970, 1, 1), (1970, 1, 2), (1970, 1, 0),
+        (1970, 1, 2), (1970, 1, 3), (None, None, None), (1970, 1, 3), (1970, 0, 0)
+    ]
+
+    chunks = list(iter_day_aligned_chunks(primary_chunks(days, 2)))
+
+    assert sorted(eid for chunk in chunks for eid in chunk['eventid']) == list(range(len(days)))
+    per_chunk = [emitted_days(chunk) for chunk in chunks]
+    assert all(not (a & b) for i, a in enumerate(per_chunk) for b in per_chunk[i + 1:])
+
+
+def test_day_aligned_chunks_reject_days_that_reappear():
+    days = [(1970, 1, 1), (1970, 1, 2), (1970, 1, 3), (1970, 1, 1)]
+
+    with pytest.raises(ValueError, match='1 days reappear'):
+        list(iter_day_aligned_chunks(primary_chunks(days, 2)))